@@ -10,30 +10,62 @@ Version: 1.0.0
 # External imports - versions specified as per requirements
 from fastapi import FastAPI, HTTPException, Request, Response  # version: 0.100+
 from fastapi.middleware.cors import CORSMiddleware  # version: 0.100+
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
+from starlette.datastructures import Headers
 import logging
 import logging.config
-from datetime import datetime
-from typing import Dict
-import traceback
+import secrets
+import orjson  # version: 3.9+
+import structlog  # version: 23.1+
+from typing import Callable, Dict, List, Optional, Tuple
+import time
 from prometheus_client import Counter, Histogram  # version: 0.17+
-import uuid
 
 # Internal imports
 from .config import Config
-from .controllers import initialize_controllers
+from .utils.timestamps import utc_now_iso
+from .controllers import api_router, initialize_controllers
+from .controllers.metrics import start_metric_flusher, stop_metric_flusher
+from .controllers.reports import close_report_generator
 
 # Service version
 __version__ = "1.0.0"
 
 # Initialize logging
+def _orjson_dumps(obj, **kwargs) -> str:
+    """Serialize log events with orjson for the structlog JSON renderer."""
+    return orjson.dumps(obj, **kwargs).decode()
+
+_shared_log_processors = [
+    structlog.stdlib.add_log_level,
+    structlog.stdlib.add_logger_name,
+    structlog.processors.TimeStamper(fmt="iso")
+]
+
+structlog.configure(
+    processors=[
+        structlog.stdlib.filter_by_level,
+        *_shared_log_processors,
+        structlog.stdlib.ProcessorFormatter.wrap_for_formatter
+    ],
+    logger_factory=structlog.stdlib.LoggerFactory(),
+    wrapper_class=structlog.stdlib.BoundLogger,
+    cache_logger_on_first_use=True
+)
+
+# Tracebacks are only formatted by the handler, i.e. once a record is emitted
 logging.config.dictConfig({
     'version': 1,
     'disable_existing_loggers': False,
     'formatters': {
         'json': {
-            'class': 'pythonjsonlogger.jsonlogger.JsonFormatter',
-            'format': '%(asctime)s %(levelname)s %(name)s %(message)s'
+            '()': structlog.stdlib.ProcessorFormatter,
+            'processors': [
+                structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+                structlog.processors.format_exc_info,
+                structlog.processors.JSONRenderer(serializer=_orjson_dumps)
+            ],
+            'foreign_pre_chain': _shared_log_processors
         }
     },
     'handlers': {
@@ -49,7 +81,10 @@ logging.config.dictConfig({
     }
 })
 
-logger = logging.getLogger(__name__)
+logger = structlog.get_logger(__name__)
+
+# Latency buckets (seconds) aligned with API SLO targets
+LATENCY_BUCKETS = (0.005, 0.025, 0.1, 0.5, 2.5, 10.0)
 
 # Initialize Prometheus metrics
 REQUEST_COUNT = Counter(
@@ -61,57 +96,134 @@ REQUEST_COUNT = Counter(
 REQUEST_LATENCY = Histogram(
     'http_request_duration_seconds',
     'HTTP request latency',
-    ['method', 'endpoint']
+    ['method', 'endpoint'],
+    buckets=LATENCY_BUCKETS
 )
 
+# Paths excluded from request metrics and correlation tracking
+UNOBSERVED_PATHS = frozenset({
+    "/health",
+    "/metrics",
+    "/api/docs",
+    "/api/openapi.json",
+    "/api/redoc"
+})
+
+# Cached label children keyed by label values; bounded by routes x methods
+_count_children: Dict[tuple, Counter] = {}
+_latency_children: Dict[tuple, Histogram] = {}
+
 # Initialize FastAPI application with enhanced configuration
 app = FastAPI(
     title="Analytics Service",
     version=__version__,
     docs_url="/api/docs",
     openapi_url="/api/openapi.json",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse
 )
 
-@app.middleware("http")
-async def correlation_middleware(request: Request, call_next):
-    """Add correlation ID to request context for tracing."""
-    correlation_id = request.headers.get('X-Correlation-ID', str(uuid.uuid4()))
-    request.state.correlation_id = correlation_id
-    
-    response = await call_next(request)
-    response.headers['X-Correlation-ID'] = correlation_id
-    return response
-
-@app.middleware("http")
-async def metrics_middleware(request: Request, call_next):
-    """Collect request metrics using Prometheus."""
-    start_time = datetime.utcnow()
-    
-    response = await call_next(request)
-    
-    duration = (datetime.utcnow() - start_time).total_seconds()
-    REQUEST_LATENCY.labels(
-        method=request.method,
-        endpoint=request.url.path
-    ).observe(duration)
-    
-    REQUEST_COUNT.labels(
-        method=request.method,
-        endpoint=request.url.path,
-        status=response.status_code
-    ).inc()
-    
-    return response
+class ObservabilityMiddleware:
+    """
+    Pure ASGI middleware handling correlation IDs, request metrics and security
+    headers in a single layer, avoiding per-request BaseHTTPMiddleware overhead.
+    """
+
+    def __init__(self, app, headers_factory: Callable[[], Dict[str, str]]):
+        """
+        Args:
+            app: Downstream ASGI application
+            headers_factory: Callable returning the security headers to attach,
+                resolved once on first use since configuration loads at startup
+        """
+        self.app = app
+        self._headers_factory = headers_factory
+        self._static_headers: Optional[List[Tuple[bytes, bytes]]] = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Encode security headers to raw ASGI byte pairs once
+        if self._static_headers is None:
+            self._static_headers = [
+                (k.lower().encode("latin-1"), v.encode("latin-1"))
+                for k, v in self._headers_factory().items()
+            ]
+
+        # Probe, scrape and docs paths only receive security headers
+        if scope["path"] in UNOBSERVED_PATHS:
+            static_headers = self._static_headers
+
+            async def send_headers_only(message):
+                if message["type"] == "http.response.start":
+                    message["headers"] = list(message.get("headers", [])) + static_headers
+                await send(message)
+
+            await self.app(scope, receive, send_headers_only)
+            return
+
+        # Propagate or assign correlation ID for tracing
+        correlation_id = Headers(scope=scope).get('X-Correlation-ID') or secrets.token_hex(16)
+        scope.setdefault("state", {})["correlation_id"] = correlation_id
+
+        extra_headers = self._static_headers + [
+            (b"x-correlation-id", correlation_id.encode("latin-1"))
+        ]
+
+        status_code = 500
+        start_time = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + extra_headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start_time
+
+            # Label by the templated route path (e.g. /gaps/{gap_id}) rather than the
+            # resolved URL so that series count stays bounded by the number of routes
+            route = scope.get("route")
+            endpoint = getattr(route, "path", "unmatched")
+            method = scope["method"]
+
+            latency_key = (method, endpoint)
+            latency_child = _latency_children.get(latency_key)
+            if latency_child is None:
+                latency_child = _latency_children.setdefault(
+                    latency_key, REQUEST_LATENCY.labels(*latency_key)
+                )
+            latency_child.observe(duration)
+
+            count_key = (method, endpoint, f"{status_code // 100}xx")
+            count_child = _count_children.get(count_key)
+            if count_child is None:
+                count_child = _count_children.setdefault(
+                    count_key, REQUEST_COUNT.labels(*count_key)
+                )
+            count_child.inc()
+
+app.add_middleware(
+    ObservabilityMiddleware,
+    headers_factory=lambda: Config.get_config().service.security_headers
+)
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Handle HTTP exceptions with detailed error responses."""
-    logger.error(f"HTTP error: {exc.detail}", extra={
-        'correlation_id': getattr(request.state, 'correlation_id', None),
-        'status_code': exc.status_code,
-        'path': request.url.path
-    })
+    logger.error(
+        "HTTP error",
+        detail=exc.detail,
+        correlation_id=getattr(request.state, 'correlation_id', None),
+        status_code=exc.status_code,
+        path=request.url.path
+    )
     
     return JSONResponse(
         status_code=exc.status_code,
@@ -119,18 +231,20 @@ async def http_exception_handler(request: Request, exc: HTTPException):
             'status': 'error',
             'message': exc.detail,
             'correlation_id': getattr(request.state, 'correlation_id', None),
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': utc_now_iso()
         }
     )
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle unexpected exceptions with secure error responses."""
-    logger.error(f"Unexpected error: {str(exc)}", extra={
-        'correlation_id': getattr(request.state, 'correlation_id', None),
-        'traceback': traceback.format_exc(),
-        'path': request.url.path
-    })
+    logger.error(
+        "Unexpected error",
+        error=str(exc),
+        correlation_id=getattr(request.state, 'correlation_id', None),
+        path=request.url.path,
+        exc_info=exc
+    )
     
     return JSONResponse(
         status_code=500,
@@ -138,7 +252,7 @@ async def general_exception_handler(request: Request, exc: Exception):
             'status': 'error',
             'message': 'An unexpected error occurred',
             'correlation_id': getattr(request.state, 'correlation_id', None),
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': utc_now_iso()
         }
     )
 
@@ -162,29 +276,27 @@ async def startup_event():
         # Initialize controllers
         router = await initialize_controllers(config)
         app.include_router(router)
+        app.include_router(api_router)
+
+        # Start bulk insert flusher for batched metric submissions
+        await start_metric_flusher()
         
-        # Add security headers middleware
-        @app.middleware("http")
-        async def security_headers_middleware(request: Request, call_next):
-            response = await call_next(request)
-            response.headers.update(config.service.security_headers)
-            return response
-        
-        logger.info("Analytics service initialized successfully", extra={
-            'version': __version__,
-            'environment': config.service.environment
-        })
+        logger.info(
+            "Analytics service initialized successfully",
+            version=__version__,
+            environment=config.service.environment
+        )
         
     except Exception as e:
-        logger.error(f"Failed to initialize service: {str(e)}", extra={
-            'traceback': traceback.format_exc()
-        })
+        logger.error("Failed to initialize service", error=str(e), exc_info=True)
         raise
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup resources on service shutdown."""
     logger.info("Shutting down analytics service")
+    await stop_metric_flusher()
+    await close_report_generator()
 
 @app.get("/health")
 async def health_check() -> Dict:
@@ -192,7 +304,7 @@ async def health_check() -> Dict:
     return {
         "status": "healthy",
         "version": __version__,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": utc_now_iso()
     }
 
 # Export FastAPI application instance
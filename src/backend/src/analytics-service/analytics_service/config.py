@@ -17,7 +17,7 @@ import re
 from functools import lru_cache
 
 # Constants for validation
-ALLOWED_ENVIRONMENTS = {"dev", "staging", "prod"}
+ALLOWED_ENVIRONMENTS = frozenset({"dev", "staging", "prod"})
 MIN_PORT = 1024
 MAX_PORT = 65535
 VERSION_PATTERN = re.compile(r"^\d+\.\d+\.\d+$")
@@ -28,9 +28,9 @@ class ServiceConfig(BaseModel):
     """Service-level configuration with enhanced security validation."""
     
     name: str = Field(default="analytics-service", const=True)
-    environment: str = Field(..., regex="^(dev|staging|prod)$")
+    environment: str = Field(..., pattern="^(dev|staging|prod)$")
     port: int = Field(..., ge=MIN_PORT, le=MAX_PORT)
-    version: str = Field(..., regex=VERSION_PATTERN.pattern)
+    version: str = Field(..., pattern=VERSION_PATTERN.pattern)
     correlation_id_header: str = Field(default="X-Correlation-ID")
     security_headers: Dict[str, str] = Field(default_factory=lambda: {
         "X-Content-Type-Options": "nosniff",
@@ -42,7 +42,7 @@ class ServiceConfig(BaseModel):
     @validator("environment")
     def validate_environment(cls, v):
         if v not in ALLOWED_ENVIRONMENTS:
-            raise ValueError(f"Environment must be one of {ALLOWED_ENVIRONMENTS}")
+            raise ValueError(f"Environment must be one of {set(ALLOWED_ENVIRONMENTS)}")
         return v
 
 @dataclass(frozen=True)
@@ -165,6 +165,15 @@ class Config(BaseModel):
             json_output=True
         )
 
+        # Load token verification settings; PEM keys may arrive with escaped newlines
+        security_settings = {}
+        jwt_public_key = os.getenv("JWT_PUBLIC_KEY")
+        if jwt_public_key:
+            security_settings["jwt_public_key"] = jwt_public_key.replace("\\n", "\n")
+        jwt_algorithm = os.getenv("JWT_ALGORITHM")
+        if jwt_algorithm:
+            security_settings["jwt_algorithm"] = jwt_algorithm
+
         # Apply any configuration overrides
         if overrides:
             # Implementation would merge overrides securely
@@ -175,7 +184,8 @@ class Config(BaseModel):
             service=service_config,
             database=database_config,
             metrics=metrics_config,
-            logger=logger_config
+            logger=logger_config,
+            security_settings=security_settings
         )
 
         cls._instance = config
@@ -13,13 +13,13 @@ from fastapi_cache import CacheControl  # version: 0.1.0+
 from fastapi_limiter import RateLimiter  # version: 0.1.0+
 from typing import Dict
 import logging
-from datetime import datetime
 
 # Internal imports
-from .gap_analysis import GapAnalysisController
-from .metrics import MetricsController
-from .reports import ReportController
+from .gap_analysis import router as gap_analysis_router
+from .metrics import router as metrics_router
+from .reports import router as reports_router
 from ..config import Config
+from ..utils.timestamps import utc_now_iso
 
 # Initialize router with prefix and tags
 router = APIRouter(
@@ -27,6 +27,12 @@ router = APIRouter(
     tags=["analytics"]
 )
 
+# Single /api/v1 parent router for all controller routes
+api_router = APIRouter(prefix="/api/v1")
+api_router.include_router(gap_analysis_router)
+api_router.include_router(metrics_router)
+api_router.include_router(reports_router)
+
 # Constants for rate limiting and caching
 RATE_LIMIT_REQUESTS = 100  # Requests per period
 RATE_LIMIT_PERIOD = 60    # Period in seconds
@@ -47,11 +53,6 @@ async def initialize_controllers(config: Config) -> APIRouter:
         logger = logging.getLogger(__name__)
         logger.info("Initializing analytics service controllers")
 
-        # Initialize controllers with configuration
-        gap_analysis_controller = GapAnalysisController(config)
-        metrics_controller = MetricsController(config)
-        report_controller = ReportController(config)
-
         # Add rate limiting middleware
         @router.middleware("http")
         async def rate_limit_middleware(request: Request, call_next):
@@ -96,7 +97,7 @@ async def initialize_controllers(config: Config) -> APIRouter:
 
                 return {
                     "status": "healthy",
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": utc_now_iso(),
                     "version": config.service.version,
                     "dependencies": dependencies
                 }
@@ -107,11 +108,6 @@ async def initialize_controllers(config: Config) -> APIRouter:
                     detail="Service health check failed"
                 )
 
-        # Register controller routes
-        router.include_router(gap_analysis_controller.router)
-        router.include_router(metrics_controller.router)
-        router.include_router(report_controller.router)
-
         # Add global exception handler
         @router.exception_handler(Exception)
         async def global_exception_handler(request: Request, exc: Exception):
@@ -119,7 +115,7 @@ async def initialize_controllers(config: Config) -> APIRouter:
             return {
                 "status": "error",
                 "message": "An unexpected error occurred",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": utc_now_iso()
             }
 
         logger.info("Analytics service controllers initialized successfully")
@@ -132,7 +128,5 @@ async def initialize_controllers(config: Config) -> APIRouter:
 # Export controllers for API route registration
 __all__ = [
     "initialize_controllers",
-    "GapAnalysisController",
-    "MetricsController",
-    "ReportController"
+    "api_router"
 ]
\ No newline at end of file
@@ -9,23 +9,30 @@ Version: 1.0.0
 """
 
 # External imports with versions
-from fastapi import APIRouter, Depends, HTTPException, Query  # version: 0.100+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response  # version: 0.100+
 from fastapi.security import OAuth2PasswordBearer  # version: 0.100+
 from pydantic import BaseModel, Field, validator  # version: 2.0+
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 from datetime import datetime
-import redis  # version: 4.0+
+from collections import OrderedDict
+import hashlib
+import time
+import orjson  # version: 3.9+
+from jose import JWTError, jwt  # version: 3.3+
+from redis.asyncio import Redis  # version: 4.6+
 from opentelemetry import trace  # version: 1.0+
 from functools import wraps
 
 # Internal imports
 from ..models.gap import GapModel, GapType, GapStatus
 from ..services.gap_analyzer import GapAnalyzer
+from ..services.metric_processor import MetricProcessor
 from ..config import Config
+from ..utils.timestamps import request_now
 
 # Initialize router with prefix and tags
 router = APIRouter(
-    prefix="/api/v1/gap-analysis",
+    prefix="/gap-analysis",
     tags=["gap-analysis"]
 )
 
@@ -34,13 +41,38 @@ tracer = trace.get_tracer(__name__)
 
 # Initialize Redis for caching
 config = Config.get_config()
-redis_client = redis.Redis(
+redis_client = Redis(
     host=config.cache.redis_host,
     port=config.cache.redis_port,
     db=0,
     decode_responses=True
 )
 
+# Cache TTLs resolved once from configuration
+_CACHE_TTL_ANALYZE = getattr(config.cache, 'analyze_ttl', 300)
+_CACHE_TTL_GAPS = getattr(config.cache, 'gaps_ttl', 60)
+
+# Shared analyzer instance; it holds no per-request state
+gap_analyzer = GapAnalyzer(metric_processor=MetricProcessor())
+
+# In-process cache capacity (entries) used in front of Redis
+LOCAL_CACHE_CAPACITY = 1024
+
+# Seconds an in-process entry is served; tag invalidation only clears the local
+# cache of the worker handling it, so other workers may lag by up to this long
+LOCAL_CACHE_TTL = 5
+
+# Authentication settings
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
+_JWT_KEY = config.security_settings.get('jwt_public_key')
+_JWT_ALGORITHM = config.security_settings.get('jwt_algorithm', 'RS256')
+if not _JWT_KEY:
+    raise RuntimeError("JWT_PUBLIC_KEY must be set to verify gap analysis bearer tokens")
+AUTH_CACHE_TTL = 60  # Seconds a verified token's claims are reused
+
+# Compliance frameworks accepted for analysis
+ALLOWED_FRAMEWORKS = frozenset({'SOC2', 'NIST', 'ISO27001', 'GDPR'})
+
 # Request/Response Models
 class GapAnalysisRequest(BaseModel):
     """Validated request model for gap analysis."""
@@ -54,9 +86,8 @@ class GapAnalysisRequest(BaseModel):
     @validator('frameworks')
     def validate_frameworks(cls, v):
         """Validate compliance frameworks."""
-        allowed_frameworks = {'SOC2', 'NIST', 'ISO27001', 'GDPR'}
-        if not all(f in allowed_frameworks for f in v):
-            raise ValueError(f"Frameworks must be one of {allowed_frameworks}")
+        if set(v) - ALLOWED_FRAMEWORKS:
+            raise ValueError(f"Frameworks must be one of {set(ALLOWED_FRAMEWORKS)}")
         return v
 
 class GapUpdateRequest(BaseModel):
@@ -67,35 +98,146 @@ class GapUpdateRequest(BaseModel):
     resolution_details: Optional[Dict] = None
     audit_note: Optional[str] = Field(None, max_length=1000)
 
-# Security and caching decorators
-def requires_auth(func):
-    """Decorator for endpoint authentication."""
-    @wraps(func)
-    async def wrapper(*args, **kwargs):
-        # Authentication logic would be implemented here
-        return await func(*args, **kwargs)
-    return wrapper
-
-def cache_response(ttl_seconds: int = 300):
-    """Decorator for response caching."""
+# Caching and security helpers
+class LocalTTLCache:
+    """Size-bounded in-process LRU cache with per-entry monotonic expiry."""
+
+    def __init__(self, capacity: int = LOCAL_CACHE_CAPACITY):
+        self._capacity = capacity
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a live cached value or None, evicting it if expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        deadline, value = entry
+        if deadline <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl_seconds: int) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        self._entries[key] = (time.monotonic() + ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._capacity:
+            self._entries.popitem(last=False)
+
+    def discard(self, keys: List[str]) -> None:
+        """Drop the given keys if present."""
+        for key in keys:
+            self._entries.pop(key, None)
+
+local_cache = LocalTTLCache()
+
+# Verified bearer token claims, keyed by raw token
+_auth_cache = LocalTTLCache()
+
+async def requires_auth(token: str = Depends(oauth2_scheme)) -> Dict:
+    """
+    FastAPI dependency validating the bearer token and returning its claims.
+
+    Verified claims are cached briefly (never beyond the token's expiry) to
+    avoid repeating signature verification on every request.
+    """
+    claims = _auth_cache.get(token)
+    if claims is not None:
+        return claims
+
+    try:
+        claims = jwt.decode(token, _JWT_KEY, algorithms=[_JWT_ALGORITHM])
+    except JWTError:
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+    ttl_seconds = AUTH_CACHE_TTL
+    if 'exp' in claims:
+        ttl_seconds = min(ttl_seconds, int(claims['exp'] - time.time()))
+    if ttl_seconds > 0:
+        _auth_cache.set(token, claims, ttl_seconds)
+    return claims
+
+async def invalidate_cache_tags(tags: List[str]) -> None:
+    """Unlink every cached response registered under the given tag sets."""
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for tag in tags:
+            pipe.smembers(tag)
+        members = await pipe.execute()
+
+    keys = [key for tag_keys in members for key in tag_keys]
+    local_cache.discard(keys)
+    await redis_client.unlink(*keys, *tags)
+
+def cache_response(ttl_seconds: int = 300, tags: Optional[Callable[[Dict], List[str]]] = None):
+    """
+    Decorator for two-tier (in-process L1, Redis L2) response caching. L1
+    entries live at most LOCAL_CACHE_TTL seconds so invalidations reach every
+    worker quickly.
+
+    Args:
+        ttl_seconds: Cache entry lifetime
+        tags: Optional callable mapping endpoint kwargs to Redis tag-set names
+            the cache key is registered under for targeted invalidation
+    """
     def decorator(func):
+        fname = func.__name__
+        local_ttl = min(ttl_seconds, LOCAL_CACHE_TTL)
+
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            cache_key = f"gap_analysis:{func.__name__}:{str(args)}:{str(kwargs)}"
-            cached_response = redis_client.get(cache_key)
-            
-            if cached_response:
+            # Hash the request parameters in canonical JSON form so every worker
+            # derives the same key; the per-caller auth claims are left out.
+            params = {
+                name: value.model_dump(mode='json') if isinstance(value, BaseModel) else value
+                for name, value in kwargs.items()
+                if name != 'auth'
+            }
+            payload = orjson.dumps(
+                {'args': args, 'kwargs': params},
+                default=str,
+                option=orjson.OPT_SORT_KEYS
+            )
+            digest = hashlib.blake2b(payload, digest_size=16).hexdigest()
+            cache_key = f"ga:{fname}:{digest}"
+
+            cached_response = local_cache.get(cache_key)
+            if cached_response is not None:
                 return cached_response
-                
+
+            cached_payload = await redis_client.get(cache_key)
+            if cached_payload:
+                cached_response = orjson.loads(cached_payload)
+                local_cache.set(cache_key, cached_response, local_ttl)
+                return cached_response
+
             response = await func(*args, **kwargs)
-            redis_client.setex(cache_key, ttl_seconds, str(response))
+            local_cache.set(cache_key, response, local_ttl)
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.setex(cache_key, ttl_seconds, orjson.dumps(response, default=str))
+                for tag in (tags(kwargs) if tags else []):
+                    pipe.sadd(tag, cache_key)
+                    # Tags are shared by endpoints with different TTLs: set a TTL on
+                    # new tags, then only ever extend it so no live key is orphaned
+                    pipe.expire(tag, ttl_seconds, nx=True)
+                    pipe.expire(tag, ttl_seconds, gt=True)
+                await pipe.execute()
             return response
         return wrapper
     return decorator
 
 @router.post("/analyze")
-@requires_auth
-@cache_response(ttl_seconds=300)
+@cache_response(
+    ttl_seconds=_CACHE_TTL_ANALYZE,
+    tags=lambda kw: [
+        f"gap_org:{kw['request'].organization_id}",
+        f"gap_exercise:{kw['request'].exercise_id}"
+    ]
+)
 async def analyze_exercise_gaps(
     request: GapAnalysisRequest,
     auth: Dict = Depends(requires_auth)
@@ -115,38 +257,25 @@ async def analyze_exercise_gaps(
     """
     with tracer.start_as_current_span("analyze_exercise_gaps") as span:
         try:
-            # Initialize gap analyzer with configuration
-            gap_analyzer = GapAnalyzer()
-            
-            # Analyze exercise data for gaps
-            gaps = gap_analyzer.analyze_exercise(
+            # Analyze exercise data for gaps, materializing only the requested page
+            total_gaps, paginated_gaps = gap_analyzer.analyze_exercise_page(
                 exercise_id=request.exercise_id,
-                organization_id=request.organization_id
+                organization_id=request.organization_id,
+                offset=(request.page_number - 1) * request.page_size,
+                limit=request.page_size,
+                frameworks=request.frameworks
             )
             
-            # Add compliance analysis if frameworks specified
-            if request.frameworks:
-                compliance_gaps = gap_analyzer.identify_compliance_gaps(
-                    exercise_id=request.exercise_id,
-                    frameworks=request.frameworks
-                )
-                gaps.extend(compliance_gaps)
-            
-            # Apply pagination
-            start_idx = (request.page_number - 1) * request.page_size
-            end_idx = start_idx + request.page_size
-            paginated_gaps = gaps[start_idx:end_idx]
-            
             # Format response
             response = {
-                "total_gaps": len(gaps),
+                "total_gaps": total_gaps,
                 "page_size": request.page_size,
                 "page_number": request.page_number,
-                "total_pages": (len(gaps) + request.page_size - 1) // request.page_size,
+                "total_pages": -(-total_gaps // request.page_size),
                 "gaps": [gap.to_dict() for gap in paginated_gaps]
             }
             
-            span.set_attribute("gaps.count", len(gaps))
+            span.set_attribute("gaps.count", total_gaps)
             return response
             
         except Exception as e:
@@ -154,8 +283,10 @@ async def analyze_exercise_gaps(
             raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{organization_id}/gaps")
-@requires_auth
-@cache_response(ttl_seconds=60)
+@cache_response(
+    ttl_seconds=_CACHE_TTL_GAPS,
+    tags=lambda kw: [f"gap_org:{kw['organization_id']}"]
+)
 async def get_organization_gaps(
     organization_id: str,
     gap_type: Optional[GapType] = None,
@@ -188,25 +319,41 @@ async def get_organization_gaps(
             # Build query filters
             filters = {"organization_id": organization_id}
             if gap_type:
-                filters["gap_type"] = gap_type
+                filters["gap_type"] = gap_type.value
             if status:
-                filters["status"] = status
+                filters["status"] = status.value
             if exercise_id:
                 filters["exercise_id"] = exercise_id
                 
-            # Execute query with pagination
-            total_gaps = GapModel.objects(**filters).count()
-            gaps = GapModel.objects(**filters)\
-                .skip((page_number - 1) * page_size)\
-                .limit(page_size)
+            # Fetch page and total count in a single round-trip
+            result = next(GapModel._get_collection().aggregate([
+                {"$match": filters},
+                {"$sort": {"identified_at": -1}},
+                {"$facet": {
+                    "page": [
+                        {"$skip": (page_number - 1) * page_size},
+                        {"$limit": page_size}
+                    ],
+                    "meta": [{"$count": "total"}]
+                }},
+                {"$project": {
+                    "page": 1,
+                    "total": {"$ifNull": [{"$arrayElemAt": ["$meta.total", 0]}, 0]}
+                }},
+                {"$addFields": {
+                    "total_pages": {"$ceil": {"$divide": ["$total", page_size]}}
+                }}
+            ]))
+            total_gaps = result["total"]
+            gaps = result["page"]
                 
             # Format response
             response = {
                 "total_gaps": total_gaps,
                 "page_size": page_size,
                 "page_number": page_number,
-                "total_pages": (total_gaps + page_size - 1) // page_size,
-                "gaps": [gap.to_dict() for gap in gaps]
+                "total_pages": int(result["total_pages"]),
+                "gaps": [GapModel.son_to_dict(doc) for doc in gaps]
             }
             
             span.set_attribute("gaps.count", total_gaps)
@@ -217,11 +364,11 @@ async def get_organization_gaps(
             raise HTTPException(status_code=500, detail=str(e))
 
 @router.put("/gaps/{gap_id}")
-@requires_auth
 async def update_gap_status(
     gap_id: str,
     request: GapUpdateRequest,
-    auth: Dict = Depends(requires_auth)
+    auth: Dict = Depends(requires_auth),
+    now: datetime = Depends(request_now)
 ) -> Dict:
     """
     Update gap status with audit trail and validation.
@@ -247,7 +394,7 @@ async def update_gap_status(
             # Update gap status and details
             gap.status = request.status
             gap.updated_by = request.updated_by
-            gap.updated_at = datetime.utcnow()
+            gap.updated_at = now
             
             if request.resolution_details:
                 gap.resolution_details = request.resolution_details
@@ -259,15 +406,13 @@ async def update_gap_status(
             gap.save()
             
             # Invalidate relevant caches
-            cache_keys = [
-                f"gap_analysis:get_organization_gaps:{gap.organization_id}*",
-                f"gap_analysis:analyze_exercise_gaps:{gap.exercise_id}*"
-            ]
-            for key in redis_client.keys(cache_keys):
-                redis_client.delete(key)
+            await invalidate_cache_tags([
+                f"gap_org:{gap.organization_id}",
+                f"gap_exercise:{gap.exercise_id}"
+            ])
                 
             span.set_attribute("gap.id", str(gap.id))
-            return gap.to_dict()
+            return Response(content=gap.to_json_bytes(), media_type="application/json")
             
         except Exception as e:
             span.set_attribute("error", str(e))
@@ -8,47 +8,327 @@ Version: 1.0.0
 """
 
 # External imports - versions specified as per requirements
-from fastapi import APIRouter, Depends, HTTPException, Query  # fastapi==0.100+
-from pydantic import BaseModel, Field, validator  # pydantic==2.0+
-from typing import Dict, List, Optional, Union  # python3.11+
-from datetime import datetime, timedelta  # python3.11+
-import redis  # redis==4.0+
-from functools import lru_cache
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response  # fastapi==0.100+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, field_validator  # pydantic==2.0+
+from typing import Dict, List, Optional, Tuple, Union  # python3.11+
+from datetime import datetime  # python3.11+
+from redis.asyncio import ConnectionPool, Redis  # redis==4.6+
+import asyncio
+import base64
+import bson  # pymongo==4.0+
+import hashlib
+import logging
+import msgpack  # msgpack==1.0+
+import numpy as np  # numpy==1.24+
+import orjson  # orjson==3.9+
+import pandas as pd  # pandas==2.0+
+from functools import lru_cache, partial
+from pymongo.errors import BulkWriteError, ServerSelectionTimeoutError  # pymongo==4.0+
 
 # Internal imports
-from ..models.metric import MetricModel
+from ..models.metric import MetricModel, format_timestamp
+from ..models.metric_bucket import MetricBucketModel
 from ..services.metric_processor import MetricProcessor
 from ..config import Config
+from ..utils.timestamps import request_now
 
-# Initialize router with prefix and tags
-router = APIRouter(
-    prefix="/api/v1",
-    tags=["metrics"]
-)
+# Initialize router with tags; mounted under /api/v1 by the controllers package
+router = APIRouter(tags=["metrics"])
+
+# Service settings resolved once at import
+service_config = Config.get_config().service
 
-# Initialize Redis client for caching
-redis_client = redis.Redis(
-    host=Config.get_config().service.redis_host,
-    port=Config.get_config().service.redis_port,
-    decode_responses=True
+# Initialize shared Redis connection pool and client for caching
+redis_pool = ConnectionPool.from_url(
+    f"redis://{service_config.redis_host}:{service_config.redis_port}/0",
+    max_connections=64
 )
+redis_client = Redis(connection_pool=redis_pool)
+
+# Cached /metrics responses lifetime in seconds
+METRICS_CACHE_TTL = 300
+
+# Metric fields returned by /metrics, read as raw BSON documents
+METRIC_FIELDS = ('series', 'value', 'timestamp', 'metadata')
+
+# Cursor batch size used when streaming metrics
+STREAM_BATCH_SIZE = 500
+
+# Binary wire format negotiated via the Accept header
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Batched submissions: maximum documents per insert and seconds to wait for a batch to fill
+METRIC_BATCH_SIZE = 1000
+METRIC_FLUSH_INTERVAL = 0.05
+
+# Maximum metrics awaiting bulk insert; batched submissions get 503 once it is full
+METRIC_QUEUE_MAXSIZE = 50000
+
+# Insert attempts per batch and first retry delay in seconds before a batch is dead-lettered
+METRIC_INSERT_ATTEMPTS = 3
+METRIC_RETRY_BACKOFF = 0.5
+
+# Redis list of BSON-encoded metrics that could not be inserted, capped to the newest entries
+METRIC_DEAD_LETTER_KEY = "metrics:dead_letter"
+METRIC_DEAD_LETTER_MAXLEN = 100000
+
+logger = logging.getLogger(__name__)
+
+# Metrics submitted with batch_mode awaiting bulk insert by the background flusher
+_METRIC_QUEUE: asyncio.Queue = asyncio.Queue(maxsize=METRIC_QUEUE_MAXSIZE)
+_flusher_task: Optional[asyncio.Task] = None
+
+# Queued by stop_metric_flusher to end the flusher after the metrics ahead of it
+_STOP_FLUSHER = object()
+
+@lru_cache(maxsize=1)
+def _metric_processor() -> MetricProcessor:
+    """Build the process-wide metric processor on first use."""
+    return MetricProcessor()
+
+def get_metric_processor() -> MetricProcessor:
+    """FastAPI dependency returning the shared metric processor."""
+    return _metric_processor()
+
+def _metrics_cache_key(
+    organization_id: str,
+    exercise_id: str,
+    metric_type: str,
+    start_time: datetime,
+    end_time: datetime,
+    page: int,
+    page_size: int,
+    filters: Optional[Dict],
+    page_token: Optional[str],
+    include_total: bool
+) -> str:
+    """Build a fixed-length canonical cache key for a /metrics query."""
+    filter_repr = repr(sorted(filters.items())) if filters else ""
+    canonical = (
+        f"{organization_id}|{exercise_id}|{metric_type}|{start_time.timestamp()}"
+        f"|{end_time.timestamp()}|{page}|{page_size}|{filter_repr}|{page_token}|{include_total}"
+    )
+    return f"metrics:v1:{hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()}"
+
+def _metrics_cache_tag(organization_id: str, exercise_id: str) -> str:
+    """Name of the Redis set tracking cached /metrics keys for an exercise."""
+    return f"metrics:tags:{organization_id}:{exercise_id}"
+
+async def _invalidate_metrics_cache(organization_id: str, exercise_id: str) -> None:
+    """Drop every cached /metrics page for an exercise."""
+    cache_tag = _metrics_cache_tag(organization_id, exercise_id)
+    cached_keys = await redis_client.smembers(cache_tag)
+    await redis_client.delete(cache_tag, *cached_keys)
+
+async def _dead_letter_metrics(documents: List[Dict], reason: str) -> None:
+    """Park metric documents that could not be inserted in the Redis dead-letter list."""
+    logger.error(f"Dead-lettering {len(documents)} metrics: {reason}")
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.rpush(METRIC_DEAD_LETTER_KEY, *(bson.encode(doc) for doc in documents))
+            pipe.ltrim(METRIC_DEAD_LETTER_KEY, -METRIC_DEAD_LETTER_MAXLEN, -1)
+            await pipe.execute()
+    except Exception as e:
+        logger.critical(f"Failed to dead-letter {len(documents)} metrics: {str(e)}")
+
+async def _insert_metrics(batch: List[Dict]) -> None:
+    """
+    Bulk insert a batch of validated metric documents off the event loop, add
+    the stored ones to their minute buckets, then invalidate the affected
+    cache tags.
+
+    Only inserts that never reached a server are retried, with exponential
+    backoff for up to METRIC_INSERT_ATTEMPTS attempts, because a time-series
+    collection does not reject a re-inserted _id. Documents the server rejects,
+    and batches whose insert failed after it may have been applied, are
+    dead-lettered instead. Bucket totals are recorded once, outside the retry.
+    """
+    loop = asyncio.get_running_loop()
+    insert = partial(
+        MetricModel.insert_documents, batch, batch_size=len(batch), record_buckets=False
+    )
+    inserted = batch
+    for attempt in range(1, METRIC_INSERT_ATTEMPTS + 1):
+        try:
+            # One insert_many per batch so write error indexes refer to batch positions
+            await loop.run_in_executor(None, insert)
+            break
+        except ServerSelectionTimeoutError as e:
+            # No server was selected, so nothing was written
+            if attempt == METRIC_INSERT_ATTEMPTS:
+                await _dead_letter_metrics(batch, str(e))
+                return
+            logger.warning(f"Metric batch insert attempt {attempt} failed, retrying: {str(e)}")
+            await asyncio.sleep(METRIC_RETRY_BACKOFF * 2 ** (attempt - 1))
+        except BulkWriteError as e:
+            # Unordered insert: every document without a write error was stored
+            failed = {write_error['index'] for write_error in e.details.get('writeErrors', ())}
+            inserted = [doc for i, doc in enumerate(batch) if i not in failed]
+            await _dead_letter_metrics([batch[i] for i in sorted(failed)], str(e))
+            break
+        except Exception as e:
+            # The write may have been applied; replays must skip stored _ids
+            await _dead_letter_metrics(batch, f"insert outcome unknown: {str(e)}")
+            return
+
+    if not inserted:
+        return
+    try:
+        await loop.run_in_executor(None, MetricBucketModel.record, inserted)
+    except Exception as e:
+        logger.error(f"Failed to record {len(inserted)} stored metrics in buckets: {str(e)}")
+
+    for organization_id, exercise_id in {
+        (doc['meta']['organization_id'], doc['meta']['exercise_id']) for doc in inserted
+    }:
+        await _invalidate_metrics_cache(organization_id, exercise_id)
+
+async def _insert_batch(batch: List[Dict]) -> None:
+    """Insert one flusher batch, logging rather than raising on failure."""
+    try:
+        await _insert_metrics(batch)
+    except Exception as e:
+        logger.error(f"Failed to process metric batch of {len(batch)}: {str(e)}")
+
+async def _flush_metrics() -> None:
+    """
+    Drain the metric queue into bulk inserts of up to METRIC_BATCH_SIZE documents
+    until the stop sentinel is dequeued. On cancellation, the batch already taken
+    off the queue is still inserted before the cancellation propagates.
+    """
+    loop = asyncio.get_running_loop()
+    stopping = False
+    while not stopping:
+        batch = []
+        try:
+            document = await _METRIC_QUEUE.get()
+            if document is _STOP_FLUSHER:
+                return
+            batch.append(document)
+            deadline = loop.time() + METRIC_FLUSH_INTERVAL
+            while len(batch) < METRIC_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    document = await asyncio.wait_for(_METRIC_QUEUE.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if document is _STOP_FLUSHER:
+                    stopping = True
+                    break
+                batch.append(document)
+        except asyncio.CancelledError:
+            if batch:
+                await _insert_batch(batch)
+            raise
+
+        # Shielded so cancellation cannot abandon an insert running in the executor
+        inserting = asyncio.ensure_future(_insert_batch(batch))
+        try:
+            await asyncio.shield(inserting)
+        except asyncio.CancelledError:
+            await inserting
+            raise
+
+async def start_metric_flusher() -> None:
+    """Start the background task that bulk inserts batched metric submissions."""
+    global _flusher_task
+    if _flusher_task is None:
+        _flusher_task = asyncio.create_task(_flush_metrics())
+
+async def stop_metric_flusher() -> None:
+    """
+    Stop the background flusher once it has inserted every metric queued ahead
+    of the stop sentinel, then insert any metrics submitted meanwhile.
+    """
+    global _flusher_task
+    if _flusher_task is not None:
+        await _METRIC_QUEUE.put(_STOP_FLUSHER)
+        await _flusher_task
+        _flusher_task = None
+
+    pending = []
+    while not _METRIC_QUEUE.empty():
+        pending.append(_METRIC_QUEUE.get_nowait())
+    for start in range(0, len(pending), METRIC_BATCH_SIZE):
+        await _insert_batch(pending[start:start + METRIC_BATCH_SIZE])
+
+def _wants_msgpack(accept: Optional[str]) -> bool:
+    """Whether the client asked for a MessagePack response."""
+    return accept is not None and MSGPACK_MEDIA_TYPE in accept
+
+def _msgpack_default(obj):
+    """Unwrap numpy scalars that msgpack cannot pack natively."""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
+def _msgpack_response(result: Dict) -> Response:
+    """Pack a result dictionary as a MessagePack response."""
+    return Response(
+        content=msgpack.packb(result, use_bin_type=True, default=_msgpack_default),
+        media_type=MSGPACK_MEDIA_TYPE
+    )
+
+def _pack_time_series(time_series: pd.DataFrame) -> Dict:
+    """
+    Pack a time series frame as typed buffers: epoch nanoseconds as little-endian
+    int64 and each numeric column as little-endian float64.
+    """
+    if time_series.empty:
+        return {"time": b"", "columns": {}}
+    numeric = time_series.select_dtypes(include="number")
+    return {
+        "time": time_series.index.to_numpy(dtype="datetime64[ns]").astype("<i8").tobytes(),
+        "columns": {
+            str(name): numeric[name].to_numpy(dtype="<f8").tobytes() for name in numeric.columns
+        }
+    }
+
+def _encode_page_token(timestamp: str, metric_id: str) -> str:
+    """Encode a metric's keyset position as an opaque page token."""
+    position = f"{timestamp}|{metric_id}"
+    return base64.urlsafe_b64encode(position.encode()).decode()
+
+def _project(doc: Dict) -> Dict:
+    """Shape a raw metric document like MetricModel.to_dict without building the model."""
+    doc.update(doc.pop('meta'))
+    doc['id'] = str(doc.pop('_id'))
+    doc['timestamp'] = format_timestamp(doc['timestamp'])
+    return doc
+
+def _decode_page_token(token: str) -> Tuple[datetime, str]:
+    """Decode a page token into a (timestamp, id) keyset position."""
+    try:
+        timestamp, metric_id = base64.urlsafe_b64decode(token.encode()).decode().split("|")
+        position = datetime.fromisoformat(timestamp), metric_id
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid page token")
+    if not bson.ObjectId.is_valid(metric_id):
+        raise HTTPException(status_code=400, detail="Invalid page token")
+    return position
 
 class MetricRequest(BaseModel):
     """Enhanced Pydantic model for metric submission requests with validation."""
+
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=False, validate_assignment=False)
     
     organization_id: str = Field(..., description="Organization identifier")
     exercise_id: str = Field(..., description="Exercise identifier")
     metric_type: str = Field(..., description="Type of metric being submitted")
     value: float = Field(..., description="Metric value")
     unit: Optional[str] = Field(None, description="Unit of measurement")
-    metadata: Optional[Dict] = Field(default={}, description="Additional metric metadata")
-    tags: Optional[List[str]] = Field(default=[], description="Metric tags")
-    dimensions: Optional[Dict] = Field(default={}, description="Metric dimensions")
+    metadata: Optional[Dict] = Field(default_factory=dict, description="Additional metric metadata")
+    tags: Optional[List[str]] = Field(default_factory=list, description="Metric tags")
+    dimensions: Optional[Dict] = Field(default_factory=dict, description="Metric dimensions")
 
-    @validator("value")
-    def validate_value(cls, v, values):
+    @field_validator("value", mode="after")
+    @classmethod
+    def validate_value(cls, v: float, info: ValidationInfo) -> float:
         """Validate metric value based on type and unit."""
-        metric_type = values.get("metric_type")
+        metric_type = info.data.get("metric_type")
         
         if metric_type == "percentage" and not 0 <= v <= 100:
             raise ValueError("Percentage values must be between 0 and 100")
@@ -58,52 +338,71 @@ class MetricRequest(BaseModel):
             
         return v
 
-    def to_model(self) -> MetricModel:
-        """Convert request to MetricModel instance with metadata."""
-        return MetricModel(
-            organization_id=self.organization_id,
-            exercise_id=self.exercise_id,
-            metric_type=self.metric_type,
-            value=self.value,
-            unit=self.unit,
-            metadata=self.metadata,
-            tags=self.tags,
-            timestamp=datetime.utcnow()
-        )
+    def _fields(self, now: datetime) -> Dict:
+        """Flat metric fields for the model, timestamped at now."""
+        return {
+            "organization_id": self.organization_id,
+            "exercise_id": self.exercise_id,
+            "metric_type": self.metric_type,
+            "value": self.value,
+            "unit": self.unit,
+            "metadata": self.metadata,
+            "tags": self.tags,
+            "timestamp": now
+        }
+
+    def to_document(self, now: datetime) -> Dict:
+        """Convert request to a validated raw metric document, timestamped at now."""
+        return MetricModel.to_document(self._fields(now))
+
+    def to_model(self, now: datetime) -> MetricModel:
+        """Convert request to MetricModel instance with metadata, timestamped at now."""
+        return MetricModel(**self._fields(now))
 
 @router.post("/metrics", response_model=Dict)
 async def submit_metric(
     request: MetricRequest,
-    batch_mode: Optional[bool] = Query(False, description="Enable batch processing"),
-    batch_size: Optional[int] = Query(1000, description="Batch size for processing")
+    batch_mode: Optional[bool] = Query(False, description="Queue for batched bulk insert"),
+    now: datetime = Depends(request_now)
 ) -> Dict:
     """
     Submit metrics with enhanced batch processing and caching support.
+
+    With ``batch_mode=true`` the metric is validated and queued for the background
+    flusher, and its locally assigned ID is returned before it is persisted. A
+    full queue is answered with 503 so clients back off and retry.
     """
     try:
-        processor = MetricProcessor()
-        
-        # Process metric
-        metric_model = request.to_model()
-        
-        # Store metric with batch processing if enabled
         if batch_mode:
-            success = processor.store_metric(
-                organization_id=request.organization_id,
-                exercise_id=request.exercise_id,
-                metric_type=request.metric_type,
-                value=request.value,
-                metadata=request.metadata
-            )
+            # Validated once here; the flusher inserts the raw document as is
+            document = request.to_document(now)
+            try:
+                _METRIC_QUEUE.put_nowait(document)
+            except asyncio.QueueFull:
+                raise HTTPException(
+                    status_code=503,
+                    detail="Metric queue is full, retry later",
+                    headers={"Retry-After": "1"}
+                )
+            success = True
+            metric_id, timestamp = document['_id'], document['timestamp']
         else:
+            metric_model = request.to_model(now)
             success = metric_model.save()
+            MetricBucketModel.record([metric_model.to_mongo()])
+            metric_id, timestamp = metric_model.id, metric_model.timestamp
+
+            # Invalidate cached pages for this exercise
+            await _invalidate_metrics_cache(request.organization_id, request.exercise_id)
 
         return {
             "status": "success" if success else "error",
-            "metric_id": str(metric_model.id),
-            "timestamp": metric_model.timestamp.isoformat()
+            "metric_id": str(metric_id),
+            "timestamp": timestamp.isoformat()
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -116,55 +415,97 @@ async def get_metrics(
     end_time: datetime,
     page: Optional[int] = Query(1, ge=1),
     page_size: Optional[int] = Query(50, ge=1, le=1000),
-    filters: Optional[Dict] = Query(None)
+    filters: Optional[Dict] = Query(None),
+    page_token: Optional[str] = Query(None, description="Opaque token from a previous page's next_token"),
+    include_total: bool = Query(False, description="Include the total matching count"),
+    stream: bool = Query(False, description="Stream all matching metrics as NDJSON")
 ) -> Dict:
     """
     Retrieve metrics with enhanced filtering and pagination support.
+
+    With ``stream=true`` every metric from the requested position onwards is
+    written as newline-delimited JSON without building the page in memory.
     """
     try:
+        if stream:
+            after = _decode_page_token(page_token) if page_token else None
+            queryset = MetricModel.get_metrics_by_timerange(
+                start_time=start_time,
+                end_time=end_time,
+                organization_id=organization_id,
+                exercise_id=exercise_id,
+                metric_type=metric_type,
+                batch_size=STREAM_BATCH_SIZE,
+                metadata_filters=filters,
+                after=after,
+                skip=0 if after else (page - 1) * page_size
+            ).no_cache().only(*METRIC_FIELDS).as_pymongo()
+
+            def ndjson_lines():
+                for doc in queryset:
+                    yield orjson.dumps(_project(doc)) + b"\n"
+
+            return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
         # Check cache first
-        cache_key = f"metrics:{organization_id}:{exercise_id}:{metric_type}:{start_time}:{end_time}:{page}"
-        cached_result = redis_client.get(cache_key)
+        cache_key = _metrics_cache_key(
+            organization_id, exercise_id, metric_type, start_time, end_time,
+            page, page_size, filters, page_token, include_total
+        )
+        cached_result = await redis_client.get(cache_key)
         
         if cached_result:
-            return cached_result
+            return Response(content=cached_result, media_type="application/json")
 
-        # Query metrics
-        metrics = MetricModel.get_metrics_by_timerange(
+        # Query one extra row to detect whether another page exists
+        after = _decode_page_token(page_token) if page_token else None
+        docs = MetricModel.get_metrics_serialized(
             start_time=start_time,
             end_time=end_time,
             organization_id=organization_id,
+            exercise_id=exercise_id,
             metric_type=metric_type,
-            batch_size=page_size
+            metadata_filters=filters,
+            after=after,
+            skip=0 if after else (page - 1) * page_size,
+            limit=page_size + 1
         )
-
-        # Apply filters if provided
-        if filters:
-            metrics = [m for m in metrics if all(
-                m.metadata.get(k) == v for k, v in filters.items()
-            )]
-
-        # Paginate results
-        start_idx = (page - 1) * page_size
-        end_idx = start_idx + page_size
-        paginated_metrics = metrics[start_idx:end_idx]
+        has_next = len(docs) > page_size
+        docs = docs[:page_size]
+        next_token = _encode_page_token(docs[-1]['timestamp'], docs[-1]['id']) if has_next else None
 
         result = {
-            "data": [m.to_dict() for m in paginated_metrics],
+            "data": docs,
             "page": page,
             "page_size": page_size,
-            "total_count": len(metrics)
+            "has_next": has_next,
+            "next_token": next_token
         }
+        if include_total:
+            result["total_count"] = MetricModel.count_metrics_in_timerange(
+                start_time=start_time,
+                end_time=end_time,
+                organization_id=organization_id,
+                exercise_id=exercise_id,
+                metric_type=metric_type,
+                metadata_filters=filters
+            )
 
-        # Cache result
-        redis_client.setex(
-            cache_key,
-            timedelta(minutes=5),
-            str(result)
-        )
+        # Serialize once for both the cache and the response body
+        payload = orjson.dumps(result)
 
-        return result
+        # Store the entry and register it for invalidation in one round-trip
+        cache_tag = _metrics_cache_tag(organization_id, exercise_id)
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.setex(cache_key, METRICS_CACHE_TTL, payload)
+        pipe.sadd(cache_tag, cache_key)
+        pipe.expire(cache_tag, METRICS_CACHE_TTL)
+        await pipe.execute()
+
+        return Response(content=payload, media_type="application/json")
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -173,14 +514,16 @@ async def get_metric_statistics(
     exercise_id: str,
     metric_type: str,
     start_time: datetime,
-    end_time: datetime
+    end_time: datetime,
+    accept: Optional[str] = Header(None),
+    processor: MetricProcessor = Depends(get_metric_processor)
 ) -> Dict:
     """
     Retrieve comprehensive metric statistics with enhanced analysis.
+
+    Responds with MessagePack when the client sends ``Accept: application/msgpack``.
     """
     try:
-        processor = MetricProcessor()
-        
         statistics = processor.calculate_statistics(
             exercise_id=exercise_id,
             metric_type=metric_type,
@@ -188,10 +531,13 @@ async def get_metric_statistics(
             end_time=end_time
         )
         
-        return {
+        result = {
             "status": "success",
             "statistics": statistics
         }
+        if _wants_msgpack(accept):
+            return _msgpack_response(result)
+        return result
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -202,13 +548,38 @@ async def get_time_series(
     metric_type: str,
     start_time: datetime,
     end_time: datetime,
-    interval: str = "1h"
+    interval: str = "1h",
+    stream: bool = Query(False, description="Stream raw windowed points as a JSON array"),
+    accept: Optional[str] = Header(None),
+    processor: MetricProcessor = Depends(get_metric_processor)
 ) -> Dict:
     """
     Generate time series data with enhanced analysis capabilities.
+
+    With ``stream=true`` the windowed points are streamed as a JSON array of
+    ``{"time", "value"}`` objects as they are read, without rolling statistics.
+    With ``Accept: application/msgpack`` the series is returned as MessagePack
+    with typed buffers in place of per-value encoding (see ``_pack_time_series``).
     """
     try:
-        processor = MetricProcessor()
+        if stream:
+            points = processor.iter_time_series(
+                organization_id=organization_id,
+                metric_type=metric_type,
+                start_time=start_time,
+                end_time=end_time,
+                interval=interval
+            )
+
+            def json_array():
+                yield b"["
+                separator = b""
+                for point_time, value in points:
+                    yield separator + orjson.dumps({"time": point_time, "value": value})
+                    separator = b","
+                yield b"]"
+
+            return StreamingResponse(json_array(), media_type="application/json")
         
         time_series = processor.generate_time_series(
             organization_id=organization_id,
@@ -217,6 +588,12 @@ async def get_time_series(
             end_time=end_time,
             interval=interval
         )
+
+        if _wants_msgpack(accept):
+            return _msgpack_response({
+                "status": "success",
+                "time_series": _pack_time_series(time_series)
+            })
         
         return {
             "status": "success",
@@ -9,31 +9,70 @@ Version: 1.0.0
 
 # External imports
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Response  # version: 0.100+
-from pydantic import BaseModel, Field
-from typing import Dict, List, Optional
+from pydantic import BaseModel, ConfigDict, Field
+from types import MappingProxyType
+from typing import Dict, Final, List, Mapping, Optional
 from datetime import datetime
+from functools import lru_cache
+from redis.asyncio import Redis  # version: 4.6+
+from bson import ObjectId
 
 # Internal imports
-from ..models.report import ReportModel, ReportType, ReportStatus
+from ..models.report import ReportModel, ReportType, ReportStatus, ReportFormat
+from ..services.gap_analyzer import GapAnalyzer
 from ..services.report_generator import ReportGenerator
+from ..config import Config
+from ..utils.timestamps import request_now
+from .metrics import get_metric_processor
 
-# Initialize router with prefix and tags
-router = APIRouter(
-    prefix="/api/v1",
-    tags=["reports"]
+# Initialize router with tags; mounted under /api/v1 by the controllers package
+router = APIRouter(tags=["reports"])
+
+# Report generator settings
+REPORT_GENERATOR_CONFIG = {
+    'template_path': 'templates/reports',
+    'aws_region': 'us-west-2',  # TODO: Get from config
+    's3_bucket': 'gameday-reports'
+}
+
+# Formatted exports of completed reports never change, so cache them for a day
+REPORT_EXPORT_CACHE_TTL = 86400
+
+# Service settings resolved once at import
+service_config = Config.get_config().service
+
+# Initialize Redis for caching formatted exports
+redis_client = Redis(
+    host=service_config.redis_host,
+    port=service_config.redis_port,
+    db=0
 )
 
+# Response media type per export format
+_CONTENT_TYPES: Final[Mapping[str, str]] = MappingProxyType({
+    ReportFormat.PDF.value: "application/pdf",
+    ReportFormat.HTML.value: "text/html",
+    ReportFormat.JSON.value: "application/json"
+})
+
+# Formats advertised on report responses
+AVAILABLE_FORMATS: Final[List[str]] = [f.value for f in ReportFormat]
+
+def _export_cache_key(report_id: str, format: str) -> str:
+    """Redis key for a formatted report export."""
+    return f"reports:export:{report_id}:{format}"
+
 class ReportRequest(BaseModel):
     """Enhanced request model for report generation with comprehensive options."""
+
+    model_config = ConfigDict(use_enum_values=True)
+
     organization_id: str = Field(..., description="Organization identifier")
     exercise_id: str = Field(..., description="Exercise identifier")
     report_type: ReportType = Field(..., description="Type of report to generate")
     options: Optional[Dict] = Field(default=None, description="Additional report options")
     frameworks: Optional[List[str]] = Field(default=None, description="Compliance frameworks to analyze")
-    format: Optional[str] = Field(default="PDF", description="Report output format")
-
-    class Config:
-        use_enum_values = True
+    format: ReportFormat = Field(default=ReportFormat.PDF, description="Report output format")
 
 class ReportResponse(BaseModel):
     """Enhanced response model for report details with extended metadata."""
@@ -42,40 +81,47 @@ class ReportResponse(BaseModel):
     file_url: Optional[str] = Field(None, description="URL to download report")
     content: Optional[Dict] = Field(None, description="Report content for JSON format")
     metadata: Optional[Dict] = Field(None, description="Additional report metadata")
-    available_formats: Optional[List[str]] = Field(default=["PDF", "HTML", "JSON"])
+    available_formats: Optional[List[str]] = Field(default=AVAILABLE_FORMATS)
 
-async def get_report_generator() -> ReportGenerator:
+@lru_cache(maxsize=1)
+def _report_generator() -> ReportGenerator:
     """
-    FastAPI dependency for report generator service with enhanced caching.
+    Build the process-wide report generator and its service graph on first use.
     
     Returns:
         ReportGenerator: Initialized report generator instance
     """
-    from ..services.gap_analyzer import GapAnalyzer
-    from ..services.metric_processor import MetricProcessor
-    
-    # Initialize dependencies with configuration
-    metric_processor = MetricProcessor()
+    # Share the metric processor used by the metrics endpoints
+    metric_processor = get_metric_processor()
     gap_analyzer = GapAnalyzer(metric_processor=metric_processor)
     
-    # Initialize report generator with enhanced capabilities
-    config = {
-        'template_path': 'templates/reports',
-        'aws_region': 'us-west-2',  # TODO: Get from config
-        's3_bucket': 'gameday-reports'
-    }
-    
     return ReportGenerator(
         gap_analyzer=gap_analyzer,
         metric_processor=metric_processor,
-        config=config
+        config=REPORT_GENERATOR_CONFIG
     )
 
+def get_report_generator() -> ReportGenerator:
+    """
+    FastAPI dependency returning the shared report generator.
+    
+    Returns:
+        ReportGenerator: Memoized report generator instance
+    """
+    return _report_generator()
+
+async def close_report_generator() -> None:
+    """Release the shared report generator's resources if it was created."""
+    if _report_generator.cache_info().currsize:
+        await _report_generator().aclose()
+        _report_generator.cache_clear()
+
 @router.post('/reports', response_model=ReportResponse)
 async def create_report(
     request: ReportRequest,
     background_tasks: BackgroundTasks,
-    report_generator: ReportGenerator = Depends(get_report_generator)
+    report_generator: ReportGenerator = Depends(get_report_generator),
+    now: datetime = Depends(request_now)
 ) -> ReportResponse:
     """
     Create a new report with enhanced validation and background processing.
@@ -89,27 +135,21 @@ async def create_report(
         ReportResponse: Initial report status with metadata
     """
     try:
-        # Validate report type and format
-        if request.format not in ["PDF", "HTML", "JSON"]:
-            raise HTTPException(
-                status_code=400,
-                detail="Unsupported format. Must be PDF, HTML, or JSON"
-            )
-
         # Create initial report document
         report = ReportModel(
             organization_id=request.organization_id,
             exercise_id=request.exercise_id,
             report_type=request.report_type,
-            title=f"{request.report_type.value} Report - {request.exercise_id}",
+            title=f"{request.report_type} Report - {request.exercise_id}",
             description=f"Comprehensive analysis report for exercise {request.exercise_id}",
             created_by="system",  # TODO: Get from auth context
             format=request.format,
             metadata={
                 "frameworks": request.frameworks,
                 "options": request.options,
-                "requested_at": datetime.utcnow().isoformat()
-            }
+                "requested_at": now.isoformat()
+            },
+            _now=now
         )
         
         # Add report generation to background tasks
@@ -117,7 +157,7 @@ async def create_report(
             report_generator.generate_report,
             organization_id=request.organization_id,
             exercise_id=request.exercise_id,
-            report_type=request.report_type,
+            report_type=ReportType(request.report_type),
             format=request.format,
             created_by="system",  # TODO: Get from auth context
             options=request.options
@@ -127,7 +167,7 @@ async def create_report(
             report_id=str(report.id),
             status=ReportStatus.PENDING.value,
             metadata=report.metadata,
-            available_formats=["PDF", "HTML", "JSON"]
+            available_formats=AVAILABLE_FORMATS
         )
         
     except Exception as e:
@@ -152,21 +192,28 @@ async def get_report(
         ReportResponse: Report details with content and metadata
     """
     try:
-        # Retrieve report document
-        report = ReportModel.objects(id=report_id).first()
-        if not report:
+        # Retrieve only the summary fields of the report
+        summary = ReportModel.objects(id=report_id).only(
+            'status', 'format', 'file_url', 'metadata'
+        ).as_pymongo().first()
+        if not summary:
             raise HTTPException(
                 status_code=404,
                 detail=f"Report {report_id} not found"
             )
+
+        # Load the full document only when its content is returned
+        content = None
+        if summary['format'] == "JSON":
+            content = ReportModel.get_reports_serialized({'_id': ObjectId(report_id)}, limit=1)[0]
             
         return ReportResponse(
-            report_id=str(report.id),
-            status=report.status.value,
-            file_url=report.file_url,
-            content=report.to_dict() if report.format == "JSON" else None,
-            metadata=report.metadata,
-            available_formats=["PDF", "HTML", "JSON"]
+            report_id=report_id,
+            status=summary['status'],
+            file_url=summary.get('file_url'),
+            content=content,
+            metadata=summary.get('metadata'),
+            available_formats=AVAILABLE_FORMATS
         )
         
     except HTTPException:
@@ -180,7 +227,7 @@ async def get_report(
 @router.get('/reports/{report_id}/export', response_class=Response)
 async def export_report(
     report_id: str,
-    format: str,
+    format: ReportFormat,
     report_generator: ReportGenerator = Depends(get_report_generator)
 ) -> Response:
     """
@@ -195,45 +242,47 @@ async def export_report(
         Response: Formatted report content with appropriate headers
     """
     try:
-        # Validate format
-        if format not in ["PDF", "HTML", "JSON"]:
-            raise HTTPException(
-                status_code=400,
-                detail="Unsupported format. Must be PDF, HTML, or JSON"
-            )
-            
-        # Retrieve report
-        report = ReportModel.objects(id=report_id).first()
-        if not report:
+        # Plain string value for cache keys, file names and the formatter
+        format = format.value
+
+        # Retrieve only the fields needed for the status gate
+        summary = ReportModel.objects(id=report_id).only('status').as_pymongo().first()
+        if not summary:
             raise HTTPException(
                 status_code=404,
                 detail=f"Report {report_id} not found"
             )
             
         # Check report status
-        if report.status != ReportStatus.COMPLETED:
+        if summary['status'] != ReportStatus.COMPLETED.value:
             raise HTTPException(
                 status_code=400,
                 detail="Report generation not completed"
             )
             
-        # Get content type based on format
-        content_types = {
-            "PDF": "application/pdf",
-            "HTML": "text/html",
-            "JSON": "application/json"
-        }
-        
-        # Export report in requested format
-        content = await report_generator._format_report(
-            content=report.to_dict(),
-            template_name=f"{report.report_type.value.lower()}.html",
-            format=format
-        )
+        # JSON exports are rendered once when the report completes
+        content = None
+        if format == "JSON":
+            stored = ReportModel.objects(id=report_id).only('serialized_json').as_pymongo().first()
+            content = stored.get('serialized_json') if stored else None
+
+        if content is None:
+            cache_key = _export_cache_key(report_id, format)
+            content = await redis_client.get(cache_key)
+            if content is None:
+                report = ReportModel.objects(id=report_id).exclude(
+                    'serialized_json', 'audit_log'
+                ).first()
+                content = await report_generator._format_report(
+                    content=report.to_dict(),
+                    report_type=ReportType(report.report_type),
+                    format=format
+                )
+                await redis_client.setex(cache_key, REPORT_EXPORT_CACHE_TTL, content)
         
         return Response(
             content=content,
-            media_type=content_types[format],
+            media_type=_CONTENT_TYPES[format],
             headers={
                 "Content-Disposition": f"attachment; filename=report_{report_id}.{format.lower()}"
             }
@@ -250,7 +299,8 @@ async def export_report(
 @router.delete('/reports/{report_id}')
 async def delete_report(
     report_id: str,
-    report_generator: ReportGenerator = Depends(get_report_generator)
+    report_generator: ReportGenerator = Depends(get_report_generator),
+    now: datetime = Depends(request_now)
 ) -> Dict:
     """
     Delete report with enhanced cleanup and cascade options.
@@ -263,26 +313,22 @@ async def delete_report(
         Dict: Deletion confirmation with cleanup status
     """
     try:
-        # Retrieve report
-        report = ReportModel.objects(id=report_id).first()
-        if not report:
+        # Delete report document without loading it
+        # TODO: Fetch file_url first once S3 file deletion is implemented
+        deleted = ReportModel.objects(id=report_id).delete()
+        if not deleted:
             raise HTTPException(
                 status_code=404,
                 detail=f"Report {report_id} not found"
             )
             
-        # Delete report file from S3 if exists
-        if report.file_url:
-            # TODO: Implement S3 file deletion
-            pass
-            
-        # Delete report document
-        report.delete()
+        # Drop any cached exports
+        await redis_client.delete(*(_export_cache_key(report_id, f) for f in AVAILABLE_FORMATS))
         
         return {
             "status": "success",
             "message": f"Report {report_id} deleted successfully",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": now.isoformat()
         }
         
     except HTTPException:
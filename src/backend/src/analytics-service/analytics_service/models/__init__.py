@@ -13,13 +13,15 @@ from typing import List, Type
 # Import core document models
 from .gap import GapModel, GapType, GapSeverity, GapStatus  # version: 0.27+
 from .metric import MetricModel  # version: 0.24.0
-from .report import ReportModel, ReportType, ReportStatus  # version: 0.27+
+from .metric_bucket import MetricBucketModel  # version: 0.24.0
+from .report import ReportModel, ReportType, ReportStatus, ReportFormat  # version: 0.27+
 
 # Define explicit exports for better IDE support and documentation
 __all__: List[str] = [
     # Core document models
     'GapModel',
     'MetricModel', 
+    'MetricBucketModel',
     'ReportModel',
     
     # Enums and types
@@ -27,7 +29,8 @@ __all__: List[str] = [
     'GapSeverity',
     'GapStatus',
     'ReportType',
-    'ReportStatus'
+    'ReportStatus',
+    'ReportFormat'
 ]
 
 # Type aliases for enhanced type checking
@@ -51,7 +54,7 @@ def _validate_models() -> bool:
     Raises:
         ImportError: If any required model is not properly initialized
     """
-    required_models = [GapModel, MetricModel, ReportModel]
+    required_models = [GapModel, MetricModel, MetricBucketModel, ReportModel]
     for model in required_models:
         if not hasattr(model, '_meta'):
             raise ImportError(f"Model {model.__name__} not properly initialized")
@@ -5,8 +5,10 @@ capabilities, processes, and compliance discovered during exercise analysis.
 Version: 1.0
 """
 
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Optional
 from enum import Enum, unique
+import orjson  # version: 3.9+
 from mongoengine import (  # version: 0.27+
     Document,
     StringField,
@@ -91,23 +93,30 @@ class GapModel(Document):
             'gap_type',
             'severity',
             'status',
-            'identified_at'
+            '-identified_at',
+            {
+                'fields': ['organization_id', '-identified_at']
+            },
+            {
+                'fields': ['organization_id', 'gap_type', 'status', 'exercise_id']
+            }
         ],
         'ordering': ['-identified_at']
     }
 
-    def __init__(self, **kwargs):
+    def __init__(self, _now: Optional[datetime] = None, **kwargs):
         """
         Initialize a new gap document with default values.
         
         Args:
+            _now (datetime, optional): Shared timestamp for default timestamps
             **kwargs: Keyword arguments for document fields
         """
         super().__init__(**kwargs)
         
         # Set default timestamps if not provided
         if not self.identified_at:
-            self.identified_at = datetime.utcnow()
+            self.identified_at = _now or datetime.now(timezone.utc)
         if not self.updated_at:
             self.updated_at = self.identified_at
             
@@ -145,6 +154,52 @@ class GapModel(Document):
             'updated_by': self.updated_by
         }
 
+    def to_json_bytes(self) -> bytes:
+        """
+        Serialize the gap document directly to JSON with orjson.
+        
+        Field values are encoded straight from the document data: the str-based
+        enums encode as their values and datetimes as ISO 8601, matching to_dict().
+        
+        Returns:
+            bytes: JSON representation of the gap document
+        """
+        return orjson.dumps(self._data, default=str, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    @staticmethod
+    def son_to_dict(doc: dict) -> dict:
+        """
+        Convert a raw pymongo gap document to the same representation as
+        to_dict() without hydrating a Document instance.
+        
+        Args:
+            doc (dict): Raw document as returned by the collection
+            
+        Returns:
+            dict: Dictionary representation of the gap document
+        """
+        resolved_at = doc.get('resolved_at')
+        return {
+            'id': str(doc['_id']),
+            'organization_id': doc['organization_id'],
+            'exercise_id': doc['exercise_id'],
+            'gap_type': doc['gap_type'],
+            'title': doc['title'],
+            'description': doc['description'],
+            'severity': doc['severity'],
+            'status': doc['status'],
+            'affected_areas': doc.get('affected_areas', []),
+            'compliance_frameworks': doc.get('compliance_frameworks', []),
+            'metrics': doc.get('metrics', {}),
+            'recommendations': doc.get('recommendations', []),
+            'resolution_details': doc.get('resolution_details', {}),
+            'identified_at': doc['identified_at'].isoformat(),
+            'updated_at': doc['updated_at'].isoformat(),
+            'resolved_at': resolved_at.isoformat() if resolved_at else None,
+            'created_by': doc['created_by'],
+            'updated_by': doc['updated_by']
+        }
+
     def update_status(self, new_status: GapStatus, updated_by: str, 
                      resolution_details: dict = None) -> bool:
         """
@@ -167,7 +222,7 @@ class GapModel(Document):
             
         # Update status and metadata
         self.status = new_status
-        self.updated_at = datetime.utcnow()
+        self.updated_at = datetime.now(timezone.utc)
         self.updated_by = updated_by
         
         # Set resolution timestamp if gap is being resolved
@@ -7,73 +7,236 @@ Version: 1.0.0
 
 # External imports - version specified as per requirements
 from mongoengine import Document, fields  # mongoengine==0.24.0
-from datetime import datetime
-from typing import Dict, List, Optional, Union
+from datetime import datetime, timezone
+from itertools import islice
+import math
+import numpy as np  # numpy==1.24+
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING  # pymongo==4.0+
+from pymongo.errors import BulkWriteError
 
 # Internal imports
 from ..config import MetricsConfig
+from .metric_bucket import (
+    BUCKET_INTERVALS,
+    METRICS_RETENTION_SECONDS,
+    MetricBucketModel,
+    gap_fill_stages
+)
+
+# Supported metric types and units
+METRIC_TYPES = frozenset({
+    'response_time',
+    'compliance_coverage',
+    'participant_engagement',
+    'decision_accuracy',
+    'communication_effectiveness',
+    'resource_utilization'
+})
+METRIC_UNITS = frozenset({'seconds', 'percentage', 'score', 'count', 'ratio'})
+
+# Series identity fields stored together in the time-series metaField
+SERIES_FIELDS = ('organization_id', 'exercise_id', 'metric_type', 'unit', 'tags')
+
+# Secondary index backing organization/metric type range reads, counts and keyset
+# paging; _id is the keyset tie-breaker, so pages are read in index order
+SERIES_TIME_INDEX = [
+    ('meta.organization_id', ASCENDING),
+    ('meta.metric_type', ASCENDING),
+    ('timestamp', DESCENDING),
+    ('_id', DESCENDING)
+]
+
+# Secondary index backing tag-filtered range reads within an organization
+SERIES_TAGS_TIME_INDEX = [
+    ('meta.organization_id', ASCENDING),
+    ('meta.tags', ASCENDING),
+    ('timestamp', DESCENDING)
+]
+
+# Secondary index backing per-exercise reads and keyset paging
+SERIES_EXERCISE_TIME_INDEX = [
+    ('meta.exercise_id', ASCENDING),
+    ('meta.metric_type', ASCENDING),
+    ('timestamp', DESCENDING),
+    ('_id', DESCENDING)
+]
+
+# Compound secondary indexes by name; their prefixes serve organization-only and
+# exercise-only filters, so no single-field series indexes are kept
+SECONDARY_INDEXES = (
+    ('series_organization_metric_type_time_id', SERIES_TIME_INDEX),
+    ('series_organization_tags_time', SERIES_TAGS_TIME_INDEX),
+    ('series_exercise_metric_type_time_id', SERIES_EXERCISE_TIME_INDEX)
+)
+
+# Superseded secondary indexes dropped when the collection is ensured
+RETIRED_SECONDARY_INDEXES = (
+    'series_organization_metric_type_time',
+    'series_exercise_metric_type_time'
+)
+
+# In-memory dtype of metric values: millisecond response times and 0-1 ratios
+# carry far fewer significant digits than float32 holds, at half the memory traffic
+VALUES_DTYPE = np.float32
+
+# Cursor batch sizing: spread an expected result over a few round trips, within bounds
+TARGET_ROUND_TRIPS = 3
+MIN_CURSOR_BATCH = 128
+MAX_CURSOR_BATCH = 16384
+
+def cursor_batch_size(expected_count: int, target_round_trips: int = TARGET_ROUND_TRIPS) -> int:
+    """
+    Size a cursor batch so that roughly ``expected_count`` documents arrive in
+    ``target_round_trips`` round trips, bounded to keep small reads lean and large
+    batches well inside the 16MB reply limit.
+    """
+    return min(max(MIN_CURSOR_BATCH, math.ceil(expected_count / target_round_trips)), MAX_CURSOR_BATCH)
+
+# Value range checks per metric type, built once at import
+_METRIC_VALIDATORS = {
+    'percentage': (lambda v: 0 <= v <= 100, "Percentage values must be between 0 and 100")
+}
+
+def _validate_metric(organization_id, exercise_id, metric_type, unit, value, tags) -> None:
+    """Check the metric invariants shared by clean() and to_document()."""
+    if not organization_id or not exercise_id:
+        raise ValueError("Organization and exercise identifiers are required")
+    if metric_type not in METRIC_TYPES:
+        raise ValueError(f"Unsupported metric type: {metric_type}")
+    if unit not in METRIC_UNITS:
+        raise ValueError(f"Unsupported unit: {unit}")
+    validator = _METRIC_VALIDATORS.get(metric_type)
+    if validator and not validator[0](value):
+        raise ValueError(validator[1])
+    if not all(type(tag) is str for tag in tags):
+        raise ValueError("All tags must be strings")
+
+# Documents per insert_many call in bulk ingestion, well inside the 16MB BSON limit
+BULK_INSERT_BATCH_SIZE = 5000
+
+# Serialized metric timestamps: ISO 8601 UTC with millisecond precision, MongoDB's
+# stored precision, as both $dateToString and format_timestamp() emit it
+SERIALIZED_TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S.%LZ'
+
+def format_timestamp(value: datetime) -> str:
+    """Format a stored metric timestamp like SERIALIZED_PROJECTION does."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat(timespec='milliseconds') + 'Z'
+
+# Server-side projection producing the to_dict() shape, with ISO timestamps and string ids
+SERIALIZED_PROJECTION = {
+    '_id': 0,
+    'id': {'$toString': '$_id'},
+    'organization_id': '$meta.organization_id',
+    'exercise_id': '$meta.exercise_id',
+    'metric_type': '$meta.metric_type',
+    'unit': '$meta.unit',
+    'tags': '$meta.tags',
+    'value': 1,
+    'timestamp': {'$dateToString': {'date': '$timestamp', 'format': SERIALIZED_TIMESTAMP_FORMAT}},
+    'metadata': 1
+}
 
 class MetricModel(Document):
     """
     MongoDB document model for storing exercise performance metrics and analytics data
-    with optimized time-series support and comprehensive indexing strategies.
+    in a native time-series collection.
+
+    The series identity (organization, exercise, metric type, unit and tags) is
+    stored as the collection's metaField ``meta`` and exposed as read-only
+    attributes; ``is_aggregated`` and ``batch_size`` are transient and not stored.
     """
 
-    # Document fields with validation and indexing
-    organization_id = fields.StringField(required=True, index=True)
-    exercise_id = fields.StringField(required=True, index=True)
-    metric_type = fields.StringField(
-        required=True, 
-        index=True,
-        choices=[
-            'response_time',
-            'compliance_coverage',
-            'participant_engagement',
-            'decision_accuracy',
-            'communication_effectiveness',
-            'resource_utilization'
-        ]
-    )
+    # Time-series metaField; MongoDB buckets measurements by its value
+    series = fields.DictField(db_field='meta', required=True)
     value = fields.FloatField(required=True)
-    timestamp = fields.DateTimeField(required=True, index=-1)
+    timestamp = fields.DateTimeField(required=True)
     metadata = fields.DictField(default=dict)
-    unit = fields.StringField(
-        required=True,
-        choices=['seconds', 'percentage', 'score', 'count', 'ratio']
-    )
-    is_aggregated = fields.BooleanField(default=False)
-    batch_size = fields.IntField(default=1000)
-    tags = fields.ListField(fields.StringField(), default=list)
 
     meta = {
         'collection': 'metrics',
-        'indexes': [
-            {'fields': ['timestamp'], 'expireAfterSeconds': 7776000},  # 90 days TTL
-            {'fields': ['organization_id', 'metric_type', 'timestamp']},
-            {'fields': ['exercise_id', 'metric_type', 'timestamp']},
-            {'fields': ['tags', 'timestamp']},
-            {'fields': ['is_aggregated', 'timestamp']}
-        ],
+        'indexes': [],
         'ordering': ['-timestamp']
     }
 
+    @classmethod
+    def ensure_indexes(cls):
+        """
+        Create the metrics time-series collection if missing, with native TTL,
+        plus the compound secondary indexes on series identity and time (MongoDB 5.0+).
+        """
+        db = cls._get_db()
+        collection_name = cls._get_collection_name()
+        if collection_name not in db.list_collection_names(filter={'name': collection_name}):
+            db.create_collection(
+                collection_name,
+                timeseries={
+                    'timeField': 'timestamp',
+                    'metaField': 'meta',
+                    'granularity': 'minutes'
+                },
+                expireAfterSeconds=METRICS_RETENTION_SECONDS
+            )
+        for name, keys in SECONDARY_INDEXES:
+            db[collection_name].create_index(keys, name=name)
+        existing = db[collection_name].index_information()
+        for name in RETIRED_SECONDARY_INDEXES:
+            if name in existing:
+                db[collection_name].drop_index(name)
+
     def __init__(self, *args, **kwargs):
         """
         Initialize a new metric document with enhanced validation and defaults.
+
+        Series identity fields may be passed as keyword arguments and are folded
+        into the ``series`` metaField.
         """
+        # Fold series identity into the metaField
+        series = kwargs.pop('series', None) or {}
+        for name in SERIES_FIELDS:
+            if name in kwargs:
+                series[name] = kwargs.pop(name)
+        series.setdefault('tags', [])
+        kwargs['series'] = series
+
+        # Transient processing attributes, not persisted
+        is_aggregated = kwargs.pop('is_aggregated', False)
+        batch_size = kwargs.pop('batch_size', MetricsConfig.batch_size)
+
         # Set default timestamp if not provided
         if 'timestamp' not in kwargs:
-            kwargs['timestamp'] = datetime.utcnow()
+            kwargs['timestamp'] = datetime.now(timezone.utc)
 
         # Initialize empty metadata if not provided
         if 'metadata' not in kwargs:
             kwargs['metadata'] = {}
 
-        # Set default batch size from config if not provided
-        if 'batch_size' not in kwargs:
-            kwargs['batch_size'] = MetricsConfig.batch_size
-
         super().__init__(*args, **kwargs)
+        self.is_aggregated = is_aggregated
+        self.batch_size = batch_size
+
+    @property
+    def organization_id(self) -> Optional[str]:
+        return self.series.get('organization_id')
+
+    @property
+    def exercise_id(self) -> Optional[str]:
+        return self.series.get('exercise_id')
+
+    @property
+    def metric_type(self) -> Optional[str]:
+        return self.series.get('metric_type')
+
+    @property
+    def unit(self) -> Optional[str]:
+        return self.series.get('unit')
+
+    @property
+    def tags(self) -> List[str]:
+        return self.series.get('tags', [])
 
     def clean(self):
         """
@@ -87,13 +250,125 @@ class MetricModel(Document):
         if not isinstance(self.metadata, dict):
             raise ValueError("Metadata must be a dictionary")
 
-        # Validate value ranges based on metric type
-        if self.metric_type == 'percentage' and not 0 <= self.value <= 100:
-            raise ValueError("Percentage values must be between 0 and 100")
+        # Validate series identity, value range and tags
+        _validate_metric(
+            self.organization_id, self.exercise_id, self.metric_type,
+            self.unit, self.value, self.tags
+        )
+
+    @staticmethod
+    def to_document(raw: Dict) -> Dict:
+        """
+        Validate a flat metric dictionary with the same invariants as clean() and
+        build its stored document without instantiating a Document.
+
+        Args:
+            raw: Metric fields with the series identity at top level, optionally
+                carrying a pre-assigned ``id`` and an aware ``timestamp``
+
+        Returns:
+            Dict: Raw document ready for insert_many
+
+        Raises:
+            ValueError: If the metric violates a model invariant
+        """
+        organization_id = raw.get('organization_id')
+        exercise_id = raw.get('exercise_id')
+        metric_type = raw.get('metric_type')
+        unit = raw.get('unit')
+        value = float(raw['value'])
+        tags = raw.get('tags') or []
+        metadata = raw.get('metadata') or {}
+
+        _validate_metric(organization_id, exercise_id, metric_type, unit, value, tags)
+        if not isinstance(metadata, dict):
+            raise ValueError("Metadata must be a dictionary")
 
-        # Validate tags format
-        if any(not isinstance(tag, str) for tag in self.tags):
-            raise ValueError("All tags must be strings")
+        # Store naive UTC timestamps, as clean() does
+        timestamp = raw.get('timestamp') or datetime.now(timezone.utc)
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+
+        return {
+            '_id': raw.get('id') or ObjectId(),
+            'meta': {
+                'organization_id': organization_id,
+                'exercise_id': exercise_id,
+                'metric_type': metric_type,
+                'unit': unit,
+                'tags': tags
+            },
+            'value': value,
+            'timestamp': timestamp,
+            'metadata': metadata
+        }
+
+    @classmethod
+    def insert_documents(
+        cls,
+        documents: List[Dict],
+        ordered: bool = False,
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+        record_buckets: bool = True
+    ) -> int:
+        """
+        Insert already validated raw documents in chunks with insert_many and
+        add them to their minute buckets. When a chunk partially fails, the
+        documents that were inserted are still added to their buckets before
+        the BulkWriteError propagates.
+
+        Callers that retry failed inserts pass ``record_buckets=False`` and call
+        MetricBucketModel.record() once for the stored documents, since bucket
+        upserts increment totals and must not be repeated.
+
+        Returns:
+            int: Number of documents inserted
+        """
+        collection = cls._get_collection()
+        inserted = 0
+        for start in range(0, len(documents), batch_size):
+            chunk = documents[start:start + batch_size]
+            try:
+                result = collection.insert_many(chunk, ordered=ordered, bypass_document_validation=True)
+            except BulkWriteError as error:
+                if not record_buckets:
+                    raise
+                failed = {write_error['index'] for write_error in error.details.get('writeErrors', ())}
+                if ordered:
+                    # An ordered insert stops at its first failure
+                    MetricBucketModel.record(chunk[:min(failed, default=len(chunk))])
+                else:
+                    MetricBucketModel.record(doc for i, doc in enumerate(chunk) if i not in failed)
+                raise
+            if record_buckets:
+                MetricBucketModel.record(chunk)
+            inserted += len(result.inserted_ids)
+        return inserted
+
+    @classmethod
+    def bulk_insert(
+        cls,
+        raw_dicts: List[Dict],
+        ordered: bool = False,
+        batch_size: int = BULK_INSERT_BATCH_SIZE
+    ) -> int:
+        """
+        Ingest flat metric dictionaries with one insert_many per ``batch_size``
+        documents, validating each once via to_document() instead of clean().
+
+        Args:
+            raw_dicts: Flat metric dictionaries as accepted by to_document()
+            ordered: Stop at the first failed insert instead of continuing
+            batch_size: Maximum documents per insert_many call
+
+        Returns:
+            int: Number of documents inserted
+
+        Raises:
+            ValueError: If any metric violates a model invariant; nothing is inserted
+        """
+        documents = [cls.to_document(raw) for raw in raw_dicts]
+        return cls.insert_documents(documents, ordered=ordered, batch_size=batch_size)
 
     def to_dict(self) -> Dict:
         """
@@ -105,7 +380,7 @@ class MetricModel(Document):
             'exercise_id': self.exercise_id,
             'metric_type': self.metric_type,
             'value': self.value,
-            'timestamp': self.timestamp.isoformat(),
+            'timestamp': format_timestamp(self.timestamp),
             'metadata': self.metadata,
             'unit': self.unit,
             'is_aggregated': self.is_aggregated,
@@ -113,6 +388,38 @@ class MetricModel(Document):
             'tags': self.tags
         }
 
+    @staticmethod
+    def _timerange_query(
+        start_time: datetime,
+        end_time: datetime,
+        organization_id: Optional[str],
+        metric_type: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        metadata_filters: Optional[Dict] = None,
+        exercise_id: Optional[str] = None
+    ) -> Dict:
+        """
+        Build the raw query filter shared by time range reads and counts.
+        """
+        # Build base query against the series metaField
+        query = {'timestamp': {'$gte': start_time, '$lte': end_time}}
+
+        # Add optional filters
+        if organization_id:
+            query['meta.organization_id'] = organization_id
+        if exercise_id:
+            query['meta.exercise_id'] = exercise_id
+        if metric_type:
+            query['meta.metric_type'] = metric_type
+        if tags:
+            query['meta.tags'] = {'$all': tags}
+
+        # Match metadata keys server-side as dotted paths
+        for key, value in (metadata_filters or {}).items():
+            query[f'metadata.{key}'] = value
+
+        return {'__raw__': query}
+
     @classmethod
     def get_metrics_by_timerange(
         cls,
@@ -122,29 +429,272 @@ class MetricModel(Document):
         metric_type: Optional[str] = None,
         tags: Optional[List[str]] = None,
         batch_size: Optional[int] = None,
-        sort_order: str = '-timestamp'
+        sort_order: str = '-timestamp',
+        metadata_filters: Optional[Dict] = None,
+        after: Optional[Tuple[datetime, str]] = None,
+        skip: int = 0,
+        limit: Optional[int] = None,
+        expected_count: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        exercise_id: Optional[str] = None
     ) -> List['MetricModel']:
         """
         Retrieve metrics within a specified time range with advanced filtering.
+
+        ``fields`` restricts the documents to the named model fields, leaving
+        the others unloaded and off the wire; ``exercise_id`` narrows the read
+        to a single exercise.
+
+        Pagination is applied server-side: either offset based via ``skip``, or
+        keyset based via ``after``, a (timestamp, id) pair of the last metric of
+        the previous page for the default descending sort.
+
+        Without an explicit ``batch_size`` the cursor batch is sized from
+        ``expected_count`` (or ``limit``), falling back to the configured default.
         """
-        # Build base query
-        query = {
-            'organization_id': organization_id,
-            'timestamp': {'$gte': start_time, '$lte': end_time}
-        }
+        query = cls._timerange_query(
+            start_time, end_time, organization_id, metric_type, tags, metadata_filters, exercise_id
+        )
 
-        # Add optional filters
-        if metric_type:
-            query['metric_type'] = metric_type
-        if tags:
-            query['tags__all'] = tags
+        # Continue strictly after the keyset position
+        if after:
+            query['__raw__']['$or'] = cls._after_clause(after)
 
         # Set batch size for cursor
         if not batch_size:
-            batch_size = MetricsConfig.batch_size
+            expected = expected_count if expected_count is not None else limit
+            batch_size = cursor_batch_size(expected) if expected is not None else MetricsConfig.batch_size
+
+        # Execute query with proper indexing; id breaks timestamp ties for keyset
+        # paging in the same direction, so the series index serves the sort
+        tie_breaker = '-id' if sort_order.startswith('-') else 'id'
+        queryset = cls.objects(**query).order_by(sort_order, tie_breaker).batch_size(batch_size)
+        if skip:
+            queryset = queryset.skip(skip)
+        if limit is not None:
+            queryset = queryset.limit(limit)
+        if fields:
+            queryset = queryset.only(*fields)
+        return queryset
 
-        # Execute query with proper indexing
-        return cls.objects(**query).order_by(sort_order).batch_size(batch_size)
+    @classmethod
+    def get_metric_series(
+        cls,
+        start_time: datetime,
+        end_time: datetime,
+        organization_id: str,
+        metric_type: Optional[str] = None,
+        include_metadata: bool = False,
+        **kwargs
+    ) -> List['MetricModel']:
+        """
+        Retrieve the lean (series, value, timestamp) view of metrics for charts,
+        optionally with metadata; other arguments follow get_metrics_by_timerange.
+        """
+        fields = ['series', 'value', 'timestamp']
+        if include_metadata:
+            fields.append('metadata')
+        return cls.get_metrics_by_timerange(
+            start_time, end_time, organization_id, metric_type, fields=fields, **kwargs
+        )
+
+    @staticmethod
+    def _after_clause(after: Tuple[datetime, str]) -> List[Dict]:
+        """
+        Build the keyset condition selecting metrics strictly after a (timestamp, id)
+        position in descending (timestamp, _id) order.
+        """
+        after_timestamp, after_id = after
+        return [
+            {'timestamp': {'$lt': after_timestamp}},
+            {'timestamp': after_timestamp, '_id': {'$lt': ObjectId(after_id)}}
+        ]
+
+    @classmethod
+    def get_metrics_serialized(
+        cls,
+        start_time: datetime,
+        end_time: datetime,
+        organization_id: str,
+        metric_type: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        metadata_filters: Optional[Dict] = None,
+        after: Optional[Tuple[datetime, str]] = None,
+        skip: int = 0,
+        limit: Optional[int] = None,
+        exercise_id: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Retrieve a page of metrics already shaped like to_dict() by a server-side
+        $project, so documents can be JSON encoded as returned.
+
+        Pagination and the ``exercise_id`` filter follow get_metrics_by_timerange:
+        offset based via ``skip`` or keyset based via ``after``.
+        """
+        match = cls._timerange_query(
+            start_time, end_time, organization_id, metric_type, tags, metadata_filters, exercise_id
+        )['__raw__']
+        if after:
+            match['$or'] = cls._after_clause(after)
+
+        pipeline = [{'$match': match}, {'$sort': {'timestamp': -1, '_id': -1}}]
+        if skip:
+            pipeline.append({'$skip': skip})
+        if limit is not None:
+            pipeline.append({'$limit': limit})
+        pipeline.append({'$project': SERIALIZED_PROJECTION})
+
+        batch_size = cursor_batch_size(limit) if limit is not None else MetricsConfig.batch_size
+        return list(cls._get_collection().aggregate(pipeline, batchSize=batch_size))
+
+    @classmethod
+    def get_metrics_batched(
+        cls,
+        start_time: datetime,
+        end_time: datetime,
+        organization_id: str,
+        metric_type: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        metadata_filters: Optional[Dict] = None,
+        projection: Optional[Dict] = None,
+        batch_size: int = 1000
+    ) -> Iterator[List[Dict]]:
+        """
+        Iterate metrics within a time range as lists of raw documents, newest first.
+
+        Reads go straight through pymongo, skipping MetricModel construction;
+        ``projection`` (in stored field names, e.g. ``{'value': 1, '_id': 0}``)
+        limits the fields sent over the wire.
+        """
+        query = cls._timerange_query(
+            start_time, end_time, organization_id, metric_type, tags, metadata_filters
+        )['__raw__']
+        cursor = cls._get_collection().find(
+            query, projection, batch_size=batch_size
+        ).sort('timestamp', DESCENDING)
+
+        while batch := list(islice(cursor, batch_size)):
+            yield batch
+
+    @classmethod
+    def get_values_array(
+        cls,
+        start_time: datetime,
+        end_time: datetime,
+        organization_id: Optional[str],
+        metric_type: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        metadata_filters: Optional[Dict] = None,
+        expected_count: Optional[int] = None,
+        exercise_id: Optional[str] = None
+    ) -> np.ndarray:
+        """
+        Read the values of metrics within a time range, newest first, straight
+        from the cursor into one contiguous VALUES_DTYPE array.
+
+        Metrics are selected by organization, exercise or both. Only ``value`` is
+        projected; ``expected_count`` sizes the cursor batches.
+        """
+        query = cls._timerange_query(
+            start_time, end_time, organization_id, metric_type, tags, metadata_filters,
+            exercise_id=exercise_id
+        )['__raw__']
+        batch_size = cursor_batch_size(expected_count) if expected_count is not None else 1000
+        cursor = cls._get_collection().find(
+            query, {'value': 1, '_id': 0}, batch_size=batch_size
+        ).sort('timestamp', DESCENDING)
+
+        return np.fromiter((doc['value'] for doc in cursor), dtype=VALUES_DTYPE)
+
+    @classmethod
+    def get_values_by_exercise(
+        cls,
+        exercise_ids: List[str],
+        metric_type: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Read the values of several exercises' metrics in one query, split into a
+        newest-first VALUES_DTYPE array per exercise.
+
+        Without a time range, each exercise's full history is read.
+        """
+        query = {'meta.exercise_id': {'$in': list(exercise_ids)}, 'meta.metric_type': metric_type}
+        if start_time is not None or end_time is not None:
+            query['timestamp'] = {}
+            if start_time is not None:
+                query['timestamp']['$gte'] = start_time
+            if end_time is not None:
+                query['timestamp']['$lte'] = end_time
+
+        # Exercise-major, newest-first order keeps each exercise's values contiguous
+        cursor = cls._get_collection().find(
+            query, {'_id': 0, 'value': 1, 'meta.exercise_id': 1}, batch_size=MAX_CURSOR_BATCH
+        ).sort([('meta.exercise_id', ASCENDING), ('timestamp', DESCENDING)])
+
+        labels = []
+        values = []
+        for doc in cursor:
+            labels.append(doc['meta']['exercise_id'])
+            values.append(doc['value'])
+        if not values:
+            return {}
+
+        labels = np.array(labels, dtype=object)
+        boundaries = np.flatnonzero(labels[1:] != labels[:-1]) + 1
+        groups = np.split(np.array(values, dtype=VALUES_DTYPE), boundaries)
+        return {labels[start]: group for start, group in zip(np.r_[0, boundaries], groups)}
+
+    @classmethod
+    def exercise_timeframe(cls, exercise_id: str) -> Optional[Tuple[datetime, datetime]]:
+        """
+        First and last metric timestamps recorded for an exercise, or None when
+        it has no metrics.
+        """
+        result = list(cls._get_collection().aggregate([
+            {'$match': {'meta.exercise_id': exercise_id}},
+            {'$group': {'_id': None, 'start': {'$min': '$timestamp'}, 'end': {'$max': '$timestamp'}}}
+        ]))
+        if not result:
+            return None
+        return result[0]['start'], result[0]['end']
+
+    @classmethod
+    def exercise_version(cls, exercise_id: str) -> Tuple[Optional[datetime], Optional[str]]:
+        """
+        Cheap fingerprint of an exercise's metrics: the timestamp and ObjectId of
+        its newest metric, read through the per-exercise index, which change
+        whenever a metric is added.
+        """
+        newest = cls._get_collection().find_one(
+            {'meta.exercise_id': exercise_id},
+            {'_id': 1, 'timestamp': 1},
+            sort=[('timestamp', DESCENDING)]
+        )
+        if newest is None:
+            return None, None
+        return newest['timestamp'], str(newest['_id'])
+
+    @classmethod
+    def count_metrics_in_timerange(
+        cls,
+        start_time: datetime,
+        end_time: datetime,
+        organization_id: str,
+        metric_type: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        metadata_filters: Optional[Dict] = None,
+        exercise_id: Optional[str] = None
+    ) -> int:
+        """
+        Count metrics within a time range, optionally of one exercise, using the
+        series/time secondary index.
+        """
+        query = cls._timerange_query(
+            start_time, end_time, organization_id, metric_type, tags, metadata_filters, exercise_id
+        )
+        return cls.objects(**query).hint(SERIES_TIME_INDEX).count()
 
     @classmethod
     def aggregate_metrics(
@@ -157,12 +707,23 @@ class MetricModel(Document):
     ) -> List[Dict]:
         """
         Perform time-based aggregation of metrics with advanced grouping.
+
+        Intervals of a minute or coarser are served from the pre-aggregated
+        minute buckets; finer intervals group the raw measurements. Either way
+        the result carries a trailing ``moving_avg`` of the interval averages,
+        and is dense over the range, with empty intervals zero-filled, unless
+        the range spans more than MAX_DENSIFY_STEPS intervals.
         """
+        if interval in BUCKET_INTERVALS:
+            return MetricBucketModel.aggregate(
+                organization_id, metric_type, interval, start_time, end_time
+            )
+
         pipeline = [
             {
                 '$match': {
-                    'organization_id': organization_id,
-                    'metric_type': metric_type,
+                    'meta.organization_id': organization_id,
+                    'meta.metric_type': metric_type,
                     'timestamp': {'$gte': start_time, '$lte': end_time}
                 }
             },
@@ -175,7 +736,7 @@ class MetricModel(Document):
                                 'unit': interval
                             }
                         },
-                        'metric_type': '$metric_type'
+                        'metric_type': '$meta.metric_type'
                     },
                     'avg_value': {'$avg': '$value'},
                     'min_value': {'$min': '$value'},
@@ -183,9 +744,11 @@ class MetricModel(Document):
                     'count': {'$sum': 1}
                 }
             },
-            {
-                '$sort': {'_id.interval': 1}
-            }
+            *gap_fill_stages(interval, start_time, end_time)
         ]
 
-        return list(cls.objects.aggregate(pipeline))
\ No newline at end of file
+        # Aggregate with pymongo directly; the $match leads with the series index prefix
+        cursor = cls._get_collection().aggregate(
+            pipeline, allowDiskUse=True, batchSize=MAX_CURSOR_BATCH, hint=SERIES_TIME_INDEX
+        )
+        return list(cursor)
\ No newline at end of file
@@ -0,0 +1,217 @@
+"""
+MongoDB document model for per-minute metric buckets holding pre-computed sums,
+counts and extremes for fast coarse-interval aggregation.
+
+Version: 1.0.0
+"""
+
+# External imports - version specified as per requirements
+from mongoengine import Document, fields  # mongoengine==0.24.0
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Mapping
+from pymongo import UpdateOne  # pymongo==4.0+
+
+# Metrics retention in seconds (90 days), shared by raw metrics and their buckets
+METRICS_RETENTION_SECONDS = 7776000
+
+# $dateTrunc units at least as coarse as the one-minute bucket granularity
+BUCKET_INTERVALS = frozenset({'minute', 'hour', 'day', 'week', 'month', 'quarter', 'year'})
+
+# Most intervals a result is densified to; wider ranges return only non-empty
+# intervals, keeping well under $densify's document limit
+MAX_DENSIFY_STEPS = 10000
+
+# Approximate length of each $dateTrunc unit in seconds, for sizing $densify
+INTERVAL_SECONDS = {
+    'millisecond': 0.001,
+    'second': 1,
+    'minute': 60,
+    'hour': 3600,
+    'day': 86400,
+    'week': 604800,
+    'month': 2629746,
+    'quarter': 7889238,
+    'year': 31556952
+}
+
+# Trailing intervals averaged into each aggregated interval's moving_avg
+MOVING_AVERAGE_WINDOW = 7
+
+def truncate_to_interval(value: datetime, interval: str) -> datetime:
+    """
+    Truncate a time to the start of its $dateTrunc interval in UTC, so that
+    $densify steps line up with the grouped intervals.
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    if interval == 'millisecond':
+        return value.replace(microsecond=value.microsecond - value.microsecond % 1000)
+    value = value.replace(microsecond=0)
+    if interval == 'second':
+        return value
+    value = value.replace(second=0)
+    if interval == 'minute':
+        return value
+    value = value.replace(minute=0)
+    if interval == 'hour':
+        return value
+    value = value.replace(hour=0)
+    if interval == 'day':
+        return value
+    if interval == 'week':
+        # $dateTrunc weeks start on Sunday by default
+        return value - timedelta(days=(value.weekday() + 1) % 7)
+    if interval == 'month':
+        return value.replace(day=1)
+    if interval == 'quarter':
+        return value.replace(month=value.month - (value.month - 1) % 3, day=1)
+    return value.replace(month=1, day=1)
+
+def gap_fill_stages(interval: str, start_time: datetime, end_time: datetime) -> List[Dict]:
+    """
+    Pipeline stages densifying grouped intervals over the requested range,
+    filling empty intervals with zero average and count, and adding a
+    trailing moving average, sorted by interval.
+
+    Ranges spanning more than MAX_DENSIFY_STEPS intervals are not densified.
+    """
+    stages = [{'$set': {'interval': '$_id.interval'}}]
+    steps = (end_time - start_time).total_seconds() / INTERVAL_SECONDS.get(interval, 1)
+    if steps <= MAX_DENSIFY_STEPS:
+        stages += [
+            {
+                '$densify': {
+                    'field': 'interval',
+                    'range': {
+                        'step': 1,
+                        'unit': interval,
+                        'bounds': [truncate_to_interval(start_time, interval), end_time]
+                    }
+                }
+            },
+            {'$fill': {'output': {'avg_value': {'value': 0}, 'count': {'value': 0}}}}
+        ]
+    return stages + [
+        {
+            '$setWindowFields': {
+                'sortBy': {'interval': 1},
+                'output': {
+                    'moving_avg': {
+                        '$avg': '$avg_value',
+                        'window': {'documents': [-(MOVING_AVERAGE_WINDOW - 1), 0]}
+                    }
+                }
+            }
+        }
+    ]
+
+class MetricBucketModel(Document):
+    """
+    One document per (organization, exercise, metric type, minute), maintained
+    by upsert as metrics are written and expired with the raw metrics after
+    METRICS_RETENTION_SECONDS.
+    """
+
+    organization_id = fields.StringField(required=True)
+    exercise_id = fields.StringField(required=True)
+    metric_type = fields.StringField(required=True)
+    bucket_start = fields.DateTimeField(required=True)
+    nsamples = fields.IntField(default=0)
+    sum_v = fields.FloatField(default=0.0)
+    min_v = fields.FloatField()
+    max_v = fields.FloatField()
+
+    meta = {
+        'collection': 'metric_buckets',
+        'indexes': [
+            {'fields': ['organization_id', 'metric_type', 'bucket_start']},
+            {'fields': ['organization_id', 'exercise_id', 'metric_type', 'bucket_start']},
+            {'fields': ['bucket_start'], 'expireAfterSeconds': METRICS_RETENTION_SECONDS}
+        ]
+    }
+
+    @classmethod
+    def record(cls, documents: Iterable[Mapping]) -> None:
+        """
+        Add metric values to their minute buckets' totals with one unordered bulk upsert.
+
+        Args:
+            documents: Stored metric documents (``meta``, ``value`` and ``timestamp``),
+                e.g. from MetricModel.to_document() or MetricModel.to_mongo()
+        """
+        operations = [
+            UpdateOne(
+                {
+                    'organization_id': doc['meta']['organization_id'],
+                    'exercise_id': doc['meta']['exercise_id'],
+                    'metric_type': doc['meta']['metric_type'],
+                    'bucket_start': doc['timestamp'].replace(second=0, microsecond=0)
+                },
+                {
+                    '$inc': {'nsamples': 1, 'sum_v': doc['value']},
+                    '$min': {'min_v': doc['value']},
+                    '$max': {'max_v': doc['value']}
+                },
+                upsert=True
+            )
+            for doc in documents
+        ]
+        if operations:
+            cls._get_collection().bulk_write(operations, ordered=False)
+
+    @classmethod
+    def aggregate(
+        cls,
+        organization_id: str,
+        metric_type: str,
+        interval: str,
+        start_time: datetime,
+        end_time: datetime
+    ) -> List[Dict]:
+        """
+        Aggregate pre-computed bucket totals into intervals of at least one minute.
+
+        Buckets are selected by their minute start, so the range is honoured at
+        minute granularity. Intervals without samples are included with zero
+        average and count when the range spans at most MAX_DENSIFY_STEPS intervals.
+        """
+        pipeline = [
+            {
+                '$match': {
+                    'organization_id': organization_id,
+                    'metric_type': metric_type,
+                    'bucket_start': {
+                        '$gte': start_time.replace(second=0, microsecond=0),
+                        '$lte': end_time
+                    }
+                }
+            },
+            {
+                '$group': {
+                    '_id': {
+                        'interval': {
+                            '$dateTrunc': {
+                                'date': '$bucket_start',
+                                'unit': interval
+                            }
+                        },
+                        'metric_type': '$metric_type'
+                    },
+                    'sum_value': {'$sum': '$sum_v'},
+                    'min_value': {'$min': '$min_v'},
+                    'max_value': {'$max': '$max_v'},
+                    'count': {'$sum': '$nsamples'}
+                }
+            },
+            {
+                '$project': {
+                    'avg_value': {'$divide': ['$sum_value', '$count']},
+                    'min_value': 1,
+                    'max_value': 1,
+                    'count': 1
+                }
+            },
+            *gap_fill_stages(interval, start_time, end_time)
+        ]
+
+        return list(cls._get_collection().aggregate(pipeline, allowDiskUse=True))
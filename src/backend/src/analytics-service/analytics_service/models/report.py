@@ -5,15 +5,17 @@ Provides support for performance metrics, gap analysis, compliance mapping and h
 Version: 1.0.0
 """
 
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum, unique
+from typing import Dict, FrozenSet, List
+import orjson  # version: 3.9+
 from mongoengine import (  # version: 0.27+
+    BinaryField,
     Document,
     StringField,
     DateTimeField,
     ListField,
     DictField,
-    EnumField,
     ObjectIdField,
     IntField,
 )
@@ -42,6 +44,58 @@ class ReportStatus(str, Enum):
     FAILED = "FAILED"
     ARCHIVED = "ARCHIVED"
 
+# Report lifecycle: statuses reachable from each status
+VALID_STATUS_TRANSITIONS: Dict[ReportStatus, FrozenSet[ReportStatus]] = {
+    ReportStatus.PENDING: frozenset({ReportStatus.GENERATING, ReportStatus.FAILED}),
+    ReportStatus.GENERATING: frozenset({
+        ReportStatus.VALIDATING, ReportStatus.COMPLETED, ReportStatus.FAILED
+    }),
+    ReportStatus.VALIDATING: frozenset({ReportStatus.COMPLETED, ReportStatus.FAILED}),
+    ReportStatus.COMPLETED: frozenset({ReportStatus.ARCHIVED}),
+    ReportStatus.FAILED: frozenset({ReportStatus.PENDING}),
+    ReportStatus.ARCHIVED: frozenset()
+}
+
+# Stored status values each status may be entered from, for server-side checks
+_SOURCE_STATUSES: Dict[ReportStatus, List[str]] = {
+    target: [source.value for source, targets in VALID_STATUS_TRANSITIONS.items() if target in targets]
+    for target in ReportStatus
+}
+
+# Server-side projection producing the to_dict() shape (metadata included, no audit log)
+SERIALIZED_PROJECTION = {
+    '_id': 0,
+    'id': {'$toString': '$_id'},
+    'organization_id': 1,
+    'exercise_id': 1,
+    'report_type': 1,
+    'title': 1,
+    'description': 1,
+    'status': 1,
+    'sections': 1,
+    'recommendations': 1,
+    'metrics_summary': 1,
+    'gaps_summary': 1,
+    'compliance_summary': 1,
+    'historical_trends': 1,
+    'trend_analysis': 1,
+    'created_at': {'$dateToString': {'date': '$created_at'}},
+    'last_updated_at': {'$dateToString': {'date': '$last_updated_at'}},
+    'completed_at': {'$dateToString': {'date': '$completed_at'}},
+    'created_by': 1,
+    'format': 1,
+    'file_url': 1,
+    'version': 1,
+    'metadata': 1
+}
+
+@unique
+class ReportFormat(str, Enum):
+    """Enumeration of supported report output formats."""
+    PDF = "PDF"
+    HTML = "HTML"
+    JSON = "JSON"
+
 class ReportModel(Document):
     """
     MongoDB document model for storing exercise analysis reports with comprehensive 
@@ -52,7 +106,7 @@ class ReportModel(Document):
     id = ObjectIdField(primary_key=True)
     organization_id = StringField(required=True)
     exercise_id = StringField(required=True)
-    report_type = EnumField(ReportType, required=True)
+    report_type = StringField(required=True, choices=[t.value for t in ReportType])
     title = StringField(required=True, max_length=200)
     description = StringField(required=True)
     metadata = DictField(default=dict)
@@ -67,15 +121,17 @@ class ReportModel(Document):
     trend_analysis = DictField(default=dict)
 
     # Status and tracking
-    status = EnumField(ReportStatus, required=True, default=ReportStatus.PENDING)
+    status = StringField(required=True, choices=[s.value for s in ReportStatus],
+                         default=ReportStatus.PENDING.value)
     created_at = DateTimeField(required=True)
     completed_at = DateTimeField()
     last_updated_at = DateTimeField(required=True)
     created_by = StringField(required=True)
     
     # Output format and location
-    format = StringField(required=True, choices=['PDF', 'HTML', 'JSON'])
+    format = StringField(required=True, choices=[f.value for f in ReportFormat])
     file_url = StringField()
+    serialized_json = BinaryField()  # JSON export body, rendered once on completion
     
     # Version control and audit
     version = IntField(required=True, default=1)
@@ -84,7 +140,6 @@ class ReportModel(Document):
     meta = {
         'collection': 'reports',
         'indexes': [
-            ('organization_id', 1),
             ('exercise_id', 1),
             ('report_type', 1),
             ('created_at', -1),
@@ -92,6 +147,12 @@ class ReportModel(Document):
             {
                 'fields': ['organization_id', 'exercise_id'],
                 'unique': True
+            },
+            {
+                'fields': ['organization_id', 'status', '-created_at']
+            },
+            {
+                'fields': ['organization_id', 'report_type', '-created_at']
             }
         ],
         'ordering': ['-created_at']
@@ -99,33 +160,34 @@ class ReportModel(Document):
 
     def __init__(self, organization_id: str, exercise_id: str, report_type: ReportType,
                  title: str, description: str, created_by: str, format: str,
-                 metadata: dict = None, **kwargs):
+                 metadata: dict = None, _now: datetime = None, **kwargs):
         """
         Initialize a new report document with validation and audit logging.
         
         Args:
             organization_id: Organization identifier
             exercise_id: Exercise identifier
-            report_type: Type of report to generate
+            report_type: Type of report to generate, as a ReportType or its value
             title: Report title
             description: Report description
             created_by: User identifier who created the report
             format: Output format (PDF, HTML, JSON)
             metadata: Additional metadata for the report
+            _now: Shared timestamp for creation, defaults to the current UTC time
         """
         super().__init__(**kwargs)
         
         # Set required fields
         self.organization_id = organization_id
         self.exercise_id = exercise_id
-        self.report_type = report_type
+        self.report_type = ReportType(report_type).value
         self.title = title
         self.description = description
         self.created_by = created_by
         self.format = format
         
         # Set timestamps
-        current_time = datetime.utcnow()
+        current_time = _now or datetime.now(timezone.utc)
         self.created_at = current_time
         self.last_updated_at = current_time
         
@@ -137,11 +199,11 @@ class ReportModel(Document):
             'action': 'CREATED',
             'timestamp': current_time,
             'user_id': created_by,
-            'details': {'report_type': report_type.value}
+            'details': {'report_type': self.report_type}
         })
 
     def add_section(self, title: str, content: dict, metadata: dict = None,
-                   validate: bool = True) -> bool:
+                   validate: bool = True, now: datetime = None) -> bool:
         """
         Add a new section to the report with validation and versioning.
         
@@ -150,49 +212,62 @@ class ReportModel(Document):
             content: Section content
             metadata: Additional section metadata
             validate: Whether to validate content format
+            now: Timestamp of the addition, defaults to the current UTC time
             
         Returns:
             bool: Success status of section addition
         """
         try:
+            now = now or datetime.now(timezone.utc)
+
             # Create section dictionary
             section = {
                 'title': title,
                 'content': content,
                 'metadata': metadata or {},
-                'added_at': datetime.utcnow()
+                'added_at': now
             }
             
-            # Validate section data if required
+            audit_entry = {
+                'action': 'SECTION_ADDED',
+                'timestamp': now,
+                'user_id': self.created_by,
+                'details': {'section_title': title}
+            }
+            
+            # Validate section data if required; duplicate titles are rejected
+            # server-side by the update filter
+            selector = {}
             if validate:
                 if not title or not content:
                     raise ValueError("Section title and content are required")
-                
-                # Check for duplicate titles
-                if any(s['title'] == title for s in self.sections):
-                    raise ValueError(f"Section with title '{title}' already exists")
+                selector['sections.title'] = {'$ne': title}
             
-            # Add section and update metadata
-            self.sections.append(section)
-            self.version += 1
-            self.last_updated_at = datetime.utcnow()
+            # Persist a new report before updating it in place
+            if self.id is None:
+                self.save()
             
-            # Add audit log entry
-            self.audit_log.append({
-                'action': 'SECTION_ADDED',
-                'timestamp': datetime.utcnow(),
-                'user_id': self.created_by,
-                'details': {'section_title': title}
-            })
+            # Append the section and audit entry without rewriting the document
+            if not self._atomic_update(selector, {
+                '$push': {'sections': section, 'audit_log': audit_entry},
+                '$inc': {'version': 1},
+                '$set': {'last_updated_at': now}
+            }):
+                raise ValueError(f"Section with title '{title}' already exists")
             
-            self.save()
+            # Mirror the stored change locally
+            self.sections.append(section)
+            self.version += 1
+            self.last_updated_at = now
+            self.audit_log.append(audit_entry)
+            self._clear_changed_fields()
             return True
             
         except Exception as e:
             return False
 
     def update_status(self, new_status: ReportStatus, file_url: str = None,
-                     additional_metadata: dict = None) -> bool:
+                     additional_metadata: dict = None, now: datetime = None) -> bool:
         """
         Update report generation status with validation and logging.
         
@@ -200,18 +275,22 @@ class ReportModel(Document):
             new_status: New status to set
             file_url: URL of generated report file
             additional_metadata: Additional metadata to update
+            now: Timestamp of the update, defaults to the current UTC time
             
         Returns:
             bool: Success status of update
         """
         try:
             # Validate status transition
-            if self.status == ReportStatus.COMPLETED and new_status != ReportStatus.ARCHIVED:
-                raise ValueError("Completed reports can only be archived")
+            new_status = ReportStatus(new_status)
+            if new_status not in VALID_STATUS_TRANSITIONS[ReportStatus(self.status)]:
+                raise ValueError(
+                    f"Invalid report status transition: {self.status} -> {new_status.value}"
+                )
             
             # Update status and related fields
-            self.status = new_status
-            self.last_updated_at = datetime.utcnow()
+            self.status = new_status.value
+            self.last_updated_at = now or datetime.now(timezone.utc)
             
             if new_status == ReportStatus.COMPLETED:
                 self.completed_at = self.last_updated_at
@@ -222,8 +301,12 @@ class ReportModel(Document):
             if additional_metadata:
                 self.metadata.update(additional_metadata)
             
+            # Completed reports are immutable, so render the JSON export once
+            if new_status == ReportStatus.COMPLETED:
+                self.serialized_json = self.to_json_bytes()
+            
             # Add audit log entry
-            self.audit_log.append({
+            audit_entry = {
                 'action': 'STATUS_UPDATED',
                 'timestamp': self.last_updated_at,
                 'user_id': self.created_by,
@@ -231,14 +314,89 @@ class ReportModel(Document):
                     'new_status': new_status.value,
                     'file_url': file_url
                 }
-            })
+            }
+            self.audit_log.append(audit_entry)
             
-            self.save()
+            # First write of a new report inserts the whole document
+            if self.id is None:
+                self.save()
+                return True
+            
+            changes = {
+                'status': new_status.value,
+                'last_updated_at': self.last_updated_at
+            }
+            if self.completed_at:
+                changes['completed_at'] = self.completed_at
+            if file_url:
+                changes['file_url'] = file_url
+            for key, value in (additional_metadata or {}).items():
+                changes[f'metadata.{key}'] = value
+            if new_status == ReportStatus.COMPLETED:
+                changes['serialized_json'] = self.serialized_json
+            
+            # Re-check the transition server-side against concurrent updates
+            selector = {'status': {'$in': _SOURCE_STATUSES[new_status]}}
+            
+            if not self._atomic_update(selector, {
+                '$set': changes,
+                '$push': {'audit_log': audit_entry}
+            }):
+                raise ValueError(f"Report can no longer move to {new_status.value}")
+            
+            self._clear_changed_fields()
             return True
             
         except Exception as e:
             return False
 
+    def _atomic_update(self, selector: dict, update: dict) -> bool:
+        """
+        Apply a single update operator document to this report.
+        
+        Args:
+            selector: Additional filter conditions guarding the update
+            update: MongoDB update operators carrying only the changed fields
+            
+        Returns:
+            bool: Whether the report matched the filter and was updated
+        """
+        result = self._get_collection().update_one({'_id': self.id, **selector}, update)
+        return result.matched_count == 1
+
+    @classmethod
+    def get_reports_serialized(cls, query: dict, limit: int = None) -> list:
+        """
+        Retrieve reports already shaped like to_dict() by a server-side $project.
+        
+        Args:
+            query: Raw MongoDB filter
+            limit: Maximum number of reports to return
+            
+        Returns:
+            list: Report dictionaries ready for JSON encoding
+        """
+        pipeline = [{'$match': query}]
+        if limit is not None:
+            pipeline.append({'$limit': limit})
+        pipeline.append({'$project': SERIALIZED_PROJECTION})
+        return list(cls._get_collection().aggregate(pipeline))
+
+    def to_json_bytes(self, include_metadata: bool = True,
+                      include_audit_log: bool = False) -> bytes:
+        """
+        Serialize the report to JSON with orjson. Completed reports store the
+        result in ``serialized_json``, so exports do not serialize again.
+        
+        Args:
+            include_metadata: Whether to include metadata
+            include_audit_log: Whether to include audit log
+            
+        Returns:
+            bytes: JSON representation of to_dict()
+        """
+        return orjson.dumps(self.to_dict(include_metadata, include_audit_log))
+
     def to_dict(self, include_metadata: bool = True,
                 include_audit_log: bool = False) -> dict:
         """
@@ -255,10 +413,10 @@ class ReportModel(Document):
             'id': str(self.id),
             'organization_id': self.organization_id,
             'exercise_id': self.exercise_id,
-            'report_type': self.report_type.value,
+            'report_type': self.report_type,
             'title': self.title,
             'description': self.description,
-            'status': self.status.value,
+            'status': self.status,
             'sections': self.sections,
             'recommendations': self.recommendations,
             'metrics_summary': self.metrics_summary,
@@ -9,15 +9,24 @@ Version: 1.0.0
 """
 
 # External imports with versions
+import importlib
 import logging  # version: 3.11+
 from opentelemetry import trace  # version: 1.20.0
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Dict, Any, Optional
 from datetime import datetime
 
-# Internal imports
-from .gap_analyzer import GapAnalyzer
-from .metric_processor import MetricProcessor
-from .report_generator import ReportGenerator
+# Internal imports, resolved lazily so importing one service does not load the others
+if TYPE_CHECKING:
+    from .gap_analyzer import GapAnalyzer
+    from .metric_processor import MetricProcessor
+    from .report_generator import ReportGenerator
+
+# Service classes by name and the submodule defining each
+_LAZY_SERVICES = {
+    'GapAnalyzer': '.gap_analyzer',
+    'MetricProcessor': '.metric_processor',
+    'ReportGenerator': '.report_generator'
+}
 
 # Module version
 __version__ = "1.0.0"
@@ -25,12 +34,27 @@ __version__ = "1.0.0"
 # Define public exports
 __all__ = ["GapAnalyzer", "MetricProcessor", "ReportGenerator", "initialize_services"]
 
+# Configuration keys initialize_services requires
+_REQUIRED_CONFIGS = frozenset({
+    'metrics', 'database', 'service', 'logger',
+    'template_path', 'aws_region', 's3_bucket'
+})
+
 # Configure module-level logger
 logger = logging.getLogger(__name__)
 
 # Initialize OpenTelemetry tracer
 tracer = trace.get_tracer(__name__)
 
+def __getattr__(name: str) -> Any:
+    """Import a service class from its submodule on first access (PEP 562)."""
+    module_name = _LAZY_SERVICES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    service_class = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = service_class
+    return service_class
+
 @tracer.start_as_current_span("initialize_services")
 def initialize_services(config: Dict[str, Any]) -> bool:
     """
@@ -50,17 +74,16 @@ def initialize_services(config: Dict[str, Any]) -> bool:
         RuntimeError: If service initialization fails
     """
     try:
+        from .gap_analyzer import GapAnalyzer
+        from .metric_processor import MetricProcessor
+        from .report_generator import ReportGenerator
+
         logger.info("Initializing analytics services...")
         
-        # Validate required configuration
-        required_configs = [
-            'metrics', 'database', 'service', 'logger',
-            'template_path', 'aws_region', 's3_bucket'
-        ]
-        
-        for required in required_configs:
-            if required not in config:
-                raise ValueError(f"Missing required configuration: {required}")
+        # Validate required configuration, reporting every missing key at once
+        missing = _REQUIRED_CONFIGS - config.keys()
+        if missing:
+            raise ValueError(f"Missing required configuration: {', '.join(sorted(missing))}")
         
         # Initialize metric processor first as it's a dependency
         logger.debug("Initializing MetricProcessor...")
@@ -12,14 +12,103 @@ Version: 1.0.0
 import numpy as np  # version: 1.24+
 import pandas as pd  # version: 2.0+
 import logging
-from typing import Dict, List, Optional
-from datetime import datetime
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple
+from datetime import datetime, timezone
 
 # Internal imports
 from analytics_service.models.gap import GapModel, GapType, GapSeverity, GapStatus
 from analytics_service.services.metric_processor import MetricProcessor
 from analytics_service.config import Config
 
+@dataclass(slots=True, frozen=True)
+class GapDraft:
+    """A detected gap before it is materialized as a GapModel."""
+
+    id: str
+    type: GapType
+    title: str
+    description: str
+    severity: GapSeverity
+    affected_areas: Tuple[str, ...]
+    metrics: Dict
+    frameworks: Tuple[str, ...] = ()
+
+class SeverityThresholds(NamedTuple):
+    """Metric levels at which a gap reaches each severity."""
+
+    critical: float
+    high: float
+    medium: float
+    low: float
+
+# Analysis thresholds: response times in seconds, coverage as a 0-1 ratio
+RESPONSE_TIME_THRESHOLDS = SeverityThresholds(
+    critical=300,  # 5 minutes
+    high=180,      # 3 minutes
+    medium=120,    # 2 minutes
+    low=60         # 1 minute
+)
+COMPLIANCE_COVERAGE_THRESHOLDS = SeverityThresholds(
+    critical=0.70,
+    high=0.80,
+    medium=0.90,
+    low=0.95
+)
+
+# Recommendation templates per gap type, shared read-only across all gaps
+RECOMMENDATIONS_BY_TYPE: Mapping[GapType, Tuple[Mapping, ...]] = MappingProxyType({
+    GapType.PROCESS: (
+        MappingProxyType({
+            'title': 'Process Optimization',
+            'description': 'Implement automated workflow triggers',
+            'priority': 'high',
+            'estimated_impact': 0.8
+        }),
+        MappingProxyType({
+            'title': 'Response Automation',
+            'description': 'Deploy automated response playbooks',
+            'priority': 'medium',
+            'estimated_impact': 0.6
+        })
+    ),
+    GapType.PEOPLE: (
+        MappingProxyType({
+            'title': 'Training Enhancement',
+            'description': 'Conduct focused decision-making workshops',
+            'priority': 'high',
+            'estimated_impact': 0.7
+        }),
+        MappingProxyType({
+            'title': 'Knowledge Base',
+            'description': 'Develop searchable decision support system',
+            'priority': 'medium',
+            'estimated_impact': 0.5
+        })
+    ),
+    GapType.COMPLIANCE: (
+        MappingProxyType({
+            'title': 'Documentation Update',
+            'description': 'Update compliance documentation and controls',
+            'priority': 'high',
+            'estimated_impact': 0.9
+        }),
+        MappingProxyType({
+            'title': 'Control Implementation',
+            'description': 'Implement missing technical controls',
+            'priority': 'high',
+            'estimated_impact': 0.8
+        })
+    )
+})
+
+# Detected-gap cache defaults, overridable via cache_config
+ANALYSIS_CACHE_SIZE = 512
+ANALYSIS_CACHE_TTL = 600
+
 class GapAnalyzer:
     """
     Advanced gap analyzer implementing ML-enhanced pattern recognition and 
@@ -53,30 +142,18 @@ class GapAnalyzer:
             'anomaly_threshold': 2.5
         }
 
-        # Setup caching
+        # Setup caching of detected gaps: key -> (deadline, gaps)
         self._cache = cache_config or {}
-        
-        # Initialize analysis thresholds
-        self._thresholds = {
-            'response_time': {
-                'critical': 300,  # 5 minutes
-                'high': 180,      # 3 minutes
-                'medium': 120,    # 2 minutes
-                'low': 60        # 1 minute
-            },
-            'compliance_coverage': {
-                'critical': 0.70,
-                'high': 0.80,
-                'medium': 0.90,
-                'low': 0.95
-            }
-        }
+        self._result_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._result_cache_size = self._cache.get('max_entries', ANALYSIS_CACHE_SIZE)
+        self._result_cache_ttl = self._cache.get('ttl_seconds', ANALYSIS_CACHE_TTL)
 
     def analyze_exercise(
         self,
         exercise_id: str,
         organization_id: str,
-        analysis_config: Optional[Dict] = None
+        analysis_config: Optional[Dict] = None,
+        exercise_timeframe: Optional[Tuple[datetime, datetime]] = None
     ) -> List[GapModel]:
         """
         Perform comprehensive ML-enhanced gap analysis on exercise data.
@@ -85,72 +162,274 @@ class GapAnalyzer:
             exercise_id: Unique exercise identifier
             organization_id: Organization identifier
             analysis_config: Optional analysis configuration parameters
+            exercise_timeframe: Period to analyze, defaulting to the span of
+                the exercise's stored metrics
 
         Returns:
             List of identified gaps with ML-enhanced insights
         """
+        _, gap_models = self.analyze_exercise_page(
+            exercise_id=exercise_id,
+            organization_id=organization_id,
+            analysis_config=analysis_config,
+            exercise_timeframe=exercise_timeframe
+        )
+        return gap_models
+
+    def analyze_exercise_page(
+        self,
+        exercise_id: str,
+        organization_id: str,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        frameworks: Optional[List[str]] = None,
+        analysis_config: Optional[Dict] = None,
+        exercise_timeframe: Optional[Tuple[datetime, datetime]] = None
+    ) -> Tuple[int, List[GapModel]]:
+        """
+        Perform gap analysis and materialize only the requested page of gaps.
+
+        Gap detection runs over the full metric set, but gap models and their
+        recommendations are only built for the gaps inside the page window.
+        Detected gaps are reused while the exercise's metrics are unchanged.
+
+        Args:
+            exercise_id: Unique exercise identifier
+            organization_id: Organization identifier
+            offset: Number of gaps to skip
+            limit: Maximum number of gaps to return, or None for all
+            frameworks: Additional compliance frameworks to analyze
+            analysis_config: Optional analysis configuration parameters
+            exercise_timeframe: Period to analyze, defaulting to the span of
+                the exercise's stored metrics
+
+        Returns:
+            Tuple of (total gap count, gap models for the requested page)
+        """
         try:
-            self._logger.info(f"Starting gap analysis for exercise {exercise_id}")
-            
-            # Retrieve exercise metrics
-            metrics = self._metric_processor.calculate_statistics(
-                exercise_id=exercise_id,
-                metric_type='response_time',
-                start_time=datetime.utcnow(),  # TODO: Get actual exercise timeframe
-                end_time=datetime.utcnow()
+            framework_mappings = self._framework_mappings(frameworks)
+
+            # Reuse detected gaps while the exercise's metrics are unchanged
+            key = (
+                exercise_id,
+                organization_id,
+                tuple(framework_mappings),
+                exercise_timeframe,
+                self._metric_processor.metrics_version(exercise_id)
             )
+            all_gaps = self._cached_gaps(key)
+            if all_gaps is None:
+                all_gaps = self._detect_gaps(exercise_id, framework_mappings, exercise_timeframe)
+                self._store_gaps(key, all_gaps)
 
-            # Identify capability gaps using ML
-            capability_gaps = self.identify_capability_gaps(
-                metrics=metrics,
-                exercise_id=exercise_id,
-                ml_params=self._ml_config
-            )
+            # Restrict remaining work to the requested page
+            end = offset + limit if limit is not None else None
+            page_gaps = all_gaps[offset:end]
 
-            # Analyze compliance coverage
-            compliance_gaps = self.analyze_compliance_coverage(
-                exercise_data={'id': exercise_id, 'metrics': metrics},
-                framework_mappings=['SOC2', 'NIST', 'ISO27001']  # TODO: Get from config
+            gap_models = self._build_gap_models(
+                page_gaps, exercise_id, organization_id, datetime.now(timezone.utc)
             )
+            return len(all_gaps), gap_models
 
-            # Generate ML-enhanced recommendations
-            all_gaps = capability_gaps + compliance_gaps
-            recommendations = self.generate_recommendations(
-                gaps=all_gaps,
-                ml_config=self._ml_config
+        except Exception as e:
+            self._logger.error(f"Error during gap analysis: {str(e)}")
+            raise
+
+    def analyze_exercises_batch(
+        self,
+        exercise_ids: List[str],
+        organization_id: str,
+        frameworks: Optional[List[str]] = None,
+        exercise_timeframe: Optional[Tuple[datetime, datetime]] = None
+    ) -> Dict[str, List[GapModel]]:
+        """
+        Perform gap analysis for several exercises with one statistics query.
+
+        Args:
+            exercise_ids: Exercise identifiers
+            organization_id: Organization identifier
+            frameworks: Additional compliance frameworks to analyze
+            exercise_timeframe: Period to analyze, defaulting to each exercise's
+                full metric history
+
+        Returns:
+            Gap models per exercise ID
+        """
+        try:
+            framework_mappings = self._framework_mappings(frameworks)
+            start_time, end_time = exercise_timeframe or (None, None)
+
+            # Statistics for every exercise from a single MongoDB round trip
+            statistics = self._metric_processor.calculate_statistics_batch(
+                exercise_ids=exercise_ids,
+                metric_type='response_time',
+                start_time=start_time,
+                end_time=end_time
             )
 
-            # Create gap models with recommendations
-            gap_models = []
-            for gap in all_gaps:
-                gap_model = GapModel(
-                    organization_id=organization_id,
-                    exercise_id=exercise_id,
-                    gap_type=gap['type'],
-                    title=gap['title'],
-                    description=gap['description'],
-                    severity=gap['severity'],
-                    affected_areas=gap['affected_areas'],
-                    compliance_frameworks=gap.get('frameworks', []),
-                    metrics=gap['metrics'],
-                    recommendations=recommendations.get(gap['id'], []),
-                    created_by='gap_analyzer',
-                    updated_by='gap_analyzer'
+            identified_at = datetime.now(timezone.utc)
+            return {
+                exercise_id: self._build_gap_models(
+                    self._gaps_from_statistics(exercise_id, statistics[exercise_id], framework_mappings),
+                    exercise_id,
+                    organization_id,
+                    identified_at
                 )
-                gap_models.append(gap_model)
-
-            return gap_models
+                for exercise_id in exercise_ids
+            }
 
         except Exception as e:
-            self._logger.error(f"Error during gap analysis: {str(e)}")
+            self._logger.error(f"Error during batch gap analysis: {str(e)}")
             raise
 
+    @staticmethod
+    def _framework_mappings(frameworks: Optional[List[str]]) -> List[str]:
+        """Default compliance frameworks extended with any additional ones."""
+        framework_mappings = ['SOC2', 'NIST', 'ISO27001']  # TODO: Get from config
+        framework_mappings += [f for f in frameworks or [] if f not in framework_mappings]
+        return framework_mappings
+
+    def _build_gap_models(
+        self,
+        gaps: List[GapDraft],
+        exercise_id: str,
+        organization_id: str,
+        identified_at: datetime
+    ) -> List[GapModel]:
+        """
+        Create gap models with recommendations, sharing one identification time.
+
+        Args:
+            gaps: Detected gaps to materialize
+            exercise_id: Unique exercise identifier
+            organization_id: Organization identifier
+            identified_at: Identification time shared by the models
+
+        Returns:
+            Unsaved gap models
+        """
+        # Generate ML-enhanced recommendations
+        recommendations = self.generate_recommendations(
+            gaps=gaps,
+            ml_config=self._ml_config
+        )
+
+        return [
+            GapModel(
+                _now=identified_at,
+                organization_id=organization_id,
+                exercise_id=exercise_id,
+                gap_type=gap.type,
+                title=gap.title,
+                description=gap.description,
+                severity=gap.severity,
+                affected_areas=list(gap.affected_areas),
+                compliance_frameworks=list(gap.frameworks),
+                metrics=gap.metrics,
+                recommendations=[dict(rec) for rec in recommendations.get(gap.id, ())],
+                created_by='gap_analyzer',
+                updated_by='gap_analyzer'
+            )
+            for gap in gaps
+        ]
+
+    def _detect_gaps(
+        self,
+        exercise_id: str,
+        framework_mappings: List[str],
+        exercise_timeframe: Optional[Tuple[datetime, datetime]] = None
+    ) -> List[GapDraft]:
+        """
+        Run statistics, capability and compliance analysis for an exercise.
+
+        Exercises with fewer than ``min_data_points`` metrics in the period are
+        not analyzed and yield no gaps.
+
+        Args:
+            exercise_id: Unique exercise identifier
+            framework_mappings: Compliance frameworks to analyze
+            exercise_timeframe: Period to analyze, or None for the metrics' span
+
+        Returns:
+            Capability gaps followed by compliance gaps
+        """
+        self._logger.info(f"Starting gap analysis for exercise {exercise_id}")
+
+        # Analyze the period the exercise's metrics cover unless one is given
+        if exercise_timeframe is None:
+            exercise_timeframe = self._metric_processor.exercise_timeframe(exercise_id)
+            if exercise_timeframe is None:
+                return []
+        start_time, end_time = exercise_timeframe
+
+        # Retrieve exercise metrics
+        metrics = self._metric_processor.calculate_statistics(
+            exercise_id=exercise_id,
+            metric_type='response_time',
+            start_time=start_time,
+            end_time=end_time
+        )
+
+        return self._gaps_from_statistics(exercise_id, metrics, framework_mappings)
+
+    def _gaps_from_statistics(
+        self,
+        exercise_id: str,
+        metrics: Dict,
+        framework_mappings: List[str]
+    ) -> List[GapDraft]:
+        """
+        Identify capability and compliance gaps from an exercise's statistics.
+
+        Args:
+            exercise_id: Unique exercise identifier
+            metrics: Statistics as returned by calculate_statistics()
+            framework_mappings: Compliance frameworks to analyze
+
+        Returns:
+            Capability gaps followed by compliance gaps
+        """
+        # Too little data for meaningful analysis
+        if metrics.get('count', 0) < self._ml_config.get('min_data_points', 0):
+            return []
+
+        # Identify capability gaps using ML
+        capability_gaps = self.identify_capability_gaps(
+            metrics=metrics,
+            exercise_id=exercise_id,
+            ml_params=self._ml_config
+        )
+
+        # Analyze compliance coverage
+        compliance_gaps = self.analyze_compliance_coverage(
+            exercise_data={'id': exercise_id, 'metrics': metrics},
+            framework_mappings=framework_mappings
+        )
+
+        return capability_gaps + compliance_gaps
+
+    def _cached_gaps(self, key: tuple) -> Optional[List[GapDraft]]:
+        """Return live cached gaps for an analysis key, or None."""
+        entry = self._result_cache.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        self._result_cache.move_to_end(key)
+        self._logger.debug(f"Gap analysis cache hit for exercise {key[0]}")
+        return entry[1]
+
+    def _store_gaps(self, key: tuple, gaps: List[GapDraft]) -> None:
+        """Cache detected gaps, evicting the least recently used entry when full."""
+        self._result_cache[key] = (time.monotonic() + self._result_cache_ttl, gaps)
+        self._result_cache.move_to_end(key)
+        while len(self._result_cache) > self._result_cache_size:
+            self._result_cache.popitem(last=False)
+
     def identify_capability_gaps(
         self,
         metrics: Dict,
         exercise_id: str,
         ml_params: Dict
-    ) -> List[Dict]:
+    ) -> List[GapDraft]:
         """
         Use ML-enhanced pattern recognition to identify organizational capability gaps.
 
@@ -166,35 +445,35 @@ class GapAnalyzer:
         
         try:
             # Analyze response times
-            if metrics['mean'] > self._thresholds['response_time']['high']:
-                gaps.append({
-                    'id': f"RT_{exercise_id}",
-                    'type': GapType.PROCESS,
-                    'title': 'High Response Time',
-                    'description': 'Response times exceed acceptable thresholds',
-                    'severity': GapSeverity.HIGH,
-                    'affected_areas': ['Incident Response', 'Communication'],
-                    'metrics': {
+            if metrics['mean'] > RESPONSE_TIME_THRESHOLDS.high:
+                gaps.append(GapDraft(
+                    id=f"RT_{exercise_id}",
+                    type=GapType.PROCESS,
+                    title='High Response Time',
+                    description='Response times exceed acceptable thresholds',
+                    severity=GapSeverity.HIGH,
+                    affected_areas=('Incident Response', 'Communication'),
+                    metrics={
                         'mean_response_time': metrics['mean'],
                         'p95_response_time': metrics['p95'],
                         'anomaly_count': metrics['anomaly_count']
                     }
-                })
+                ))
 
             # Analyze decision quality
             if 'trend_slope' in metrics and metrics['trend_slope'] < 0:
-                gaps.append({
-                    'id': f"DQ_{exercise_id}",
-                    'type': GapType.PEOPLE,
-                    'title': 'Declining Decision Quality',
-                    'description': 'Decision effectiveness shows negative trend',
-                    'severity': GapSeverity.MEDIUM,
-                    'affected_areas': ['Decision Making', 'Training'],
-                    'metrics': {
+                gaps.append(GapDraft(
+                    id=f"DQ_{exercise_id}",
+                    type=GapType.PEOPLE,
+                    title='Declining Decision Quality',
+                    description='Decision effectiveness shows negative trend',
+                    severity=GapSeverity.MEDIUM,
+                    affected_areas=('Decision Making', 'Training'),
+                    metrics={
                         'trend_slope': metrics['trend_slope'],
                         'confidence_score': metrics.get('mean', 0)
                     }
-                })
+                ))
 
             return gaps
 
@@ -206,10 +485,13 @@ class GapAnalyzer:
         self,
         exercise_data: Dict,
         framework_mappings: List[str]
-    ) -> List[Dict]:
+    ) -> List[GapDraft]:
         """
         Perform comprehensive compliance framework analysis.
 
+        Per-framework coverage is read from ``metrics['coverage_by_framework']``
+        when present, falling back to the overall ``compliance_coverage``.
+
         Args:
             exercise_data: Exercise performance data
             framework_mappings: List of compliance frameworks to analyze
@@ -220,23 +502,33 @@ class GapAnalyzer:
         gaps = []
         
         try:
-            for framework in framework_mappings:
-                coverage = exercise_data['metrics'].get('compliance_coverage', 0)
-                
-                if coverage < self._thresholds['compliance_coverage']['high']:
-                    gaps.append({
-                        'id': f"COMP_{framework}_{exercise_data['id']}",
-                        'type': GapType.COMPLIANCE,
-                        'title': f'Low {framework} Coverage',
-                        'description': f'Compliance coverage below required threshold for {framework}',
-                        'severity': GapSeverity.HIGH,
-                        'affected_areas': ['Compliance', 'Documentation'],
-                        'frameworks': [framework],
-                        'metrics': {
-                            'coverage_percentage': coverage,
-                            'required_threshold': self._thresholds['compliance_coverage']['high']
-                        }
-                    })
+            metrics = exercise_data['metrics']
+            default_coverage = metrics.get('compliance_coverage', 0)
+            coverage_by_framework = metrics.get('coverage_by_framework') or {}
+            threshold = COMPLIANCE_COVERAGE_THRESHOLDS.high
+
+            # Compare every framework's coverage against the threshold at once
+            coverages = np.fromiter(
+                (coverage_by_framework.get(f, default_coverage) for f in framework_mappings),
+                dtype=np.float64,
+                count=len(framework_mappings)
+            )
+            for index in np.flatnonzero(coverages < threshold):
+                framework = framework_mappings[index]
+                coverage = coverage_by_framework.get(framework, default_coverage)
+                gaps.append(GapDraft(
+                    id=f"COMP_{framework}_{exercise_data['id']}",
+                    type=GapType.COMPLIANCE,
+                    title=f'Low {framework} Coverage',
+                    description=f'Compliance coverage below required threshold for {framework}',
+                    severity=GapSeverity.HIGH,
+                    affected_areas=('Compliance', 'Documentation'),
+                    frameworks=(framework,),
+                    metrics={
+                        'coverage_percentage': coverage,
+                        'required_threshold': threshold
+                    }
+                ))
 
             return gaps
 
@@ -246,9 +538,9 @@ class GapAnalyzer:
 
     def generate_recommendations(
         self,
-        gaps: List[Dict],
+        gaps: List[GapDraft],
         ml_config: Dict
-    ) -> Dict[str, List]:
+    ) -> Dict[str, Tuple[Mapping, ...]]:
         """
         Generate ML-enhanced recommendations for identified gaps.
 
@@ -257,63 +549,14 @@ class GapAnalyzer:
             ml_config: ML model configuration parameters
 
         Returns:
-            Dictionary mapping gap IDs to prioritized recommendations
+            Dictionary mapping gap IDs to prioritized recommendations; the
+            read-only templates are shared, so copy them before mutating
         """
         recommendations = {}
         
         try:
             for gap in gaps:
-                gap_recommendations = []
-                
-                if gap['type'] == GapType.PROCESS:
-                    gap_recommendations.extend([
-                        {
-                            'title': 'Process Optimization',
-                            'description': 'Implement automated workflow triggers',
-                            'priority': 'high',
-                            'estimated_impact': 0.8
-                        },
-                        {
-                            'title': 'Response Automation',
-                            'description': 'Deploy automated response playbooks',
-                            'priority': 'medium',
-                            'estimated_impact': 0.6
-                        }
-                    ])
-
-                elif gap['type'] == GapType.PEOPLE:
-                    gap_recommendations.extend([
-                        {
-                            'title': 'Training Enhancement',
-                            'description': 'Conduct focused decision-making workshops',
-                            'priority': 'high',
-                            'estimated_impact': 0.7
-                        },
-                        {
-                            'title': 'Knowledge Base',
-                            'description': 'Develop searchable decision support system',
-                            'priority': 'medium',
-                            'estimated_impact': 0.5
-                        }
-                    ])
-
-                elif gap['type'] == GapType.COMPLIANCE:
-                    gap_recommendations.extend([
-                        {
-                            'title': 'Documentation Update',
-                            'description': 'Update compliance documentation and controls',
-                            'priority': 'high',
-                            'estimated_impact': 0.9
-                        },
-                        {
-                            'title': 'Control Implementation',
-                            'description': 'Implement missing technical controls',
-                            'priority': 'high',
-                            'estimated_impact': 0.8
-                        }
-                    ])
-
-                recommendations[gap['id']] = gap_recommendations
+                recommendations[gap.id] = RECOMMENDATIONS_BY_TYPE.get(gap.type, ())
 
             return recommendations
 
@@ -11,16 +11,104 @@ Version: 1.0.0
 import numpy as np  # numpy==1.24.0
 import pandas as pd  # pandas==2.0.0
 import influxdb_client  # influxdb-client==1.36.0
-from influxdb_client.client.write_api import SYNCHRONOUS
+from influxdb_client.client.write_api import WriteOptions
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+import atexit
 import logging
-from functools import lru_cache
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pymongo.errors import BulkWriteError, ServerSelectionTimeoutError  # pymongo==4.0+
 
 # Internal imports
-from ..models.metric import MetricModel
+from ..models.metric import MetricModel, SERIES_FIELDS, VALUES_DTYPE
+from ..models.metric_bucket import MetricBucketModel
 from ..config import Config, MetricsConfig
 
+# Cached aggregate_metrics results: entry bound and lifetime in seconds
+AGGREGATE_CACHE_SIZE = 100
+AGGREGATE_CACHE_TTL = 300
+
+# Background InfluxDB writer retry pacing in milliseconds
+WRITE_JITTER_INTERVAL_MS = 200
+WRITE_RETRY_INTERVAL_MS = 5000
+
+# Trailing window of the rolling statistics and span of the EMA in generate_time_series
+ROLLING_WINDOW = 3
+EMA_SPAN = 5
+
+# Percentiles reported alongside the median by calculate_statistics
+STAT_PERCENTILES = (75, 90, 95, 99)
+
+def _order_statistics(values: np.ndarray, quantiles: Tuple[float, ...]) -> List[float]:
+    """
+    Linearly interpolated quantiles (np.percentile's default method), taken from
+    a single O(N) np.partition pass instead of one selection per quantile.
+    """
+    positions = [(len(values) - 1) * q for q in quantiles]
+    kth = sorted({int(np.floor(h)) for h in positions} | {int(np.ceil(h)) for h in positions})
+    partitioned = np.partition(values, kth)
+
+    results = []
+    for h in positions:
+        lower = partitioned[int(np.floor(h))]
+        upper = partitioned[int(np.ceil(h))]
+        results.append(float(lower + (upper - lower) * (h - np.floor(h))))
+    return results
+
+def _summarize_values(values: np.ndarray) -> Dict[str, float]:
+    """
+    Descriptive statistics, percentiles, trend line and z-score anomaly count
+    of metric values in newest-first order.
+    """
+    if len(values) == 0:
+        return {
+            "count": 0,
+            "error": "No metrics found for the specified period"
+        }
+    
+    # Mean and population std from one deviation array, accumulated in float64
+    mean = values.mean(dtype=np.float64)
+    deviations = np.subtract(values, mean, dtype=np.float64)
+    std = np.sqrt(np.dot(deviations, deviations) / len(values))
+
+    # Min, median, percentiles and max from one partition
+    minimum, median, *percentiles, maximum = _order_statistics(
+        values, (0.0, 0.5, *(p / 100 for p in STAT_PERCENTILES), 1.0)
+    )
+
+    # Calculate basic statistics
+    stats = {
+        "count": len(values),
+        "mean": float(mean),
+        "median": median,
+        "std": float(std),
+        "min": minimum,
+        "max": maximum
+    }
+    
+    # Calculate percentiles
+    for p, value in zip(STAT_PERCENTILES, percentiles):
+        stats[f"p{p}"] = value
+    
+    # Calculate trend analysis as a closed-form least-squares line over
+    # x = 0..n-1; the deviations sum to zero, so cov(x, y) * n = x . deviations
+    n = len(values)
+    if n > 1:
+        slope = np.dot(np.arange(n, dtype=np.float64), deviations) / (n * (n * n - 1) / 12)
+        stats["trend_slope"] = float(slope)
+        stats["trend_intercept"] = float(mean - slope * (n - 1) / 2)
+    
+    # Detect anomalies using Z-score, compared without dividing by std; the
+    # deviations are not needed afterwards, so take absolute values in place
+    np.abs(deviations, out=deviations)
+    stats["anomaly_count"] = int(np.count_nonzero(deviations > 3 * std))
+    
+    return stats
+
 class MetricProcessor:
     """
     Enterprise-grade metric processor for analyzing exercise performance data with
@@ -44,15 +132,34 @@ class MetricProcessor:
             enable_gzip=True
         )
         
-        # Initialize connection pools and cache
+        # Initialize connection pools and the aggregation cache (key -> (deadline, result))
         self._connection_pool = {}
-        self._cache = {}
+        self._cache: "OrderedDict[tuple, tuple]" = OrderedDict()
         
-        # Initialize write API with batching
+        # Initialize write API with background batching; points are flushed every
+        # batch_size points or flush interval, and at interpreter exit
         self._write_api = self._influxdb_client.write_api(
-            write_options=SYNCHRONOUS,
-            batch_size=self._config.batch_size,
-            flush_interval=self._config.flush_interval_seconds * 1000
+            write_options=WriteOptions(
+                batch_size=self._config.batch_size,
+                flush_interval=self._config.flush_interval_seconds * 1000,
+                jitter_interval=WRITE_JITTER_INTERVAL_MS,
+                retry_interval=WRITE_RETRY_INTERVAL_MS
+            )
+        )
+        atexit.register(self._write_api.close)
+
+        # Metric documents awaiting one bulk MongoDB insert, flushed every
+        # batch_size documents, by a timer once the oldest is flush_interval
+        # old, before reads and at interpreter exit
+        self._metric_buffer: List[Dict] = []
+        self._flush_timer: Optional[threading.Timer] = None
+        self._buffer_lock = threading.Lock()
+        atexit.register(self.flush_metrics)
+
+        # Worker threads summarizing exercises concurrently; NumPy's reductions
+        # and partitions release the GIL on the large arrays that dominate
+        self._stats_executor = ThreadPoolExecutor(
+            max_workers=os.cpu_count(), thread_name_prefix='metric-stats'
         )
 
     def calculate_statistics(
@@ -75,53 +182,60 @@ class MetricProcessor:
             Dictionary containing calculated statistics
         """
         try:
-            # Retrieve metrics from MongoDB
-            metrics = MetricModel.get_metrics_by_timerange(
+            self.flush_metrics()
+            
+            # Read metric values from MongoDB straight into a float32 array
+            values = MetricModel.get_values_array(
                 start_time=start_time,
                 end_time=end_time,
-                organization_id=exercise_id,
+                organization_id=None,
+                exercise_id=exercise_id,
                 metric_type=metric_type
             )
             
-            # Convert to numpy array for efficient computation
-            values = np.array([m.value for m in metrics])
-            
-            if len(values) == 0:
-                return {
-                    "count": 0,
-                    "error": "No metrics found for the specified period"
-                }
-            
-            # Calculate basic statistics
-            stats = {
-                "count": len(values),
-                "mean": float(np.mean(values)),
-                "median": float(np.median(values)),
-                "std": float(np.std(values)),
-                "min": float(np.min(values)),
-                "max": float(np.max(values))
-            }
-            
-            # Calculate percentiles
-            percentiles = [75, 90, 95, 99]
-            for p in percentiles:
-                stats[f"p{p}"] = float(np.percentile(values, p))
+            return _summarize_values(values)
             
-            # Calculate trend analysis
-            if len(values) > 1:
-                x = np.arange(len(values))
-                coeffs = np.polyfit(x, values, 1)
-                stats["trend_slope"] = float(coeffs[0])
-                stats["trend_intercept"] = float(coeffs[1])
-            
-            # Detect anomalies using Z-score
-            z_scores = np.abs((values - stats["mean"]) / stats["std"])
-            stats["anomaly_count"] = int(np.sum(z_scores > 3))
+        except Exception as e:
+            self._logger.error(f"Error calculating statistics: {str(e)}")
+            raise
+
+    def calculate_statistics_batch(
+        self,
+        exercise_ids: List[str],
+        metric_type: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Calculate calculate_statistics() results for several exercises from a
+        single MongoDB query.
+        
+        Args:
+            exercise_ids: Exercise identifiers
+            metric_type: Type of metric to analyze
+            start_time: Start of analysis period, or None for no lower bound
+            end_time: End of analysis period, or None for no upper bound
             
-            return stats
+        Returns:
+            Statistics per exercise ID; exercises without metrics get a zero count
+        """
+        try:
+            self.flush_metrics()
+            values_by_exercise = MetricModel.get_values_by_exercise(
+                exercise_ids=exercise_ids,
+                metric_type=metric_type,
+                start_time=start_time,
+                end_time=end_time
+            )
+            empty = np.empty(0, dtype=VALUES_DTYPE)
+            summaries = self._stats_executor.map(
+                _summarize_values,
+                (values_by_exercise.get(exercise_id, empty) for exercise_id in exercise_ids)
+            )
+            return dict(zip(exercise_ids, summaries))
             
         except Exception as e:
-            self._logger.error(f"Error calculating statistics: {str(e)}")
+            self._logger.error(f"Error calculating batch statistics: {str(e)}")
             raise
 
     def generate_time_series(
@@ -146,15 +260,10 @@ class MetricProcessor:
             DataFrame containing time series data with analysis
         """
         try:
-            # Query metrics from InfluxDB
-            query = f'''
-                from(bucket: "{self._config.influxdb_bucket}")
-                |> range(start: {start_time.isoformat()}, stop: {end_time.isoformat()})
-                |> filter(fn: (r) => r["organization_id"] == "{organization_id}")
-                |> filter(fn: (r) => r["metric_type"] == "{metric_type}")
-                |> aggregateWindow(every: {interval}, fn: mean)
-                |> yield(name: "mean")
-            '''
+            # Query windowed means with rolling statistics computed by InfluxDB
+            query = self._enriched_time_series_query(
+                organization_id, metric_type, start_time, end_time, interval
+            )
             
             result = self._influxdb_client.query_api().query_data_frame(query)
             
@@ -165,15 +274,14 @@ class MetricProcessor:
             df = pd.DataFrame(result)
             df.set_index('_time', inplace=True)
             
-            # Calculate rolling statistics
-            df['rolling_mean'] = df['_value'].rolling(window=3).mean()
-            df['rolling_std'] = df['_value'].rolling(window=3).std()
+            # Rolling sample std from the server-side moving averages of x and x^2
+            values = df['_value'].to_numpy(dtype=np.float64)
+            rolling_mean = df['rolling_mean'].to_numpy(dtype=np.float64)
+            variance = df.pop('rolling_sq').to_numpy(dtype=np.float64) - rolling_mean * rolling_mean
+            df['rolling_std'] = np.sqrt(np.maximum(variance, 0) * ROLLING_WINDOW / (ROLLING_WINDOW - 1))
             
-            # Calculate exponential moving average
-            df['ema'] = df['_value'].ewm(span=5).mean()
-            
-            # Detect trend changes
-            df['trend_change'] = df['_value'].diff().apply(np.sign)
+            # Detect trend changes with the sign ufunc rather than a per-row apply
+            df['trend_change'] = np.sign(np.diff(values, prepend=np.nan))
             
             return df
             
@@ -181,6 +289,91 @@ class MetricProcessor:
             self._logger.error(f"Error generating time series: {str(e)}")
             raise
 
+    def iter_time_series(
+        self,
+        organization_id: str,
+        metric_type: str,
+        start_time: datetime,
+        end_time: datetime,
+        interval: str = "1h"
+    ) -> Iterator[Tuple[datetime, float]]:
+        """
+        Lazily yield windowed time series points as they are read from InfluxDB.
+        
+        Args:
+            organization_id: Organization identifier
+            metric_type: Type of metric to analyze
+            start_time: Start of time series
+            end_time: End of time series
+            interval: Time series interval
+            
+        Returns:
+            Iterator of (window time, mean value) pairs
+        """
+        query = self._time_series_query(
+            organization_id, metric_type, start_time, end_time, interval
+        )
+        for record in self._influxdb_client.query_api().query_stream(query):
+            yield record.get_time(), record.get_value()
+
+    def _time_series_query(
+        self,
+        organization_id: str,
+        metric_type: str,
+        start_time: datetime,
+        end_time: datetime,
+        interval: str
+    ) -> str:
+        """Build the Flux query for windowed mean time series."""
+        return f'''
+            {self._windowed_source(organization_id, metric_type, start_time, end_time, interval)}
+            |> yield(name: "mean")
+        '''
+
+    def _enriched_time_series_query(
+        self,
+        organization_id: str,
+        metric_type: str,
+        start_time: datetime,
+        end_time: datetime,
+        interval: str
+    ) -> str:
+        """
+        Build the Flux query for windowed means alongside their trailing moving
+        average, moving average of squares and EMA, pivoted into one row per window.
+        """
+        return f'''
+            data = {self._windowed_source(organization_id, metric_type, start_time, end_time, interval)}
+            union(tables: [
+                data,
+                data |> movingAverage(n: {ROLLING_WINDOW}) |> set(key: "_field", value: "rolling_mean"),
+                data
+                    |> map(fn: (r) => ({{r with _value: r._value * r._value}}))
+                    |> movingAverage(n: {ROLLING_WINDOW})
+                    |> set(key: "_field", value: "rolling_sq"),
+                data |> exponentialMovingAverage(n: {EMA_SPAN}) |> set(key: "_field", value: "ema")
+            ])
+            |> pivot(rowKey: ["_time"], columnKey: ["_field"], valueColumn: "_value")
+            |> sort(columns: ["_time"])
+            |> yield(name: "time_series")
+        '''
+
+    def _windowed_source(
+        self,
+        organization_id: str,
+        metric_type: str,
+        start_time: datetime,
+        end_time: datetime,
+        interval: str
+    ) -> str:
+        """Flux pipeline of a metric type's windowed means, tagged as field ``_value``."""
+        return f'''from(bucket: "{self._config.influxdb_bucket}")
+            |> range(start: {start_time.isoformat()}, stop: {end_time.isoformat()})
+            |> filter(fn: (r) => r["organization_id"] == "{organization_id}")
+            |> filter(fn: (r) => r["metric_type"] == "{metric_type}")
+            |> aggregateWindow(every: {interval}, fn: mean)
+            |> set(key: "_field", value: "_value")'''
+
     def store_metric(
         self,
         organization_id: str,
@@ -203,18 +396,24 @@ class MetricProcessor:
             Success status
         """
         try:
-            # Create metric document
-            metric = MetricModel(
-                organization_id=organization_id,
-                exercise_id=exercise_id,
-                metric_type=metric_type,
-                value=value,
-                metadata=metadata or {},
-                timestamp=datetime.utcnow()
-            )
+            # Validate and build the metric document
+            document = MetricModel.to_document({
+                'organization_id': organization_id,
+                'exercise_id': exercise_id,
+                'metric_type': metric_type,
+                'value': value,
+                'metadata': metadata or {},
+                'timestamp': datetime.utcnow()
+            })
             
-            # Store in MongoDB
-            metric.save()
+            # Buffer for a bulk MongoDB insert
+            with self._buffer_lock:
+                if not self._metric_buffer:
+                    self._schedule_flush()
+                self._metric_buffer.append(document)
+                flush_due = len(self._metric_buffer) >= self._config.batch_size
+            if flush_due:
+                self.flush_metrics()
             
             # Store in InfluxDB
             point = influxdb_client.Point("exercise_metrics")\
@@ -222,7 +421,7 @@ class MetricProcessor:
                 .tag("exercise_id", exercise_id)\
                 .tag("metric_type", metric_type)\
                 .field("value", value)\
-                .time(metric.timestamp)
+                .time(document['timestamp'])
                 
             self._write_api.write(
                 bucket=self._config.influxdb_bucket,
@@ -235,7 +434,90 @@ class MetricProcessor:
             self._logger.error(f"Error storing metric: {str(e)}")
             raise
 
-    @lru_cache(maxsize=100)
+    def _schedule_flush(self) -> None:
+        """Start the timer flushing the buffer flush_interval from now; hold _buffer_lock."""
+        self._flush_timer = threading.Timer(self._config.flush_interval_seconds, self.flush_metrics)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def flush_metrics(self) -> int:
+        """
+        Insert buffered metrics into MongoDB with one bulk write.
+
+        Metrics are put back at the front of the buffer when no server could be
+        reached, so nothing acknowledged by store_metric is lost. Metrics the
+        server rejects, and batches whose insert may have been applied before
+        failing, are logged with their IDs instead of being retried, since the
+        time-series collection would store a re-inserted metric twice.
+        
+        Returns:
+            Number of metrics inserted
+        """
+        with self._buffer_lock:
+            documents, self._metric_buffer = self._metric_buffer, []
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+        if not documents:
+            return 0
+
+        inserted = documents
+        try:
+            # One insert_many so write error indexes refer to buffer positions
+            MetricModel.insert_documents(documents, batch_size=len(documents), record_buckets=False)
+        except ServerSelectionTimeoutError as e:
+            self._logger.warning(f"Re-buffering {len(documents)} metrics after failed insert: {str(e)}")
+            with self._buffer_lock:
+                if not self._metric_buffer:
+                    self._schedule_flush()
+                self._metric_buffer[:0] = documents
+            return 0
+        except BulkWriteError as e:
+            failed = {write_error['index'] for write_error in e.details.get('writeErrors', ())}
+            inserted = [doc for i, doc in enumerate(documents) if i not in failed]
+            self._logger.error(
+                f"Dropped {len(failed)} metrics rejected by MongoDB "
+                f"{[str(documents[i]['_id']) for i in sorted(failed)]}: {str(e)}"
+            )
+        except Exception as e:
+            self._logger.error(
+                f"Insert outcome unknown for {len(documents)} metrics "
+                f"{[str(doc['_id']) for doc in documents]}: {str(e)}"
+            )
+            return 0
+
+        try:
+            MetricBucketModel.record(inserted)
+        except Exception as e:
+            self._logger.error(f"Failed to record {len(inserted)} stored metrics in buckets: {str(e)}")
+        return len(inserted)
+
+    def exercise_timeframe(self, exercise_id: str) -> Optional[Tuple[datetime, datetime]]:
+        """
+        Determine the period covered by an exercise's stored metrics.
+        
+        Args:
+            exercise_id: Exercise identifier
+            
+        Returns:
+            Tuple of first and last metric timestamps, or None without metrics
+        """
+        self.flush_metrics()
+        return MetricModel.exercise_timeframe(exercise_id)
+
+    def metrics_version(self, exercise_id: str) -> Tuple[Optional[datetime], Optional[str]]:
+        """
+        Fingerprint an exercise's stored metrics for result caching.
+        
+        Args:
+            exercise_id: Exercise identifier
+            
+        Returns:
+            Tuple of newest metric timestamp and ID
+        """
+        self.flush_metrics()
+        return MetricModel.exercise_version(exercise_id)
+
     def aggregate_metrics(
         self,
         organization_id: str,
@@ -247,6 +529,10 @@ class MetricProcessor:
         """
         Perform multi-dimensional metric aggregation with caching.
         
+        The period is widened to whole minutes and results are cached for
+        AGGREGATE_CACHE_TTL seconds per (organization, metric type, dimension
+        set, period), so repeated dashboard refreshes share one aggregation.
+        
         Args:
             organization_id: Organization identifier
             metric_type: Type of metric to aggregate
@@ -258,30 +544,67 @@ class MetricProcessor:
             Dictionary of aggregated metrics by dimension
         """
         try:
+            # Quantize the period to minutes so refreshes map to the same key
+            start_time = start_time.replace(second=0, microsecond=0)
+            if end_time.second or end_time.microsecond:
+                end_time = end_time.replace(second=0, microsecond=0) + timedelta(minutes=1)
+            key = (organization_id, metric_type, tuple(sorted(set(dimensions))), start_time, end_time)
+            
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._cache.move_to_end(key)
+                return entry[1]
+            
+            self.flush_metrics()
             results = {}
             
-            # Retrieve base metrics
-            metrics = MetricModel.get_metrics_by_timerange(
-                start_time=start_time,
-                end_time=end_time,
-                organization_id=organization_id,
-                metric_type=metric_type
-            )
+            # Dimensions name series fields or metadata keys; fetch only those paths
+            paths = {
+                dimension: ('meta' if dimension in SERIES_FIELDS else 'metadata', dimension)
+                for dimension in dimensions
+            }
+            projection = {'_id': 0, 'value': 1, 'timestamp': 1}
+            projection.update({f'{parent}.{name}': 1 for parent, name in paths.values()})
             
-            # Convert to DataFrame for efficient aggregation
-            df = pd.DataFrame([m.to_dict() for m in metrics])
+            # Retrieve base metrics as raw documents
+            rows = [
+                doc
+                for batch in MetricModel.get_metrics_batched(
+                    start_time=start_time,
+                    end_time=end_time,
+                    organization_id=organization_id,
+                    metric_type=metric_type,
+                    projection=projection
+                )
+                for doc in batch
+            ]
+            
+            # Build the DataFrame column by column from pre-typed arrays
+            columns = {
+                'value': np.fromiter((doc['value'] for doc in rows), dtype=VALUES_DTYPE, count=len(rows)),
+                'timestamp': np.array([doc['timestamp'] for doc in rows], dtype='datetime64[ns]')
+            }
+            for dimension, (parent, name) in paths.items():
+                column = [doc.get(parent, {}).get(name) for doc in rows]
+                if any(value is not None for value in column):
+                    # Factorize each dimension once; grouping then reuses the codes
+                    columns[dimension] = pd.Categorical(column)
+            df = pd.DataFrame(columns)
             
-            if df.empty:
-                return results
-                
             # Perform dimensional aggregation
             for dimension in dimensions:
-                if dimension in df.columns:
-                    agg_df = df.groupby(dimension).agg({
+                if not df.empty and dimension in df.columns:
+                    agg_df = df.groupby(dimension, observed=True, sort=False).agg({
                         'value': ['count', 'mean', 'std', 'min', 'max'],
                         'timestamp': ['min', 'max']
                     })
                     results[dimension] = agg_df
+            
+            # Cache the result, evicting the least recently used entry when full
+            self._cache[key] = (time.monotonic() + AGGREGATE_CACHE_TTL, results)
+            self._cache.move_to_end(key)
+            while len(self._cache) > AGGREGATE_CACHE_SIZE:
+                self._cache.popitem(last=False)
                     
             return results
             
@@ -296,5 +619,7 @@ class MetricProcessor:
                 self._write_api.close()
             if hasattr(self, '_influxdb_client'):
                 self._influxdb_client.close()
+            if hasattr(self, '_stats_executor'):
+                self._stats_executor.shutdown(wait=False)
         except Exception as e:
             self._logger.error(f"Error during cleanup: {str(e)}")
\ No newline at end of file
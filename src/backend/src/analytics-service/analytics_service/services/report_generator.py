@@ -10,13 +10,21 @@ Version: 1.0.0
 # External imports
 import pandas as pd  # version: 2.0+
 import jinja2  # version: 3.1+
-from weasyprint import HTML  # version: 59.0+
+import orjson  # version: 3.9+
+from weasyprint import CSS, HTML  # version: 59.0+
+from weasyprint.text.fonts import FontConfiguration
 import boto3  # version: 1.26+
+from boto3.s3.transfer import TransferConfig
 import asyncio
-from datetime import datetime
-from typing import Dict, List, Optional
+import io
+from functools import partial
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence
 import logging
-from functools import lru_cache
+import time
+from collections import OrderedDict
 from prometheus_client import Counter, Histogram  # version: 0.17+
 
 # Internal imports
@@ -24,6 +32,58 @@ from ..models.report import ReportModel, ReportType, ReportStatus
 from .gap_analyzer import GapAnalyzer
 from .metric_processor import MetricProcessor
 
+# Default bound on concurrent S3 uploads (config key 'max_s3_concurrency')
+S3_UPLOAD_CONCURRENCY = 32
+
+# S3 client connections, shared by concurrent uploads and their multipart parts
+S3_MAX_POOL_CONNECTIONS = 100
+
+# Reports above the threshold upload as parallel multipart parts of this size
+S3_MULTIPART_THRESHOLD = 8 * 1024 * 1024
+S3_MULTIPART_CONCURRENCY = 10
+
+# Completed reports reused for identical requests: entry bound and lifetime in seconds
+REPORT_CACHE_SIZE = 1024
+REPORT_CACHE_TTL = 300
+
+# Default period of metrics collected for a report (config key 'lookback_days')
+DEFAULT_LOOKBACK_DAYS = 30
+
+# Gap columns read by the content helpers, and orderings of severities and priorities
+GAP_FRAME_COLUMNS = ('gap_type', 'severity', 'title', 'affected_areas', 'recommendations')
+SEVERITY_RANK = {'CRITICAL': 0, 'HIGH': 1, 'MEDIUM': 2, 'LOW': 3}
+PRIORITY_RANK = {'high': 0, 'medium': 1, 'low': 2}
+
+# Recommendations and findings listed in summary reports
+MAX_RECOMMENDATIONS = 10
+
+def _gap_frame(gaps: Sequence) -> pd.DataFrame:
+    """One row per gap model (or gap dictionary) with the GAP_FRAME_COLUMNS columns."""
+    records = [gap.to_dict() if hasattr(gap, 'to_dict') else gap for gap in gaps]
+    frame = pd.DataFrame.from_records(records, columns=list(GAP_FRAME_COLUMNS))
+    frame['severity_rank'] = frame['severity'].map(SEVERITY_RANK).fillna(len(SEVERITY_RANK))
+    return frame
+
+def _template_name(report_type: ReportType) -> str:
+    """HTML template file rendering a report type."""
+    return f"{report_type.value.lower()}.html"
+
+# Per-worker PDF resources, set up once by _init_pdf_worker
+_pdf_font_config: Optional[FontConfiguration] = None
+_pdf_stylesheets: List[CSS] = []
+
+def _init_pdf_worker(stylesheet_paths: Sequence[str]) -> None:
+    """Discover fonts and parse the report stylesheets once per PDF worker process."""
+    global _pdf_font_config, _pdf_stylesheets
+    _pdf_font_config = FontConfiguration()
+    _pdf_stylesheets = [CSS(filename=path, font_config=_pdf_font_config) for path in stylesheet_paths]
+
+def _render_pdf(html_content: bytes) -> bytes:
+    """Render UTF-8 HTML to PDF; module-level so process pool workers can run it."""
+    return HTML(file_obj=io.BytesIO(html_content), encoding='utf-8').write_pdf(
+        stylesheets=_pdf_stylesheets, font_config=_pdf_font_config
+    )
+
 class ReportGenerator:
     """
     Enterprise-grade report generator implementing comprehensive analysis capabilities
@@ -44,26 +104,52 @@ class ReportGenerator:
         self._metric_processor = metric_processor
         self._logger = logging.getLogger(__name__)
 
-        # Initialize Jinja2 environment with caching
+        # Initialize Jinja2 environment; it caches up to 200 compiled templates
         self._jinja_env = jinja2.Environment(
             loader=jinja2.FileSystemLoader(config['template_path']),
             autoescape=True,
             cache_size=200
         )
 
-        # Initialize S3 client with retry configuration
+        # Compile each report type's template once; types without a template
+        # are resolved through the environment when first rendered
+        self._templates: Dict[ReportType, jinja2.Template] = {}
+        for report_type in ReportType:
+            try:
+                self._templates[report_type] = self._jinja_env.get_template(_template_name(report_type))
+            except jinja2.TemplateNotFound:
+                pass
+
+        # CPU-bound PDF rendering runs in worker processes, off the event loop;
+        # each worker parses the optional config 'stylesheets' once
+        self._pdf_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            initializer=_init_pdf_worker,
+            initargs=(tuple(config.get('stylesheets', ())),)
+        )
+
+        # Initialize S3 client with retry configuration and bounded upload concurrency
+        upload_concurrency = config.get('max_s3_concurrency', S3_UPLOAD_CONCURRENCY)
         self._s3_client = boto3.client(
             's3',
             region_name=config['aws_region'],
             config=boto3.Config(
                 retries={'max_attempts': 3},
                 connect_timeout=5,
-                read_timeout=10
+                read_timeout=10,
+                max_pool_connections=S3_MAX_POOL_CONNECTIONS
             )
         )
-
-        # Initialize template cache
-        self._template_cache = {}
+        self._transfer_config = TransferConfig(
+            multipart_threshold=S3_MULTIPART_THRESHOLD,
+            multipart_chunksize=S3_MULTIPART_THRESHOLD,
+            max_concurrency=S3_MULTIPART_CONCURRENCY,
+            use_threads=True
+        )
+        self._upload_pool = ThreadPoolExecutor(
+            max_workers=upload_concurrency, thread_name_prefix='report-upload'
+        )
+        self._upload_semaphore = asyncio.Semaphore(upload_concurrency)
 
         # Initialize Prometheus metrics
         self._report_counter = Counter(
@@ -77,7 +163,11 @@ class ReportGenerator:
             ['report_type', 'format']
         )
 
+        # Completed reports by request and metrics version: key -> (deadline, report)
+        self._report_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
         # Store configuration
+        self._lookback = timedelta(days=config.get('lookback_days', DEFAULT_LOOKBACK_DAYS))
         self._config = config
         self._bucket_name = config['s3_bucket']
         self._template_path = config['template_path']
@@ -103,9 +193,27 @@ class ReportGenerator:
             options: Additional report generation options
 
         Returns:
-            ReportModel instance with generation status and file URL
+            ReportModel instance with generation status and file URL; identical
+            requests within REPORT_CACHE_TTL reuse the completed report while the
+            exercise's metrics are unchanged
         """
+        report = None
         try:
+            # Reuse a completed report for the same request and metrics
+            metrics_version = await asyncio.to_thread(self._metric_processor.metrics_version, exercise_id)
+            key = (
+                organization_id,
+                exercise_id,
+                report_type,
+                format,
+                orjson.dumps(options or {}, default=str, option=orjson.OPT_SORT_KEYS),
+                metrics_version
+            )
+            entry = self._report_cache.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._report_cache.move_to_end(key)
+                return entry[1]
+
             # Create new report instance
             report = ReportModel(
                 organization_id=organization_id,
@@ -120,11 +228,11 @@ class ReportGenerator:
             # Update status to generating
             report.update_status(ReportStatus.GENERATING)
 
-            # Collect exercise metrics
-            metrics = await self._collect_metrics(exercise_id, report_type)
-
-            # Perform gap analysis
-            gaps = await self._analyze_gaps(exercise_id, organization_id)
+            # Collect exercise metrics and perform gap analysis concurrently
+            metrics, gaps = await asyncio.gather(
+                self._collect_metrics(exercise_id, report_type),
+                self._analyze_gaps(exercise_id, organization_id)
+            )
 
             # Generate report content based on type
             content = await self._generate_content(
@@ -137,7 +245,7 @@ class ReportGenerator:
             # Format report using template
             formatted_report = await self._format_report(
                 content=content,
-                template_name=f"{report_type.value.lower()}.html",
+                report_type=report_type,
                 format=format
             )
 
@@ -148,11 +256,13 @@ class ReportGenerator:
                 format=format
             )
 
-            # Update report status and URL
+            # Update report status and URL, stamping completion once
+            completed_at = datetime.now(timezone.utc)
             report.update_status(
                 ReportStatus.COMPLETED,
                 file_url=file_url,
-                additional_metadata={'completion_time': datetime.utcnow().isoformat()}
+                additional_metadata={'completion_time': completed_at.isoformat()},
+                now=completed_at
             )
 
             # Update metrics
@@ -162,6 +272,12 @@ class ReportGenerator:
                 status='success'
             ).inc()
 
+            # Cache the report, evicting the least recently used entry when full
+            self._report_cache[key] = (time.monotonic() + REPORT_CACHE_TTL, report)
+            self._report_cache.move_to_end(key)
+            while len(self._report_cache) > REPORT_CACHE_SIZE:
+                self._report_cache.popitem(last=False)
+
             return report
 
         except Exception as e:
@@ -190,30 +306,31 @@ class ReportGenerator:
             Dictionary containing processed metrics
         """
         try:
-            metrics = {}
-            
             # Get time range for metrics
             end_time = datetime.utcnow()
-            start_time = end_time - pd.Timedelta(days=30)  # Configurable period
-
-            # Collect performance metrics
-            metrics['performance'] = self._metric_processor.calculate_statistics(
-                exercise_id=exercise_id,
-                metric_type='response_time',
-                start_time=start_time,
-                end_time=end_time
-            )
-
-            # Generate time series data
-            metrics['trends'] = self._metric_processor.generate_time_series(
-                organization_id=exercise_id,
-                metric_type='response_time',
-                start_time=start_time,
-                end_time=end_time,
-                interval='1h'
+            start_time = end_time - self._lookback
+
+            # Collect performance metrics and time series data in worker
+            # threads, so the blocking queries overlap
+            performance, trends = await asyncio.gather(
+                asyncio.to_thread(
+                    self._metric_processor.calculate_statistics,
+                    exercise_id=exercise_id,
+                    metric_type='response_time',
+                    start_time=start_time,
+                    end_time=end_time
+                ),
+                asyncio.to_thread(
+                    self._metric_processor.generate_time_series,
+                    organization_id=exercise_id,
+                    metric_type='response_time',
+                    start_time=start_time,
+                    end_time=end_time,
+                    interval='1h'
+                )
             )
 
-            return metrics
+            return {'performance': performance, 'trends': trends}
 
         except Exception as e:
             self._logger.error(f"Error collecting metrics: {str(e)}")
@@ -231,7 +348,8 @@ class ReportGenerator:
             List of identified gaps with recommendations
         """
         try:
-            return self._gap_analyzer.analyze_exercise(
+            return await asyncio.to_thread(
+                self._gap_analyzer.analyze_exercise,
                 exercise_id=exercise_id,
                 organization_id=organization_id
             )
@@ -239,10 +357,9 @@ class ReportGenerator:
             self._logger.error(f"Error analyzing gaps: {str(e)}")
             raise
 
-    @lru_cache(maxsize=10)
-    async def _get_template(self, template_name: str) -> jinja2.Template:
+    def _get_template(self, template_name: str) -> jinja2.Template:
         """
-        Retrieve and cache report template.
+        Retrieve a report template from the Jinja2 environment's template cache.
 
         Args:
             template_name: Name of template file
@@ -251,10 +368,7 @@ class ReportGenerator:
             Compiled Jinja2 template
         """
         try:
-            if template_name not in self._template_cache:
-                template = self._jinja_env.get_template(template_name)
-                self._template_cache[template_name] = template
-            return self._template_cache[template_name]
+            return self._jinja_env.get_template(template_name)
         except Exception as e:
             self._logger.error(f"Error loading template: {str(e)}")
             raise
@@ -262,7 +376,7 @@ class ReportGenerator:
     async def _format_report(
         self,
         content: Dict,
-        template_name: str,
+        report_type: ReportType,
         format: str
     ) -> bytes:
         """
@@ -270,24 +384,30 @@ class ReportGenerator:
 
         Args:
             content: Report content
-            template_name: Template file name
+            report_type: Report type selecting the template
             format: Output format
 
         Returns:
             Formatted report as bytes
         """
         try:
-            template = await self._get_template(template_name)
-            html_content = template.render(**content)
+            # JSON exports serialize the content directly, without the template
+            if format == 'JSON':
+                return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+            if format not in ('HTML', 'PDF'):
+                raise ValueError(f"Unsupported format: {format}")
+
+            template = self._templates.get(report_type) or self._get_template(_template_name(report_type))
+            # Encode template output chunk by chunk as it renders
+            buffer = io.BytesIO()
+            template.stream(**content).dump(buffer, encoding='utf-8')
+            html_content = buffer.getvalue()
 
             if format == 'HTML':
-                return html_content.encode('utf-8')
-            elif format == 'PDF':
-                return HTML(string=html_content).write_pdf()
-            elif format == 'JSON':
-                return pd.json.dumps(content).encode('utf-8')
-            else:
-                raise ValueError(f"Unsupported format: {format}")
+                return html_content
+            return await asyncio.get_running_loop().run_in_executor(
+                self._pdf_pool, _render_pdf, html_content
+            )
 
         except Exception as e:
             self._logger.error(f"Error formatting report: {str(e)}")
@@ -308,16 +428,22 @@ class ReportGenerator:
         try:
             key = f"reports/{report_id}/report.{format.lower()}"
             
-            await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self._s3_client.put_object(
-                    Bucket=self._bucket_name,
-                    Key=key,
-                    Body=report_data,
-                    ContentType=f"application/{format.lower()}",
-                    ServerSideEncryption='AES256'
+            # Excess uploads wait here rather than queueing in the executor
+            async with self._upload_semaphore:
+                await asyncio.get_running_loop().run_in_executor(
+                    self._upload_pool,
+                    partial(
+                        self._s3_client.upload_fileobj,
+                        io.BytesIO(report_data),
+                        self._bucket_name,
+                        key,
+                        ExtraArgs={
+                            'ContentType': f"application/{format.lower()}",
+                            'ServerSideEncryption': 'AES256'
+                        },
+                        Config=self._transfer_config
+                    )
                 )
-            )
 
             return f"https://{self._bucket_name}.s3.amazonaws.com/{key}"
 
@@ -352,17 +478,21 @@ class ReportGenerator:
                 'options': options or {}
             }
 
+            # Tabulate the gaps once for the vectorized summaries
+            if report_type in (ReportType.EXERCISE_SUMMARY, ReportType.GAP_ANALYSIS):
+                gap_frame = _gap_frame(gaps)
+
             if report_type == ReportType.EXERCISE_SUMMARY:
                 content.update({
                     'performance_summary': self._summarize_performance(metrics),
-                    'key_findings': self._extract_key_findings(gaps),
-                    'recommendations': self._prioritize_recommendations(gaps)
+                    'key_findings': self._extract_key_findings(gap_frame),
+                    'recommendations': self._prioritize_recommendations(gap_frame)
                 })
             elif report_type == ReportType.GAP_ANALYSIS:
                 content.update({
-                    'gap_categories': self._categorize_gaps(gaps),
+                    'gap_categories': self._categorize_gaps(gap_frame),
                     'trend_analysis': self._analyze_trends(metrics),
-                    'improvement_areas': self._identify_improvement_areas(gaps)
+                    'improvement_areas': self._identify_improvement_areas(gap_frame)
                 })
 
             return content
@@ -371,10 +501,91 @@ class ReportGenerator:
             self._logger.error(f"Error generating content: {str(e)}")
             raise
 
-    def __del__(self):
-        """Cleanup resources and connections."""
-        try:
-            self._template_cache.clear()
-            self._jinja_env.cache.clear()
-        except Exception as e:
-            self._logger.error(f"Error during cleanup: {str(e)}")
\ No newline at end of file
+    @staticmethod
+    def _summarize_performance(metrics: Dict) -> Dict:
+        """Headline response time statistics of the collected metrics."""
+        performance = metrics.get('performance') or {}
+        return {
+            key: performance[key]
+            for key in ('count', 'mean', 'median', 'p95', 'std', 'anomaly_count')
+            if key in performance
+        }
+
+    @staticmethod
+    def _extract_key_findings(gap_frame: pd.DataFrame) -> List[str]:
+        """Titles of critical and high severity gaps, most severe first."""
+        findings = gap_frame[gap_frame['severity_rank'] <= SEVERITY_RANK['HIGH']]
+        return findings.sort_values('severity_rank', kind='stable')['title'].head(MAX_RECOMMENDATIONS).tolist()
+
+    @staticmethod
+    def _prioritize_recommendations(gap_frame: pd.DataFrame) -> List[Dict]:
+        """
+        Recommendations across all gaps, ordered by gap severity, recommendation
+        priority and estimated impact.
+        """
+        exploded = gap_frame[['severity_rank', 'recommendations']].explode('recommendations').dropna()
+        if exploded.empty:
+            return []
+        recommendations = pd.DataFrame.from_records(
+            exploded['recommendations'].tolist(), index=exploded.index
+        )
+        recommendations['severity_rank'] = exploded['severity_rank']
+        recommendations['priority_rank'] = (
+            recommendations.get('priority', pd.Series(index=recommendations.index, dtype=object))
+            .map(PRIORITY_RANK).fillna(len(PRIORITY_RANK))
+        )
+        if 'estimated_impact' not in recommendations:
+            recommendations['estimated_impact'] = 0.0
+        ordered = recommendations.sort_values(
+            ['severity_rank', 'priority_rank', 'estimated_impact'],
+            ascending=[True, True, False],
+            kind='stable'
+        ).drop(columns=['severity_rank', 'priority_rank'])
+        return ordered.head(MAX_RECOMMENDATIONS).to_dict('records')
+
+    @staticmethod
+    def _categorize_gaps(gap_frame: pd.DataFrame) -> Dict[str, Dict[str, int]]:
+        """Gap counts per gap type and severity."""
+        counts = gap_frame.groupby(['gap_type', 'severity'], sort=False).size()
+        categories: Dict[str, Dict[str, int]] = {}
+        for (gap_type, severity), count in counts.items():
+            categories.setdefault(gap_type, {})[severity] = int(count)
+        return categories
+
+    @staticmethod
+    def _analyze_trends(metrics: Dict) -> Dict:
+        """Direction of the response time trend and its latest smoothed values."""
+        performance = metrics.get('performance') or {}
+        slope = performance.get('trend_slope')
+        analysis = {
+            'trend_slope': slope,
+            'direction': None if slope is None else
+                'stable' if slope == 0 else 'increasing' if slope > 0 else 'decreasing'
+        }
+        trends = metrics.get('trends')
+        if isinstance(trends, pd.DataFrame) and not trends.empty:
+            latest = trends.iloc[-1]
+            for column in ('rolling_mean', 'rolling_std', 'ema'):
+                if column in trends and pd.notna(latest[column]):
+                    analysis[f'latest_{column}'] = float(latest[column])
+        return analysis
+
+    @staticmethod
+    def _identify_improvement_areas(gap_frame: pd.DataFrame) -> Dict[str, int]:
+        """Number of gaps affecting each area, most affected first."""
+        areas = gap_frame['affected_areas'].explode().dropna()
+        return {area: int(count) for area, count in areas.value_counts().items()}
+
+    async def aclose(self) -> None:
+        """Wait for in-flight uploads, then release worker pools, the S3 client and caches."""
+        await asyncio.to_thread(self._upload_pool.shutdown)
+        self._pdf_pool.shutdown(wait=False)
+        self._s3_client.close()
+        self._templates.clear()
+        self._report_cache.clear()
+
+    async def __aenter__(self) -> "ReportGenerator":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
\ No newline at end of file
@@ -0,0 +1,19 @@
+"""
+Analytics Service Utilities Module
+
+Provides shared helper functions used across the analytics service controllers
+and application entry point.
+
+Version: 1.0.0
+"""
+
+from analytics_service.utils.timestamps import request_now, utc_now_iso
+
+# Define module version
+__version__ = '1.0.0'
+
+# Define public API
+__all__ = [
+    'request_now',
+    'utc_now_iso'
+]
@@ -0,0 +1,43 @@
+"""
+Timestamp Utilities Module
+
+Provides fast UTC ISO-8601 timestamp formatting for response bodies and health probes,
+avoiding per-call datetime construction on hot request paths.
+
+Version: 1.0.0
+"""
+
+import time
+from datetime import datetime, timezone
+
+# Second-resolution prefix cache, refreshed when the wall-clock second changes
+_cached_second: int = -1
+_cached_prefix: str = ""
+
+def utc_now_iso() -> str:
+    """
+    Return the current UTC time formatted like datetime.utcnow().isoformat().
+
+    The "YYYY-MM-DDTHH:MM:SS" prefix is formatted with C-level strftime at most
+    once per second; only the microsecond suffix is computed on every call.
+
+    Returns:
+        str: ISO-8601 timestamp with microsecond precision
+    """
+    global _cached_second, _cached_prefix
+
+    now = time.time()
+    second = int(now)
+    if second != _cached_second:
+        _cached_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _cached_second = second
+    return f"{_cached_prefix}.{int((now - second) * 1_000_000):06d}"
+
+def request_now() -> datetime:
+    """
+    FastAPI dependency providing a single timezone-aware UTC timestamp per request.
+
+    Returns:
+        datetime: Current time in UTC
+    """
+    return datetime.now(timezone.utc)
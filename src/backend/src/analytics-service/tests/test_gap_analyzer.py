@@ -6,13 +6,16 @@ Version: 1.0.0
 """
 
 # External imports with versions
+import hashlib
+import orjson  # version: 3.9+
 import pytest  # version: 7.0+
 from unittest.mock import Mock, patch  # python3.11+
 from freezegun import freeze_time  # version: 1.2+
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 # Internal imports
-from analytics_service.services.gap_analyzer import GapAnalyzer
+from analytics_service.config import Config
+from analytics_service.services.gap_analyzer import GapAnalyzer, GapDraft
 from analytics_service.models.gap import (
     GapModel, 
     GapType, 
@@ -76,7 +79,12 @@ class TestGapAnalyzer:
         }
 
         # Configure mock responses
+        self._metric_processor.exercise_timeframe.return_value = (
+            datetime(2024, 1, 15, 10, 0, 0),
+            datetime(2024, 1, 15, 12, 0, 0)
+        )
         self._metric_processor.calculate_statistics.return_value = {
+            'count': 25,
             'mean': 130,
             'p95': 180,
             'trend_slope': -0.5,
@@ -96,11 +104,12 @@ class TestGapAnalyzer:
             organization_id=organization_id
         )
 
-        # Verify metric processor calls
+        # Verify metric processor calls cover the exercise's metric timeframe
+        self._metric_processor.exercise_timeframe.assert_called_with(exercise_id)
         self._metric_processor.calculate_statistics.assert_called_with(
             exercise_id=exercise_id,
             metric_type='response_time',
-            start_time=datetime(2024, 1, 15, 12, 0, 0),
+            start_time=datetime(2024, 1, 15, 10, 0, 0),
             end_time=datetime(2024, 1, 15, 12, 0, 0)
         )
 
@@ -112,7 +121,74 @@ class TestGapAnalyzer:
             assert gap.exercise_id == exercise_id
             assert gap.severity in [GapSeverity.HIGH, GapSeverity.MEDIUM, GapSeverity.LOW]
             assert gap.status == GapStatus.OPEN
-            assert gap.identified_at == datetime(2024, 1, 15, 12, 0, 0)
+            assert gap.identified_at == datetime(2024, 1, 15, 12, 0, 0, tzinfo=timezone.utc)
+
+    async def test_analyze_exercise_page(self):
+        """Test paginated analysis returns the full total and only the requested page."""
+        exercise_id = self._test_exercise_data['exercise_id']
+        organization_id = self._test_exercise_data['organization_id']
+
+        # Compute the unpaginated result for comparison
+        all_gaps = self._gap_analyzer.analyze_exercise(
+            exercise_id=exercise_id,
+            organization_id=organization_id
+        )
+
+        # Execute paginated analysis
+        total, page = self._gap_analyzer.analyze_exercise_page(
+            exercise_id=exercise_id,
+            organization_id=organization_id,
+            offset=1,
+            limit=2
+        )
+
+        # Validate pagination window
+        assert total == len(all_gaps)
+        assert len(page) == min(2, max(total - 1, 0))
+        assert [g.title for g in page] == [g.title for g in all_gaps[1:3]]
+
+        # Additional frameworks extend the compliance analysis
+        total_with_gdpr, _ = self._gap_analyzer.analyze_exercise_page(
+            exercise_id=exercise_id,
+            organization_id=organization_id,
+            limit=1,
+            frameworks=['GDPR', 'SOC2']
+        )
+        assert total_with_gdpr == total + 1
+
+    async def test_analyze_exercise_sparse_metrics(self):
+        """Test exercises with too few data points are not analyzed."""
+        self._metric_processor.calculate_statistics.return_value = {'count': 3, 'mean': 400}
+
+        gaps = self._gap_analyzer.analyze_exercise(
+            exercise_id=self._test_exercise_data['exercise_id'],
+            organization_id=self._test_exercise_data['organization_id'],
+            exercise_timeframe=(datetime(2024, 1, 15, 10, 0, 0), datetime(2024, 1, 15, 12, 0, 0))
+        )
+
+        assert gaps == []
+        self._metric_processor.exercise_timeframe.assert_not_called()
+
+    async def test_analyze_exercises_batch(self):
+        """Test several exercises are analyzed from one statistics query."""
+        self._metric_processor.calculate_statistics_batch.return_value = {
+            'exercise_a': {'count': 3, 'mean': 400},
+            'exercise_b': {'count': 0, 'error': 'No metrics found for specified timeframe'}
+        }
+
+        results = self._gap_analyzer.analyze_exercises_batch(
+            exercise_ids=['exercise_a', 'exercise_b'],
+            organization_id=self._test_exercise_data['organization_id']
+        )
+
+        assert results == {'exercise_a': [], 'exercise_b': []}
+        self._metric_processor.calculate_statistics_batch.assert_called_once_with(
+            exercise_ids=['exercise_a', 'exercise_b'],
+            metric_type='response_time',
+            start_time=None,
+            end_time=None
+        )
+        self._metric_processor.calculate_statistics.assert_not_called()
 
     async def test_identify_capability_gaps(self):
         """Test capability gap identification with severity assessment."""
@@ -133,16 +209,16 @@ class TestGapAnalyzer:
 
         # Validate gaps
         assert len(gaps) > 0
-        response_time_gap = next(g for g in gaps if g['type'] == GapType.PROCESS)
-        assert response_time_gap['severity'] == GapSeverity.HIGH
-        assert 'Response Time' in response_time_gap['title']
-        assert response_time_gap['metrics']['mean_response_time'] == 180
+        response_time_gap = next(g for g in gaps if g.type == GapType.PROCESS)
+        assert response_time_gap.severity == GapSeverity.HIGH
+        assert 'Response Time' in response_time_gap.title
+        assert response_time_gap.metrics['mean_response_time'] == 180
 
         # Verify decision quality gap
-        decision_gap = next(g for g in gaps if g['type'] == GapType.PEOPLE)
-        assert decision_gap['severity'] == GapSeverity.MEDIUM
-        assert 'Decision Quality' in decision_gap['title']
-        assert 'trend_slope' in decision_gap['metrics']
+        decision_gap = next(g for g in gaps if g.type == GapType.PEOPLE)
+        assert decision_gap.severity == GapSeverity.MEDIUM
+        assert 'Decision Quality' in decision_gap.title
+        assert 'trend_slope' in decision_gap.metrics
 
     async def test_analyze_compliance_coverage(self):
         """Test compliance framework coverage analysis."""
@@ -164,30 +240,35 @@ class TestGapAnalyzer:
         # Validate compliance gaps
         assert len(gaps) > 0
         for gap in gaps:
-            assert gap['type'] == GapType.COMPLIANCE
-            assert gap['severity'] == GapSeverity.HIGH  # Below 80% threshold
-            assert any(f in gap['title'] for f in framework_mappings)
-            assert 'coverage_percentage' in gap['metrics']
-            assert gap['metrics']['coverage_percentage'] == 0.75
+            assert gap.type == GapType.COMPLIANCE
+            assert gap.severity == GapSeverity.HIGH  # Below 80% threshold
+            assert any(f in gap.title for f in framework_mappings)
+            assert 'coverage_percentage' in gap.metrics
+            assert gap.metrics['coverage_percentage'] == 0.75
 
     async def test_generate_recommendations(self):
         """Test ML-enhanced recommendation generation."""
         # Setup test gaps
         test_gaps = [
-            {
-                'id': 'RT_001',
-                'type': GapType.PROCESS,
-                'title': 'High Response Time',
-                'severity': GapSeverity.HIGH,
-                'metrics': {'mean_response_time': 180}
-            },
-            {
-                'id': 'COMP_001',
-                'type': GapType.COMPLIANCE,
-                'title': 'Low SOC2 Coverage',
-                'severity': GapSeverity.HIGH,
-                'metrics': {'coverage_percentage': 0.75}
-            }
+            GapDraft(
+                id='RT_001',
+                type=GapType.PROCESS,
+                title='High Response Time',
+                description='Response times exceed acceptable thresholds',
+                severity=GapSeverity.HIGH,
+                affected_areas=('Incident Response',),
+                metrics={'mean_response_time': 180}
+            ),
+            GapDraft(
+                id='COMP_001',
+                type=GapType.COMPLIANCE,
+                title='Low SOC2 Coverage',
+                description='Compliance coverage below required threshold for SOC2',
+                severity=GapSeverity.HIGH,
+                affected_areas=('Compliance',),
+                frameworks=('SOC2',),
+                metrics={'coverage_percentage': 0.75}
+            )
         ]
 
         # Generate recommendations
@@ -215,4 +296,238 @@ class TestGapAnalyzer:
         # Verify compliance gap recommendations
         compliance_recs = recommendations['COMP_001']
         assert any('documentation' in rec['title'].lower() for rec in compliance_recs)
-        assert any(rec['priority'] == 'high' for rec in compliance_recs)
\ No newline at end of file
+        assert any(rec['priority'] == 'high' for rec in compliance_recs)
+
+
+class FakePipeline:
+    """Queues FakeRedis commands and runs them together on execute()."""
+
+    def __init__(self, redis: 'FakeRedis'):
+        self._redis = redis
+        self._commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def __getattr__(self, name):
+        command = getattr(self._redis, f'_{name}')
+
+        def queue(*args, **kwargs):
+            self._commands.append((command, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self):
+        results = [command(*args, **kwargs) for command, args, kwargs in self._commands]
+        self._commands = []
+        return results
+
+
+class FakeRedis:
+    """
+    In-memory stand-in for the Redis commands used by the gap analysis response
+    cache, with expiry driven by a manual clock (``now``, in seconds).
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self._values = {}
+        self._deadlines = {}
+
+    def _live(self, key: str) -> bool:
+        deadline = self._deadlines.get(key)
+        if deadline is not None and deadline <= self.now:
+            self._values.pop(key, None)
+            self._deadlines.pop(key, None)
+        return key in self._values
+
+    def ttl(self, key: str) -> float:
+        """Remaining lifetime of a key, -1 without expiry, -2 when missing."""
+        if not self._live(key):
+            return -2
+        deadline = self._deadlines.get(key)
+        return -1 if deadline is None else deadline - self.now
+
+    def _get(self, key: str):
+        return self._values[key] if self._live(key) else None
+
+    def _setex(self, key: str, ttl_seconds: int, value) -> bool:
+        self._values[key] = value
+        self._deadlines[key] = self.now + ttl_seconds
+        return True
+
+    def _sadd(self, key: str, *members) -> int:
+        if not self._live(key):
+            self._values[key] = set()
+        before = len(self._values[key])
+        self._values[key].update(members)
+        return len(self._values[key]) - before
+
+    def _smembers(self, key: str) -> set:
+        return set(self._values[key]) if self._live(key) else set()
+
+    def _expire(self, key: str, ttl_seconds: int, nx: bool = False, gt: bool = False) -> bool:
+        if not self._live(key):
+            return False
+        current = self._deadlines.get(key)
+        deadline = self.now + ttl_seconds
+        # EXPIRE GT treats a key without expiry as never expiring
+        if (nx and current is not None) or (gt and (current is None or deadline <= current)):
+            return False
+        self._deadlines[key] = deadline
+        return True
+
+    def _unlink(self, *keys) -> int:
+        removed = 0
+        for key in keys:
+            removed += self._live(key)
+            self._values.pop(key, None)
+            self._deadlines.pop(key, None)
+        return removed
+
+    async def get(self, key: str):
+        return self._get(key)
+
+    async def unlink(self, *keys) -> int:
+        return self._unlink(*keys)
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+
+@pytest.mark.asyncio
+class TestGapAnalysisCache:
+    """
+    Test suite for the gap analysis response cache: canonical key derivation and
+    tag invalidation across endpoints with different TTLs.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self, monkeypatch):
+        """Load the controller against an in-memory Redis and an empty local cache."""
+        monkeypatch.setenv('JWT_PUBLIC_KEY', 'test-public-key')
+        Config.load_config()
+        from analytics_service.controllers import gap_analysis
+        self.gap_analysis = gap_analysis
+
+        self.redis = FakeRedis()
+        monkeypatch.setattr(gap_analysis, 'redis_client', self.redis)
+        monkeypatch.setattr(gap_analysis, 'local_cache', gap_analysis.LocalTTLCache())
+
+        # Stand-ins for the analyze and gap list endpoints sharing the org tag
+        self.calls = []
+
+        @gap_analysis.cache_response(
+            ttl_seconds=gap_analysis._CACHE_TTL_ANALYZE,
+            tags=lambda kw: [f"gap_org:{kw['request'].organization_id}"]
+        )
+        async def analyze(request, auth=None):
+            self.calls.append(('analyze', request.organization_id))
+            return {'organization_id': request.organization_id, 'run': len(self.calls)}
+
+        @gap_analysis.cache_response(
+            ttl_seconds=gap_analysis._CACHE_TTL_GAPS,
+            tags=lambda kw: [f"gap_org:{kw['organization_id']}"]
+        )
+        async def list_gaps(organization_id, page_number=1, auth=None):
+            self.calls.append(('list_gaps', organization_id))
+            return {'organization_id': organization_id, 'run': len(self.calls)}
+
+        self.analyze = analyze
+        self.list_gaps = list_gaps
+        self.request = gap_analysis.GapAnalysisRequest(
+            organization_id='test_org_456',
+            exercise_id='test_exercise_123',
+            frameworks=['SOC2']
+        )
+
+    def _clear_local_cache(self, monkeypatch):
+        """Simulate another worker with an empty in-process cache."""
+        monkeypatch.setattr(self.gap_analysis, 'local_cache', self.gap_analysis.LocalTTLCache())
+
+    async def test_cache_key_is_canonical(self, monkeypatch):
+        """Test keys hash the request as sorted JSON, so every worker and caller shares them."""
+        await self.analyze(request=self.request, auth={'sub': 'alice'})
+
+        expected = hashlib.blake2b(
+            orjson.dumps(
+                {'args': [], 'kwargs': {'request': self.request.model_dump(mode='json')}},
+                option=orjson.OPT_SORT_KEYS
+            ),
+            digest_size=16
+        ).hexdigest()
+        assert self.redis._get(f"ga:analyze:{expected}") is not None
+
+        # Another worker, another caller and a differently built but equal request
+        self._clear_local_cache(monkeypatch)
+        same_request = self.gap_analysis.GapAnalysisRequest(
+            frameworks=['SOC2'],
+            exercise_id='test_exercise_123',
+            organization_id='test_org_456'
+        )
+        response = await self.analyze(request=same_request, auth={'sub': 'bob'})
+
+        assert response == {'organization_id': 'test_org_456', 'run': 1}
+        assert self.calls == [('analyze', 'test_org_456')]
+
+    async def test_cache_key_distinguishes_parameters(self):
+        """Test different query parameters are cached separately."""
+        await self.list_gaps(organization_id='test_org_456', page_number=1, auth={})
+        await self.list_gaps(organization_id='test_org_456', page_number=2, auth={})
+
+        assert len(self.calls) == 2
+
+    async def test_tag_ttl_is_never_shortened(self):
+        """Test a shorter-lived endpoint cannot shorten a tag shared with a longer-lived one."""
+        tag = 'gap_org:test_org_456'
+
+        await self.analyze(request=self.request, auth={})
+        assert self.redis.ttl(tag) == self.gap_analysis._CACHE_TTL_ANALYZE
+
+        await self.list_gaps(organization_id='test_org_456', auth={})
+        assert self.redis.ttl(tag) == self.gap_analysis._CACHE_TTL_ANALYZE
+
+    async def test_tag_ttl_is_extended(self):
+        """Test a longer-lived entry extends a tag created by a shorter-lived one."""
+        tag = 'gap_org:test_org_456'
+
+        await self.list_gaps(organization_id='test_org_456', auth={})
+        assert self.redis.ttl(tag) == self.gap_analysis._CACHE_TTL_GAPS
+
+        await self.analyze(request=self.request, auth={})
+        assert self.redis.ttl(tag) == self.gap_analysis._CACHE_TTL_ANALYZE
+
+    async def test_invalidation_after_short_ttl_expires(self, monkeypatch):
+        """Test invalidating a shared tag still drops live long-TTL entries."""
+        await self.analyze(request=self.request, auth={})
+        await self.list_gaps(organization_id='test_org_456', auth={})
+
+        # Past the gap list TTL but within the analyze TTL
+        self.redis.now += self.gap_analysis._CACHE_TTL_GAPS + 60
+        await self.gap_analysis.invalidate_cache_tags(['gap_org:test_org_456'])
+
+        self._clear_local_cache(monkeypatch)
+        response = await self.analyze(request=self.request, auth={})
+
+        assert response['run'] == 3
+        assert self.calls == [
+            ('analyze', 'test_org_456'),
+            ('list_gaps', 'test_org_456'),
+            ('analyze', 'test_org_456')
+        ]
+
+    async def test_local_cache_ttl_is_capped(self):
+        """Test in-process entries expire well before their Redis TTL."""
+        with patch.object(self.gap_analysis.time, 'monotonic', return_value=1000.0):
+            await self.analyze(request=self.request, auth={})
+        key = next(iter(self.gap_analysis.local_cache._entries))
+
+        with patch.object(
+            self.gap_analysis.time, 'monotonic',
+            return_value=1000.0 + self.gap_analysis.LOCAL_CACHE_TTL + 1
+        ):
+            assert self.gap_analysis.local_cache.get(key) is None
+        assert self.redis._get(key) is not None
@@ -7,17 +7,31 @@ Version: 1.0.0
 """
 
 # External imports with versions
+import asyncio
+import bson  # pymongo==4.0+
 import pytest  # pytest==7.0.0
 import mongomock  # mongomock==4.1.0
 import numpy as np  # numpy==1.24.0
 import pandas as pd  # pandas==2.0.0
 from freezegun import freeze_time  # freezegun==1.2.0
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List
+from contextlib import ExitStack
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+from pymongo import UpdateOne  # pymongo==4.0+
+from pymongo.errors import AutoReconnect, BulkWriteError, ServerSelectionTimeoutError
 
 # Internal imports
 from ..analytics_service.services.metric_processor import MetricProcessor
+from ..analytics_service.config import Config
 from ..analytics_service.models.metric import MetricModel
+from ..analytics_service.models.metric_bucket import (
+    MAX_DENSIFY_STEPS,
+    METRICS_RETENTION_SECONDS,
+    MetricBucketModel,
+    gap_fill_stages,
+    truncate_to_interval
+)
 from . import TEST_CONFIG
 
 class TestMetricProcessor:
@@ -163,6 +177,36 @@ class TestMetricProcessor:
         
         assert len(hourly_df) > len(daily_df)
 
+    @pytest.mark.unit
+    def test_iter_time_series(self):
+        """Test lazy time series iteration yields points from the streamed query."""
+        # Mock streamed InfluxDB records
+        records = []
+        for offset in range(3):
+            record = Mock()
+            record.get_time.return_value = self.test_timestamp + timedelta(hours=offset)
+            record.get_value.return_value = float(offset)
+            records.append(record)
+
+        self.processor._influxdb_client = Mock()
+        self.processor._influxdb_client.query_api.return_value.query_stream.return_value = iter(records)
+
+        # Iterate time series
+        points = self.processor.iter_time_series(
+            organization_id=self.test_org_id,
+            metric_type='compliance_coverage',
+            start_time=self.test_timestamp - timedelta(days=1),
+            end_time=self.test_timestamp,
+            interval='1h'
+        )
+
+        # Validate lazy evaluation and point values
+        self.processor._influxdb_client.query_api.assert_not_called()
+        assert list(points) == [
+            (self.test_timestamp + timedelta(hours=offset), float(offset))
+            for offset in range(3)
+        ]
+
     @pytest.mark.unit
     def test_store_metric(self):
         """Test metric storage operations with validation and error handling."""
@@ -176,10 +220,11 @@ class TestMetricProcessor:
         )
         assert success is True
         
-        # Verify storage in MongoDB
+        # Verify storage in MongoDB once the buffer is flushed
+        assert self.processor.flush_metrics() == 1
         stored_metric = MetricModel.objects(
-            organization_id=self.test_org_id,
-            exercise_id=self.test_exercise_id
+            series__organization_id=self.test_org_id,
+            series__exercise_id=self.test_exercise_id
         ).first()
         assert stored_metric is not None
         assert stored_metric.value == 8.5
@@ -258,4 +303,343 @@ class TestMetricProcessor:
             start_time=self.test_timestamp - timedelta(hours=1),
             end_time=self.test_timestamp + timedelta(hours=1)
         )
-        assert len(results_invalid) == 0
\ No newline at end of file
+        assert len(results_invalid) == 0
+
+
+class TestMetricBuckets:
+    """
+    Test suite for the per-minute metric bucket rollup backing coarse aggregation.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        """Patch the bucket collection and build metric documents in two minutes."""
+        self.collection = Mock()
+        patcher = patch.object(MetricBucketModel, '_get_collection', return_value=self.collection)
+        patcher.start()
+        yield
+        patcher.stop()
+
+    @staticmethod
+    def _document(timestamp: datetime, value: float) -> Dict:
+        """Stored metric document shape consumed by MetricBucketModel.record."""
+        return {
+            'meta': {
+                'organization_id': 'test_org_123',
+                'exercise_id': 'exercise_456',
+                'metric_type': 'response_time'
+            },
+            'value': value,
+            'timestamp': timestamp
+        }
+
+    @pytest.mark.unit
+    def test_record_upserts_minute_totals(self):
+        """Test each metric increments its minute bucket's totals and extremes."""
+        documents = [
+            self._document(datetime(2024, 1, 15, 10, 0, 15), 4.0),
+            self._document(datetime(2024, 1, 15, 10, 0, 45, 500000), 6.0),
+            self._document(datetime(2024, 1, 15, 10, 1, 5), 2.5)
+        ]
+
+        MetricBucketModel.record(documents)
+
+        self.collection.bulk_write.assert_called_once()
+        operations = self.collection.bulk_write.call_args.args[0]
+        assert self.collection.bulk_write.call_args.kwargs == {'ordered': False}
+        assert operations == [
+            UpdateOne(
+                {
+                    'organization_id': 'test_org_123',
+                    'exercise_id': 'exercise_456',
+                    'metric_type': 'response_time',
+                    'bucket_start': bucket_start
+                },
+                {
+                    '$inc': {'nsamples': 1, 'sum_v': value},
+                    '$min': {'min_v': value},
+                    '$max': {'max_v': value}
+                },
+                upsert=True
+            )
+            for bucket_start, value in (
+                (datetime(2024, 1, 15, 10, 0), 4.0),
+                (datetime(2024, 1, 15, 10, 0), 6.0),
+                (datetime(2024, 1, 15, 10, 1), 2.5)
+            )
+        ]
+
+    @pytest.mark.unit
+    def test_record_without_documents(self):
+        """Test an empty batch issues no bulk write."""
+        MetricBucketModel.record(iter([]))
+        self.collection.bulk_write.assert_not_called()
+
+    @pytest.mark.unit
+    def test_buckets_expire_with_raw_metrics(self):
+        """Test buckets carry a TTL index matching raw metric retention."""
+        ttl_indexes = [
+            index for index in MetricBucketModel._meta['indexes'] if 'expireAfterSeconds' in index
+        ]
+        assert ttl_indexes == [
+            {'fields': ['bucket_start'], 'expireAfterSeconds': METRICS_RETENTION_SECONDS}
+        ]
+        assert 'samples' not in MetricBucketModel._fields
+
+    @pytest.mark.unit
+    def test_aggregate_sums_bucket_totals(self):
+        """Test aggregation averages summed bucket totals over minute-aligned bounds."""
+        self.collection.aggregate.return_value = iter([{'avg_value': 5.0, 'count': 2}])
+        start_time = datetime(2024, 1, 15, 10, 0, 30)
+        end_time = datetime(2024, 1, 15, 12, 0, 0)
+
+        result = MetricBucketModel.aggregate('test_org_123', 'response_time', 'hour', start_time, end_time)
+
+        assert result == [{'avg_value': 5.0, 'count': 2}]
+        pipeline = self.collection.aggregate.call_args.args[0]
+        assert pipeline[0]['$match']['bucket_start'] == {
+            '$gte': datetime(2024, 1, 15, 10, 0),
+            '$lte': end_time
+        }
+        assert pipeline[1]['$group']['count'] == {'$sum': '$nsamples'}
+        assert pipeline[1]['$group']['sum_value'] == {'$sum': '$sum_v'}
+        assert pipeline[2]['$project']['avg_value'] == {'$divide': ['$sum_value', '$count']}
+
+    @pytest.mark.unit
+    def test_truncate_to_week(self):
+        """Test weeks truncate to the preceding Sunday like $dateTrunc."""
+        # Wednesday afternoon and the Sunday itself
+        assert truncate_to_interval(datetime(2024, 1, 17, 13, 45, 10), 'week') == datetime(2024, 1, 14)
+        assert truncate_to_interval(datetime(2024, 1, 14, 23, 59), 'week') == datetime(2024, 1, 14)
+        # Weeks crossing a year boundary
+        assert truncate_to_interval(datetime(2024, 1, 2, 8, 0), 'week') == datetime(2023, 12, 31)
+
+    @pytest.mark.unit
+    def test_truncate_to_quarter(self):
+        """Test quarters truncate to the first day of their first month."""
+        assert truncate_to_interval(datetime(2024, 1, 1, 0, 0), 'quarter') == datetime(2024, 1, 1)
+        assert truncate_to_interval(datetime(2024, 5, 20, 9, 30), 'quarter') == datetime(2024, 4, 1)
+        assert truncate_to_interval(datetime(2024, 12, 31, 23, 59, 59), 'quarter') == datetime(2024, 10, 1)
+
+    @pytest.mark.unit
+    def test_truncate_converts_to_utc(self):
+        """Test aware times are truncated in UTC and returned naive."""
+        value = datetime(2024, 4, 1, 1, 30, tzinfo=timezone(timedelta(hours=2)))
+        assert truncate_to_interval(value, 'quarter') == datetime(2024, 1, 1)
+        assert truncate_to_interval(value, 'hour') == datetime(2024, 3, 31, 23, 0)
+
+    @pytest.mark.unit
+    def test_gap_fill_stages_densify_short_ranges(self):
+        """Test short ranges are densified from the truncated start and zero-filled."""
+        stages = gap_fill_stages('day', datetime(2024, 1, 1, 6, 0), datetime(2024, 1, 8))
+
+        densify = next(stage['$densify'] for stage in stages if '$densify' in stage)
+        assert densify['range']['unit'] == 'day'
+        assert densify['range']['bounds'] == [datetime(2024, 1, 1), datetime(2024, 1, 8)]
+        assert any('$fill' in stage for stage in stages)
+        assert '$setWindowFields' in stages[-1]
+
+    @pytest.mark.unit
+    def test_gap_fill_stages_skip_wide_ranges(self):
+        """Test ranges over MAX_DENSIFY_STEPS intervals keep only non-empty intervals."""
+        start_time = datetime(2024, 1, 1)
+        end_time = start_time + timedelta(minutes=MAX_DENSIFY_STEPS + 1)
+
+        stages = gap_fill_stages('minute', start_time, end_time)
+
+        assert not any('$densify' in stage or '$fill' in stage for stage in stages)
+        assert stages[0] == {'$set': {'interval': '$_id.interval'}}
+        assert '$setWindowFields' in stages[-1]
+
+
+@pytest.mark.asyncio
+class TestMetricFlusher:
+    """
+    Test suite for the batch_mode metric queue, its background flusher and the
+    dead-letter path for metrics that cannot be inserted.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        """Import the controller with a fresh queue and mocked Redis and cache invalidation."""
+        try:
+            Config.get_config()
+        except RuntimeError:
+            Config.load_config()
+        from ..analytics_service.controllers import metrics
+        self.metrics = metrics
+
+        # Redis pipeline used by the dead-letter path
+        self.pipe = Mock()
+        self.pipe.execute = AsyncMock()
+        redis_client = MagicMock()
+        redis_client.pipeline.return_value.__aenter__.return_value = self.pipe
+
+        self.invalidate = AsyncMock()
+        self.batch = [
+            {
+                '_id': bson.ObjectId(),
+                'meta': {
+                    'organization_id': 'test_org_123',
+                    'exercise_id': 'exercise_456',
+                    'metric_type': 'response_time'
+                },
+                'value': float(i),
+                'timestamp': datetime(2024, 1, 15, 10, 0, i)
+            }
+            for i in range(3)
+        ]
+
+        with ExitStack() as stack:
+            stack.enter_context(patch.object(metrics, '_METRIC_QUEUE', asyncio.Queue(maxsize=10)))
+            stack.enter_context(patch.object(metrics, '_flusher_task', None))
+            stack.enter_context(patch.object(metrics, 'METRIC_RETRY_BACKOFF', 0))
+            stack.enter_context(patch.object(metrics, 'redis_client', redis_client))
+            stack.enter_context(patch.object(metrics, '_invalidate_metrics_cache', self.invalidate))
+            self.record = stack.enter_context(patch.object(metrics.MetricBucketModel, 'record'))
+            yield
+
+    def _dead_lettered(self) -> List[Dict]:
+        """Documents pushed onto the dead-letter list, decoded from BSON."""
+        if not self.pipe.rpush.called:
+            return []
+        key, *payloads = self.pipe.rpush.call_args.args
+        assert key == self.metrics.METRIC_DEAD_LETTER_KEY
+        return [bson.decode(payload) for payload in payloads]
+
+    async def test_stop_drains_queued_metrics(self):
+        """Test shutdown inserts every metric queued before and after the stop sentinel."""
+        with patch.object(self.metrics, '_insert_metrics', AsyncMock()) as insert:
+            for document in self.batch[:2]:
+                self.metrics._METRIC_QUEUE.put_nowait(document)
+            await self.metrics.start_metric_flusher()
+            await self.metrics.stop_metric_flusher()
+
+            # Queued after the flusher stopped
+            self.metrics._METRIC_QUEUE.put_nowait(self.batch[2])
+            await self.metrics.stop_metric_flusher()
+
+        inserted = [doc for call in insert.await_args_list for doc in call.args[0]]
+        assert inserted == self.batch
+        assert self.metrics._flusher_task is None
+
+    async def test_cancel_inserts_batch_in_hand(self):
+        """Test a cancelled flusher still inserts metrics it already dequeued."""
+        with patch.object(self.metrics, '_insert_metrics', AsyncMock()) as insert:
+            self.metrics._METRIC_QUEUE.put_nowait(self.batch[0])
+            await self.metrics.start_metric_flusher()
+
+            # Let the flusher dequeue the metric and wait for the batch to fill
+            await asyncio.sleep(self.metrics.METRIC_FLUSH_INTERVAL / 5)
+            task = self.metrics._flusher_task
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        insert.assert_awaited_once_with([self.batch[0]])
+
+    async def test_insert_retries_unsent_writes(self):
+        """Test only server selection failures are retried, and buckets are recorded once."""
+        with patch.object(
+            self.metrics.MetricModel,
+            'insert_documents',
+            side_effect=[ServerSelectionTimeoutError('no servers'), len(self.batch)]
+        ) as insert_documents:
+            await self.metrics._insert_metrics(self.batch)
+
+        assert insert_documents.call_count == 2
+        assert insert_documents.call_args.kwargs['record_buckets'] is False
+        self.record.assert_called_once_with(self.batch)
+        self.invalidate.assert_awaited_once_with('test_org_123', 'exercise_456')
+        assert self._dead_lettered() == []
+
+    async def test_insert_dead_letters_unknown_outcome(self):
+        """Test a failure after the write was sent dead-letters the batch without retrying."""
+        with patch.object(
+            self.metrics.MetricModel, 'insert_documents', side_effect=AutoReconnect('connection reset')
+        ) as insert_documents:
+            await self.metrics._insert_metrics(self.batch)
+
+        insert_documents.assert_called_once()
+        self.record.assert_not_called()
+        assert self._dead_lettered() == self.batch
+        self.pipe.ltrim.assert_called_once_with(
+            self.metrics.METRIC_DEAD_LETTER_KEY, -self.metrics.METRIC_DEAD_LETTER_MAXLEN, -1
+        )
+
+    async def test_insert_dead_letters_rejected_documents(self):
+        """Test server-rejected documents are dead-lettered and the rest bucketed."""
+        error = BulkWriteError({'writeErrors': [{'index': 1, 'errmsg': 'rejected'}]})
+        with patch.object(self.metrics.MetricModel, 'insert_documents', side_effect=error):
+            await self.metrics._insert_metrics(self.batch)
+
+        assert self._dead_lettered() == [self.batch[1]]
+        self.record.assert_called_once_with([self.batch[0], self.batch[2]])
+
+    async def test_full_queue_rejects_with_503(self):
+        """Test batched submissions are refused with 503 once the queue is full."""
+        queue = asyncio.Queue(maxsize=1)
+        queue.put_nowait(self.batch[0])
+        request = self.metrics.MetricRequest(
+            organization_id='test_org_123',
+            exercise_id='exercise_456',
+            metric_type='response_time',
+            value=5.0,
+            unit='seconds'
+        )
+
+        with patch.object(self.metrics, '_METRIC_QUEUE', queue):
+            with pytest.raises(self.metrics.HTTPException) as error:
+                await self.metrics.submit_metric(request, batch_mode=True, now=datetime(2024, 1, 15, 10, 0))
+
+        assert error.value.status_code == 503
+        assert error.value.headers == {'Retry-After': '1'}
+        assert queue.qsize() == 1
+
+
+class TestPageTokens:
+    """
+    Test suite for the opaque keyset page tokens returned by GET /metrics.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        """Import the metrics controller once configuration is loaded."""
+        try:
+            Config.get_config()
+        except RuntimeError:
+            Config.load_config()
+        from ..analytics_service.controllers import metrics
+        self.metrics = metrics
+
+    @pytest.mark.unit
+    def test_page_token_round_trip(self):
+        """Test a token decodes to the serialized timestamp and id it was built from."""
+        metric_id = str(bson.ObjectId())
+        token = self.metrics._encode_page_token('2024-01-15T10:00:00.123Z', metric_id)
+
+        timestamp, decoded_id = self.metrics._decode_page_token(token)
+
+        assert timestamp == datetime(2024, 1, 15, 10, 0, 0, 123000, tzinfo=timezone.utc)
+        assert decoded_id == metric_id
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('token', [
+        'not-base64!',
+        'MjAyNC0wMS0xNQ==',
+        'é',
+    ])
+    def test_malformed_page_token(self, token):
+        """Test undecodable tokens are rejected with 400."""
+        with pytest.raises(self.metrics.HTTPException) as error:
+            self.metrics._decode_page_token(token)
+        assert error.value.status_code == 400
+
+    @pytest.mark.unit
+    def test_page_token_with_invalid_id(self):
+        """Test a well-formed token whose id is not an ObjectId is rejected with 400."""
+        token = self.metrics._encode_page_token('2024-01-15T10:00:00.123Z', 'not-an-object-id')
+
+        with pytest.raises(self.metrics.HTTPException) as error:
+            self.metrics._decode_page_token(token)
+        assert error.value.status_code == 400
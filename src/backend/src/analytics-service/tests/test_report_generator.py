@@ -97,7 +97,7 @@ class TestReportGenerator:
         # Configure mock responses
         self._metric_processor_mock.calculate_statistics.return_value = mock_metrics_data
         self._gap_analyzer_mock.analyze_exercise.return_value = mock_gaps_data
-        self._s3_client_mock.put_object.return_value = {'ETag': 'test-etag'}
+        self._s3_client_mock.upload_fileobj.return_value = None
 
         # Generate report
         report = await self._report_generator.generate_report(
@@ -119,7 +119,7 @@ class TestReportGenerator:
         # Verify mock calls
         self._metric_processor_mock.calculate_statistics.assert_called_once()
         self._gap_analyzer_mock.analyze_exercise.assert_called_once()
-        self._s3_client_mock.put_object.assert_called_once()
+        self._s3_client_mock.upload_fileobj.assert_called_once()
 
         # Verify metrics
         report_counter = REGISTRY.get_sample_value(
@@ -166,7 +166,7 @@ class TestReportGenerator:
         # Verify PDF generation
         pdf_result = asyncio.run(self._report_generator._format_report(
             content=content,
-            template_name="exercise_summary.html",
+            report_type=ReportType.EXERCISE_SUMMARY,
             format="PDF"
         ))
         assert isinstance(pdf_result, bytes)
@@ -175,7 +175,7 @@ class TestReportGenerator:
         # Verify HTML generation
         html_result = asyncio.run(self._report_generator._format_report(
             content=content,
-            template_name="exercise_summary.html",
+            report_type=ReportType.EXERCISE_SUMMARY,
             format="HTML"
         ))
         assert isinstance(html_result, bytes)
@@ -185,7 +185,7 @@ class TestReportGenerator:
         with pytest.raises(ValueError) as exc_info:
             asyncio.run(self._report_generator._format_report(
                 content=content,
-                template_name="exercise_summary.html",
+                report_type=ReportType.EXERCISE_SUMMARY,
                 format="INVALID"
             ))
         assert "Unsupported format" in str(exc_info.value)